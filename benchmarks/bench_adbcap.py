@@ -0,0 +1,74 @@
+"""
+ADBCap 截图方式基准测试
+本地部分：对比 PNG 解码(png 模式)与原始像素解析(raw 模式，含本地 socket 传输与 gzip -1 压缩传输)的主机端耗时；
+设备部分：指定设备序列号时，在真机上对比 png 与 raw 模式的完整截图耗时
+
+运行: python benchmarks/bench_adbcap.py [设备序列号]
+"""
+import gzip
+import io
+import socket
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from autosnapmanager.screencaps.android.adbcap import ADBCap
+
+
+def synthetic_screen(width: int = 1080, height: int = 1920, seed: int = 0) -> np.ndarray:
+    """生成带色块与渐变的竖屏 RGBA 截图"""
+    rng = np.random.default_rng(seed)
+    image = np.repeat(np.repeat(rng.integers(0, 256, (height // 40, width // 40, 3), dtype=np.uint8), 40, 0), 40, 1)
+    image = (image // 2 + np.linspace(0, 127, width, dtype=np.uint8)[None, :, None]).astype(np.uint8)
+    return np.dstack([image, np.full((height, width), 255, dtype=np.uint8)])
+
+
+def best_time(func, repeat: int = 10) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def recv_local(capture: ADBCap, payload: bytes, compressed: bool) -> np.ndarray:
+    """经本地 socket 传输 payload 后按 raw 模式解析"""
+    receiver, sender = socket.socketpair()
+    threading.Thread(target=lambda: (sender.sendall(payload), sender.close()), daemon=True).start()
+    length = capture._recv_gzip(receiver) if compressed else capture._recv_raw(receiver)
+    receiver.close()
+    return capture._parse_raw(length)
+
+
+if __name__ == '__main__':
+    rgba = synthetic_screen()
+    raw = struct.pack('<IIII', rgba.shape[1], rgba.shape[0], 1, 0) + rgba.tobytes()
+    buffer = io.BytesIO()
+    Image.fromarray(rgba).save(buffer, format='PNG')
+    png = buffer.getvalue()
+    compressed = gzip.compress(raw, compresslevel=1)
+
+    capture = ADBCap.__new__(ADBCap)  # 只使用解析逻辑，不连接设备
+    capture._buffer = bytearray()
+    assert np.array_equal(recv_local(capture, raw, False), rgba[:, :, :3])
+    assert np.array_equal(recv_local(capture, compressed, True), rgba[:, :, :3])
+
+    print(f"数据量 | raw {len(raw) / 1024 / 1024:.1f} MB | gzip -1 {len(compressed) / 1024 / 1024:.1f} MB | "
+          f"png {len(png) / 1024 / 1024:.1f} MB")
+    png_time = best_time(lambda: np.array(Image.open(io.BytesIO(png)))[:, :, :3])
+    print(f"{'png 解码':<16} | {png_time * 1000:7.2f} ms")
+    for name, payload, is_compressed in (('raw 传输+解析', raw, False), ('gzip 传输+解压', compressed, True)):
+        elapsed = best_time(lambda: recv_local(capture, payload, is_compressed))
+        print(f"{name:<16} | {elapsed * 1000:7.2f} ms | {png_time / elapsed:5.1f}x")
+
+    if len(sys.argv) > 1:
+        serial = sys.argv[1]
+        for mode, compress in (('png', False), ('raw', False), ('raw', True)):
+            device_capture = ADBCap(serial, mode=mode, compress=compress)
+            elapsed = best_time(device_capture.screencap, repeat=5)
+            print(f"设备 {serial} | {mode:<3} 压缩={device_capture.compress!s:<5} | {elapsed * 1000:7.1f} ms")
@@ -0,0 +1,77 @@
+"""
+级联拒绝基准测试
+在合成的界面截图样本集上测量级联拒绝的拒绝率、误拒率，以及 match() 开启级联前后的耗时
+
+样本集包含：从截图中裁剪并叠加亮度偏移/噪声/JPEG 压缩的模板(应命中)，以及来自其他截图的模板(应未命中)
+
+运行: python benchmarks/bench_cascade.py
+"""
+import time
+
+import cv2
+import numpy as np
+
+from autosnapmanager.matches.cascade import RejectionCascade
+from autosnapmanager.matches.windows.opencv_match import OpenCVMatch
+
+
+def synthetic_screen(seed: int, width: int = 1280, height: int = 720) -> np.ndarray:
+    """生成带色块与文字的 RGB 界面截图"""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur((rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8), (5, 5), 0)
+    image = cv2.resize(background, (width, height), interpolation=cv2.INTER_CUBIC)
+    for _ in range(50):
+        x, y = int(rng.integers(0, width - 220)), int(rng.integers(0, height - 90))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(image, (x, y), (x + int(rng.integers(60, 220)), y + int(rng.integers(30, 90))), color, -1)
+        text = ''.join(chr(int(c)) for c in rng.integers(65, 91, 5))
+        cv2.putText(image, text, (x + 6, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.8, tuple(255 - c for c in color), 2)
+    return image
+
+
+def distort(template: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """模拟不同截图之间的亮度偏移、噪声与 JPEG 压缩"""
+    shifted = cv2.add(template.astype(np.int16), int(rng.integers(-12, 13)), dtype=cv2.CV_16S)
+    noisy = np.clip(shifted + rng.normal(0, 3, template.shape), 0, 255).astype(np.uint8)
+    _, encoded = cv2.imencode('.jpg', noisy, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)
+
+
+def build_corpus(frames: int = 4, templates_per_frame: int = 15, seed: int = 0) -> list:
+    """构造 (图像, 模板) 样本集，裁剪自本帧(经失真处理)与来自其他截图的模板各占一半"""
+    rng = np.random.default_rng(seed)
+    screens = [synthetic_screen(seed + i) for i in range(frames + 1)]
+    corpus = []
+    for i, screen in enumerate(screens[:-1]):
+        other = screens[i + 1]
+        for _ in range(templates_per_frame):
+            h, w = int(rng.integers(32, 120)), int(rng.integers(32, 200))
+            y, x = int(rng.integers(0, screen.shape[0] - h)), int(rng.integers(0, screen.shape[1] - w))
+            corpus.append((screen, distort(screen[y:y + h, x:x + w], rng)))
+            y, x = int(rng.integers(0, other.shape[0] - h)), int(rng.integers(0, other.shape[1] - w))
+            corpus.append((screen, other[y:y + h, x:x + w].copy()))
+    return corpus
+
+
+def time_matches(matcher: OpenCVMatch, corpus: list) -> float:
+    start = time.perf_counter()
+    for image, template in corpus:
+        matcher.match(image, template)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    corpus = build_corpus()
+    for colors in (False, True):
+        cascade = RejectionCascade()
+        matcher = OpenCVMatch(threshold=0.8, colors=colors, cascade=cascade)
+        report = matcher.evaluate_cascade(corpus)
+        print(f"{'BGR' if colors else 'GRAY'} | 样本 {report['samples']} | 命中 {report['positives']} | "
+              f"拒绝率 {report['rejection_rate']:.1%} | 误拒 {report['false_rejections']} "
+              f"({report['false_rejection_rate']:.1%}) | "
+              f"级联 {report['cascade_time'] * 1000:.0f}ms | 完整相关 {report['full_time'] * 1000:.0f}ms")
+
+        baseline = time_matches(OpenCVMatch(threshold=0.8, colors=colors), corpus)
+        with_cascade = time_matches(matcher, corpus)
+        print(f"     match() 总耗时 | 无级联 {baseline * 1000:.0f}ms | 有级联 {with_cascade * 1000:.0f}ms | "
+              f"统计 {matcher.cascade_stats()}")
@@ -0,0 +1,118 @@
+"""
+MiniCap 帧解码基准测试
+对比旧版 PIL 全尺寸 RGB 解码与 cv2.imdecode 各解码方式(RGB/灰度，1/2/4/8 缩小解码)的耗时，
+并在本地 socket 上以固定帧率回放 minicap 数据流，对比同步解码与后台解码下 screencap 的调用耗时
+
+运行: python benchmarks/bench_minicap_decode.py
+"""
+import io
+import socket
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from autosnapmanager.screencaps.android.minicap import MiniCap, MiniCapStream
+from autosnapmanager.screencaps.screencap_config import MINICAP_DECODE_MODES, MINICAP_DECODE_SCALES
+
+
+def synthetic_jpeg(width: int = 1080, height: int = 1920, quality: int = 80, seed: int = 0) -> bytes:
+    """生成带色块与文字的竖屏界面截图并编码为 JPEG"""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur((rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8), (5, 5), 0)
+    image = cv2.resize(background, (width, height), interpolation=cv2.INTER_CUBIC)
+    for _ in range(80):
+        x, y = int(rng.integers(0, width - 220)), int(rng.integers(0, height - 90))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        cv2.rectangle(image, (x, y), (x + int(rng.integers(60, 220)), y + int(rng.integers(30, 90))), color, -1)
+        text = ''.join(chr(int(c)) for c in rng.integers(65, 91, 5))
+        cv2.putText(image, text, (x + 6, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.8, tuple(255 - c for c in color), 2)
+    _, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes()
+
+
+def serve_paced(frame: bytes, fps: int, seconds: float) -> int:
+    """在本地端口上按固定帧率发送 banner 与重复帧，返回端口号"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    packet = struct.pack('<I', len(frame)) + frame
+
+    def run():
+        conn, _ = server.accept()
+        with conn:
+            conn.sendall(struct.pack('<BBIIIIIBB', 1, 24, 1234, 1080, 1920, 1080, 1920, 0, 2))
+            start = time.perf_counter()
+            for i in range(int(fps * seconds)):
+                time.sleep(max(0.0, start + i / fps - time.perf_counter()))
+                try:
+                    conn.sendall(packet)
+                except OSError:
+                    break
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def consume(capture, stream: MiniCapStream, calls: int, work: float) -> list:
+    """模拟匹配循环：每次截图后处理 work 秒，返回每次截图调用的耗时"""
+    capture.minicap = type('Manager', (), {'stream': stream, 'config': {'use_stream': True}})()
+    capture.last_frame, capture._seq = None, 0
+    capture.screencap()  # 等待首帧
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        capture.screencap()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(work)
+    return latencies
+
+
+def best_time(func, repeat: int = 30) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    data = synthetic_jpeg()
+    print(f"JPEG 大小 {len(data) / 1024:.0f} KB")
+
+    baseline = best_time(lambda: np.array(Image.open(io.BytesIO(data)))[:, :, :3])
+    print(f"{'旧版 PIL rgb 1/1':<18} | {baseline * 1000:6.2f} ms | 1.00x")
+
+    capture = MiniCap.__new__(MiniCap)  # 只使用解码逻辑，不连接设备
+    for mode in MINICAP_DECODE_MODES:
+        for scale in MINICAP_DECODE_SCALES:
+            capture.decode, capture.decode_scale = mode, scale
+            elapsed = best_time(lambda: capture._decode(data))
+            shape = capture._decode(data).shape
+            print(f"{f'cv2 {mode} 1/{scale}':<18} | {elapsed * 1000:6.2f} ms | {baseline / elapsed:4.2f}x | {shape}")
+
+    # 后台解码：60 帧/秒数据流，匹配循环每次截图后处理 30ms
+    capture.decode, capture.decode_scale = 'gray', 2
+    for name, worker in (('同步解码', False), ('后台解码', True)):
+        stream = MiniCapStream('127.0.0.1', serve_paced(data, fps=60, seconds=4))
+        stream.start()
+        if worker:
+            stream.start_decoder(capture.decode, capture.decode_scale, idle_timeout=0.5)
+        latencies = np.array(consume(capture, stream, calls=60, work=0.03)) * 1000
+        line = (f"{name} gray 1/2 | screencap 中位数 {np.median(latencies):6.3f} ms | "
+                f"p95 {np.percentile(latencies, 95):6.3f} ms")
+        if worker:
+            time.sleep(1.0)  # 超过空闲时间，解码线程应暂停
+            stats = stream.decoder.stats()
+            line += f" | 空闲后 {stats}"
+            assert stats['paused'], "空闲超时后解码线程未暂停"
+            start = time.perf_counter()
+            capture.screencap()
+            line += f" | 恢复后首次 {(time.perf_counter() - start) * 1000:.1f} ms"
+        print(line)
+        stream.stop()
@@ -0,0 +1,133 @@
+"""
+MiniCap 数据流解析基准测试
+在本地 socket 上回放合成的 minicap 字节流，对比旧版 recv+bytearray 解析与 recv_into 零拷贝解析的吞吐量；
+解析正确性(随机切分、帧损坏或丢失)由 tests/test_minicap_stream.py 校验
+
+运行: python benchmarks/bench_minicap_stream.py
+"""
+import socket
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from autosnapmanager.screencaps.android.minicap import MiniCapStream
+
+BANNER = struct.pack('<BBIIIIIBB', 1, 24, 1234, 1080, 1920, 1080, 1920, 0, 2)
+
+
+def synthetic_stream(frames: int, mean_size: int, seed: int = 0, corrupt: int = -1) -> Tuple[bytes, List[int]]:
+    """生成 banner + 若干帧的 minicap 字节流，返回字节流与各帧的 crc32；corrupt 指定的帧不以 JPEG 头开始"""
+    rng = np.random.default_rng(seed)
+    parts, checksums = [BANNER], []
+    for index in range(frames):
+        size = int(rng.integers(mean_size // 2, mean_size * 3 // 2))
+        head = b'\x00\x00' if index == corrupt else b'\xFF\xD8'
+        body = head + rng.integers(0, 256, size - 2, dtype=np.uint8).tobytes()
+        parts.append(struct.pack('<I', size))
+        parts.append(body)
+        checksums.append(zlib.crc32(body))
+    return b''.join(parts), checksums
+
+
+def serve(payload: bytes, chunk_sizes: Callable[[], int], started: threading.Event = None) -> int:
+    """
+    在本地端口上按 chunk_sizes 切分发送一次字节流后关闭连接，返回端口号
+
+    started 在 banner 发送完毕、开始发送帧时置位
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+
+    def run():
+        conn, _ = server.accept()
+        view = memoryview(payload)
+        with conn:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # 与真机一致，banner 单独到达(旧版解析会丢弃与 banner 同一次 recv 到的后续数据)
+            conn.sendall(view[:len(BANNER)])
+            time.sleep(0.05)
+            if started is not None:
+                started.set()
+            cursor = len(BANNER)
+            while cursor < len(view):
+                size = chunk_sizes()
+                conn.sendall(view[cursor:cursor + size])
+                cursor += size
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def legacy_read(port: int, on_frame: Callable[[bytes], None]) -> None:
+    """旧版解析：1024 字节 recv，bytearray 拼接并反复切片"""
+    sock = socket.create_connection(('127.0.0.1', port))
+    state, expected_size, buffer = "banner", 2, bytearray()
+    frame_body_length = remaining_bytes = 0
+    while True:
+        chunk = sock.recv(remaining_bytes or 1024)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        cursor = 0
+        while cursor < len(buffer):
+            if state == "banner" and len(buffer) >= cursor + expected_size:
+                state, expected_size = "banner_rest", 22
+                cursor += 2
+            elif state == "banner_rest" and len(buffer) >= cursor + expected_size:
+                state, expected_size = "frame_header", 4
+                buffer.clear()
+                break
+            elif state == "frame_header" and len(buffer) >= cursor + expected_size:
+                frame_body_length = struct.unpack_from('<I', buffer, cursor)[0]
+                state = "frame_body"
+                cursor += 4
+            elif state == "frame_body" and len(buffer) >= cursor + frame_body_length:
+                on_frame(bytes(buffer[cursor:cursor + frame_body_length]))
+                state = "frame_header"
+                frame_body_length = remaining_bytes = 0
+                buffer.clear()
+                break
+            else:
+                buffer = buffer[cursor:]
+                remaining_bytes = frame_body_length - len(buffer)
+                break
+    sock.close()
+
+
+def run_stream(port: int) -> List[int]:
+    """以 MiniCapStream 读取整个字节流，返回各帧的大小"""
+    sizes = []
+    stream = MiniCapStream('127.0.0.1', port, listeners=[lambda frame: sizes.append(len(frame.data))])
+    stream.start()
+    stream.thread.join()
+    stream._close_socket()
+    return sizes
+
+
+if __name__ == '__main__':
+    frames, mean_size = 300, 300 * 1024
+    payload, _ = synthetic_stream(frames, mean_size)
+    megabytes = len(payload) / 1024 / 1024
+
+    # 吞吐量：大块发送(旧版解析无法处理被拆开的帧头)
+    for name, reader in (('旧版 recv+bytearray', None), ('recv_into 零拷贝', run_stream)):
+        best = float('inf')
+        for _ in range(3):
+            started, times = threading.Event(), {}
+            port = serve(payload, lambda: 256 * 1024, started)
+            threading.Thread(target=lambda: times.setdefault('start', started.wait() and time.perf_counter()),
+                             daemon=True).start()
+            if reader is None:
+                count = []
+                legacy_read(port, lambda body: count.append(len(body)))
+            else:
+                count = reader(port)
+            best = min(best, time.perf_counter() - times['start'])
+            assert len(count) == frames, f"{name} 解析帧数 {len(count)} != {frames}"
+        print(f"{name:<22} | {frames / best:8.1f} 帧/秒 | {megabytes / best:8.1f} MB/s")
@@ -0,0 +1,66 @@
+"""
+重复匹配峰值提取基准测试
+对比旧版逐点网格 NMS 与向量化贪心 NMS 在高密度相似度矩阵上的耗时，并校验两者保留的点完全一致
+
+运行: python benchmarks/bench_peak_extraction.py
+"""
+import time
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+from autosnapmanager.utils.process_image_tools import find_local_peaks
+
+
+def grid_nms(result: np.ndarray, threshold: float, min_distance: tuple) -> list:
+    """旧版实现：阈值以上的所有点按相似度排序后逐点做网格 NMS"""
+    y_coords, x_coords = np.where(result >= threshold)
+    values = result[y_coords, x_coords]
+    min_distance_x, min_distance_y = min_distance
+    grid = defaultdict(list)
+    kept = []
+
+    for idx in np.argsort(-values, kind='stable'):  # 相等时按行优先顺序，与 find_local_peaks 一致
+        x, y = x_coords[idx], y_coords[idx]
+        cell_x, cell_y = x // min_distance_x, y // min_distance_y
+        overlap = any(
+            abs(x - ax) <= min_distance_x and abs(y - ay) <= min_distance_y
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            for ax, ay in grid.get((cell_x + dx, cell_y + dy), ())
+        )
+        if not overlap:
+            grid[(cell_x, cell_y)].append((x, y))
+            kept.append((x, y, values[idx]))
+    return kept
+
+
+def dense_heatmap(width: int = 1920, height: int = 1080, tile: int = 40) -> np.ndarray:
+    """在平铺的重复纹理上匹配单个图块，得到高密度的相似度矩阵"""
+    rng = np.random.default_rng(0)
+    pattern = cv2.GaussianBlur((rng.random((tile, tile)) * 255).astype(np.uint8), (5, 5), 0)
+    image = np.tile(pattern, (height // tile + 1, width // tile + 1))[:height, :width]
+    image = cv2.add(image, (rng.random(image.shape) * 20).astype(np.uint8))
+    return cv2.matchTemplate(image, pattern[4:36, 4:36], cv2.TM_CCOEFF_NORMED)
+
+
+def measure(func, *args, repeat: int = 3) -> tuple:
+    best, output = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+if __name__ == '__main__':
+    heatmap = dense_heatmap()
+    for threshold in (0.5, 0.3, 0.1):
+        candidates = int(np.count_nonzero(heatmap >= threshold))
+        legacy_time, legacy = measure(grid_nms, heatmap, threshold, (10, 10), repeat=1)
+        peak_time, (ys, xs, _) = measure(find_local_peaks, heatmap, threshold, (10, 10))
+        same = [(x, y) for x, y, _ in legacy] == list(zip(xs, ys))
+        print(f"阈值 {threshold:.1f} | 候选点 {candidates:>8} | "
+              f"网格NMS {legacy_time * 1000:9.1f}ms ({len(legacy)} 点) | "
+              f"向量化NMS {peak_time * 1000:7.1f}ms ({len(ys)} 点) | "
+              f"加速 {legacy_time / peak_time:6.1f}x | 结果一致: {same}")
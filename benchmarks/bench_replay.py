@@ -0,0 +1,66 @@
+"""
+录制回放基准测试
+将合成的 1080x1920 JPEG 帧写入录制文件，以 ReplayCap 逐帧回放、RecordingClick 记录点击，通过 AndroidManager.click
+运行"截图-匹配-点击"循环，统计每帧耗时；同一录制运行两次的点击序列一致，且与合成画面中模板的真实位置一致。
+不连接设备，可在没有设备的机器上对比解码方式或匹配算法改动前后的整体耗时
+
+运行: python benchmarks/bench_replay.py
+"""
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from autosnapmanager.managers.android_manager import AndroidManager
+from autosnapmanager.screencaps.frame_recording import FrameRecorder
+from autosnapmanager.screencaps.replay_cap import ReplayCap, ReplayFinishedError
+
+FRAMES, STEP = 30, 8  # 帧数，每帧画面平移的像素数
+TEMPLATE_X, TEMPLATE_Y, TEMPLATE_SIZE = 700, 900, 96  # 模板在首帧中的位置与边长
+
+
+def synthetic_recording(path: str, template_path: str, width: int = 1080, height: int = 1920) -> None:
+    """写入按 30fps 节奏平移的合成画面，并将首帧中的一个图块保存为模板"""
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur((rng.random((height, width * 2, 3)) * 255).astype(np.uint8), (9, 9), 0)
+    recorder, start = FrameRecorder(path), time.monotonic()
+    for index in range(FRAMES):
+        image = np.ascontiguousarray(scene[:, index * STEP:index * STEP + width])
+        jpeg = cv2.imencode('.jpg', cv2.cvtColor(image, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, 90])[1]
+        recorder.write(jpeg.tobytes(), start + index / 30)
+    recorder.close()
+    template = scene[TEMPLATE_Y:TEMPLATE_Y + TEMPLATE_SIZE, TEMPLATE_X:TEMPLATE_X + TEMPLATE_SIZE]
+    cv2.imwrite(template_path, cv2.cvtColor(template, cv2.COLOR_RGB2BGR))
+
+
+def run(path: str, template_path: str, decode: str, decode_scale: int) -> tuple:
+    """通过 Manager 回放整个录制并在每帧上点击模板，返回 (每帧耗时, 点击位置列表)"""
+    cap = ReplayCap(path, realtime=False, decode=decode, decode_scale=decode_scale)
+    manager = AndroidManager(serial='replay-bench', screencap=cap, click='record')
+    start = time.perf_counter()
+    while True:
+        try:
+            manager.click(template_path)
+        except ReplayFinishedError:
+            break
+    elapsed = time.perf_counter() - start
+    cap.close()
+    points = manager.clicks.points
+    return elapsed / len(points), points
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path, template_path = os.path.join(directory, 'bench.asmrec'), os.path.join(directory, 'template.png')
+        synthetic_recording(path, template_path)
+        expected = [(TEMPLATE_X - index * STEP + TEMPLATE_SIZE // 2, TEMPLATE_Y + TEMPLATE_SIZE // 2)
+                    for index in range(FRAMES)]
+        print(f"录制文件 {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+        for decode, decode_scale in (('rgb', 1), ('gray', 1), ('gray', 2), ('gray', 4)):
+            per_frame, points = run(path, template_path, decode, decode_scale)
+            repeat = run(path, template_path, decode, decode_scale)[1]
+            error = max(max(abs(x - ex), abs(y - ey)) for (x, y), (ex, ey) in zip(points, expected))
+            print(f"{decode:>4} 1/{decode_scale} | 每帧 {per_frame * 1000:6.2f}ms | 点击 {len(points)} 次 | "
+                  f"两次结果一致: {points == repeat} | 与真实位置最大偏差 {error}px")
@@ -1,25 +1,35 @@
 from .actions.clicks.android.adb_touch import ADBTouch
 from .actions.clicks.android.minitouch import MiniTouch
 from .actions.clicks.android.maatouch import MAATouch
+from .actions.clicks.recording_click import RecordingClick
 from .actions.clicks.windows.pyautogui_click import PyAutoGuiClick
 from .actions.clicks.windows.win32api_click import Win32ApiClick
 from .actions.clicks.windows.win32gui_click import Win32GuiClick
 from .managers.android_manager import AndroidManager as Android
 from .managers.manager_config import ScreenCaps, Clicks, Matches
 from .managers.windows_manager import WindowsManager as Windows
+from .matches.windows.feature_match import FeatureMatch
 from .matches.windows.opencv_match import OpenCVMatch
 from .screencaps.android.adbcap import ADBCap
 from .screencaps.android.minicap import MiniCap
+from .screencaps.frame_bus import FrameBusPublisher, frame_bus_name
+from .screencaps.frame_recording import FrameRecorder, FrameRecording, recording_path
+from .screencaps.replay_cap import ReplayCap
+from .screencaps.screenshot_writer import ScreenshotWriter, ScreenshotJob
+from .screencaps.shared_memory_cap import SharedMemoryCap
 from .screencaps.windows.fullscreencap import FullScreenCap
 from .screencaps.windows.windowcap import WindowCap
 
 __all__ = [
     'ADBTouch', 'MiniTouch', 'MAATouch',
-    'PyAutoGuiClick', 'Win32ApiClick', 'Win32GuiClick',
+    'PyAutoGuiClick', 'Win32ApiClick', 'Win32GuiClick', 'RecordingClick',
     'Android', 'Windows',
     'ScreenCaps', 'Clicks', 'Matches',
-    'OpenCVMatch',
-    'ADBCap', 'MiniCap', 'FullScreenCap', 'WindowCap',
+    'OpenCVMatch', 'FeatureMatch',
+    'ADBCap', 'MiniCap', 'FullScreenCap', 'WindowCap', 'SharedMemoryCap', 'ReplayCap',
+    'FrameBusPublisher', 'frame_bus_name',
+    'FrameRecorder', 'FrameRecording', 'recording_path',
+    'ScreenshotWriter', 'ScreenshotJob',
     '__version__'
 ]
 
@@ -1,5 +1,4 @@
 import socket
-from time import sleep
 from typing import Optional, List, Tuple
 
 from adbutils import adb
@@ -7,10 +6,13 @@ from adbutils import adb
 from autosnapmanager.actions.clicks.android.touch import Touch
 from autosnapmanager.actions.clicks.android.touch_config import (
     MAATOUCH_PATH, MAATOUCH_REMOTE_PATH,
-    MAA_PACKAGE_NAME, MAATOUCH_SERVER_START_DELAY
+    MAA_PACKAGE_NAME, MAATOUCH_START_TIMEOUT
 )
 from autosnapmanager.utils.command_builder_utils import CommandBuilder
 from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.provision_tools import push_if_changed
+from autosnapmanager.utils.readiness_tools import wait_until_ready
+from autosnapmanager.utils.utils_config import READINESS_PROBE_TIMEOUT
 
 
 class MAATouchError(Exception):
@@ -24,8 +26,16 @@ class MAATouchUnSupportError(MAATouchError):
 class MAATouchManager:
     """https://github.com/MaaAssistantArknights/MaaTouch"""
 
-    def __init__(self, serial: str):
+    def __init__(self, serial: str, start_timeout: float = MAATOUCH_START_TIMEOUT):
+        """
+        初始化 MAATouch 管理器
+
+        Args:
+            serial: 设备序列号
+            start_timeout: 等待 MaaTouch 输出 ^ 信息行的期限(秒)，输出即返回
+        """
         self._adb = adb.device(serial)
+        self.start_timeout = start_timeout
         self.sock: Optional[socket.socket] = None
 
         try:
@@ -37,9 +47,9 @@ class MAATouchManager:
             raise
 
     def _setup_maatouch(self) -> None:
-        """安装 MAATouch 到设备"""
+        """安装 MAATouch 到设备，设备端文件已是最新时跳过推送"""
         try:
-            self._adb.sync.push(MAATOUCH_PATH, MAATOUCH_REMOTE_PATH)
+            push_if_changed(self._adb, [(MAATOUCH_PATH, MAATOUCH_REMOTE_PATH)], executable=False)
         except Exception as e:
             logger.error(f"MiniTouch 安装失败: {e}")
             raise
@@ -65,7 +75,6 @@ class MAATouchManager:
         try:
             cmd = f"CLASSPATH={MAATOUCH_REMOTE_PATH} app_process / {MAA_PACKAGE_NAME}"
             self._process = self._adb.shell(cmd, stream=True)
-            sleep(MAATOUCH_SERVER_START_DELAY)
             logger.info(f"MAATouch 进程已启动: adb shell {cmd}")
         except Exception as e:
             logger.error(f"MAATouch 启动失败: {e}")
@@ -75,12 +84,39 @@ class MAATouchManager:
         """建立 Socket 连接"""
         try:
             self.sock = self._process.conn
+            self._wait_maatouch_ready()
             self.sock.settimeout(10)
             self._read_socket_info()
         except Exception as e:
             logger.error(f"MAATouch Socket 连接失败: {e}")
             raise
 
+    def _wait_maatouch_ready(self) -> None:
+        """
+        以指数退避窥视 shell 输出，出现 ^ 信息行即视为就绪
+
+        Raises:
+            ServiceNotReadyError: 超过期限仍无输出、shell 连接已关闭或输出不是 ^ 信息行时抛出
+        """
+        state = {'alive': True, 'output': b''}
+
+        def probe() -> bool:
+            self.sock.settimeout(READINESS_PROBE_TIMEOUT)
+            data = self.sock.recv(1, socket.MSG_PEEK)
+            if data == b'^':
+                return True
+            # 连接关闭或输出了错误信息(如 app_process 找不到类)，不再等待
+            state['alive'] = False
+            state['output'] = self.sock.recv(1024, socket.MSG_PEEK) if data else b''
+            return False
+
+        try:
+            wait_until_ready(probe, self.start_timeout, "MAATouch", alive=lambda: state['alive'])
+        except Exception:
+            if state['output']:
+                logger.error(f"MAATouch 输出: {state['output'].decode(errors='replace').strip()}")
+            raise
+
     def _read_socket_info(self) -> None:
         """读取 Socket 连接信息"""
         try:
@@ -109,14 +145,15 @@ class MAATouchManager:
 
 
 class MAATouch(Touch):
-    def __init__(self, serial: str):
+    def __init__(self, serial: str, start_timeout: float = MAATOUCH_START_TIMEOUT):
         """
         初始化 MiniTouch 操作对象
 
         Args:
             serial: 设备序列号
+            start_timeout: 等待 MaaTouch 服务就绪的期限(秒)
         """
-        self.maatouch = MAATouchManager(serial)
+        self.maatouch = MAATouchManager(serial, start_timeout)
         self._builder = CommandBuilder(self.maatouch.sock)
 
     def click(self, x: int, y: int, duration: int = 50) -> None:
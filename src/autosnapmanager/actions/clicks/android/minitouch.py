@@ -5,7 +5,6 @@ Android 设备触摸操作实现
 
 import socket
 import subprocess
-from time import sleep
 from typing import Optional, Tuple, List
 
 from adbutils import adb
@@ -13,12 +12,14 @@ from adbutils import adb
 from autosnapmanager.actions.clicks.android.touch import Touch
 from autosnapmanager.actions.clicks.android.touch_config import (
     ADB_EXE, MINITOUCH_PATH, MINITOUCH_REMOTE_PATH,
-    MINITOUCH_REMOTE_ADDR, MINITOUCH_SERVER_START_DELAY,
+    MINITOUCH_REMOTE_ADDR, MINITOUCH_START_TIMEOUT,
     DEFAULT_HOST
 )
 from autosnapmanager.utils.adb_devices import DeviceInfo
 from autosnapmanager.utils.command_builder_utils import CommandBuilder
 from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.provision_tools import push_if_changed
+from autosnapmanager.utils.readiness_tools import wait_until_ready, probe_socket
 
 
 class MiniTouchError(Exception):
@@ -41,17 +42,20 @@ class MiniTouchManager:
         3: lambda x, y, w, h: (y, w - x)
     }
 
-    def __init__(self, serial: str):
+    def __init__(self, serial: str, start_timeout: float = MINITOUCH_START_TIMEOUT):
         """
         初始化 MiniTouch 管理器
         
         Args:
             serial: 设备序列号
-            
+            start_timeout: 等待 minitouch 服务就绪的期限(秒)，服务就绪即返回
+
         Raises:
             MiniTouchUnSupportError: 当设备不支持 MiniTouch 时抛出
+            ServiceNotReadyError: 当 minitouch 服务在期限内未就绪时抛出
         """
         self._adb = adb.device(serial)
+        self.start_timeout = start_timeout
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._process: Optional[subprocess.Popen] = None
         self._mapped_port: Optional[int] = None  # 映射到本机的端口
@@ -114,13 +118,9 @@ class MiniTouchManager:
             logger.warning(f"终止 MiniTouch 进程失败 {e}")
 
     def _setup_minitouch(self) -> None:
-        """安装 MiniTouch 到设备"""
+        """安装 MiniTouch 到设备，设备端文件已是最新时跳过推送"""
         try:
-            self._adb.sync.push(
-                f"{MINITOUCH_PATH}/{self.device_info.abi}/minitouch",
-                MINITOUCH_REMOTE_PATH
-            )
-            self._adb.shell(f"chmod +x {MINITOUCH_REMOTE_PATH}")
+            push_if_changed(self._adb, [(f"{MINITOUCH_PATH}/{self.device_info.abi}/minitouch", MINITOUCH_REMOTE_PATH)])
         except Exception as e:
             logger.error(f"MiniTouch 安装失败: {e}")
             raise
@@ -138,7 +138,6 @@ class MiniTouchManager:
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
-            sleep(MINITOUCH_SERVER_START_DELAY)
             logger.info(f"MiniTouch 进程已启动: {' '.join(cmd)}")
         except Exception as e:
             logger.error(f"MiniTouch 进程启动失败: {e}")
@@ -154,10 +153,14 @@ class MiniTouchManager:
             raise
 
     def _create_socket(self) -> None:
-        """建立 Socket 连接"""
+        """建立 Socket 连接，以指数退避重试直到收到 minitouch 的版本行"""
         try:
+            sock = wait_until_ready(lambda: probe_socket(DEFAULT_HOST, self._mapped_port, prefix=b'v'),
+                                    self.start_timeout, "MiniTouch",
+                                    alive=lambda: self._process is not None and self._process.poll() is None)
+            self.sock.close()
+            self.sock = sock
             self.sock.settimeout(10)
-            self.sock.connect((DEFAULT_HOST, self._mapped_port))
         except Exception as e:
             logger.error(f"Minitouch Socket 连接失败: {e}")
             raise
@@ -197,14 +200,15 @@ class MiniTouchManager:
 class MiniTouch(Touch):
     """MiniTouch 触摸操作实现"""
 
-    def __init__(self, serial: str):
+    def __init__(self, serial: str, start_timeout: float = MINITOUCH_START_TIMEOUT):
         """
         初始化 MiniTouch 操作对象
         
         Args:
             serial: 设备序列号
+            start_timeout: 等待 minitouch 服务就绪的期限(秒)
         """
-        self.minitouch = MiniTouchManager(serial)
+        self.minitouch = MiniTouchManager(serial, start_timeout)
         self._builder = CommandBuilder(self.minitouch.sock)
 
     def click(self, x: int, y: int, duration: int = 50) -> None:
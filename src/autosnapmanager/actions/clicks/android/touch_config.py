@@ -15,13 +15,13 @@ DEFAULT_BUFFER_SIZE = 0
 MINITOUCH_PATH = rf"{WORK_DIR}\bin\minitouch\libs"
 MINITOUCH_REMOTE_PATH = "/data/local/tmp/minitouch"
 MINITOUCH_REMOTE_ADDR = "localabstract:minitouch"
-MINITOUCH_SERVER_START_DELAY = 1
+MINITOUCH_START_TIMEOUT = 10  # 等待 minitouch 服务就绪的期限(秒)，服务就绪即返回
 
 # MaaTouch
 MAATOUCH_PATH = rf"{WORK_DIR}\bin\maatouch"
 MAATOUCH_REMOTE_PATH = "/data/local/tmp/maatouch"
 MAA_PACKAGE_NAME = "com.shxyke.MaaTouch.App"
-MAATOUCH_SERVER_START_DELAY = 1
+MAATOUCH_START_TIMEOUT = 10  # 等待 MaaTouch 输出 ^ 信息行的期限(秒)
 
 # operation
 DEFAULT_DELAY = 0.05
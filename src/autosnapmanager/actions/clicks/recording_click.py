@@ -0,0 +1,71 @@
+"""
+点击记录模块
+不连接设备或窗口，只记录 Manager 发出的点击与滑动操作。与 ReplayCap 搭配即可在没有设备的机器上运行完整的
+Manager 自动化流程(截图、匹配、坐标映射与点击)，并比较两次运行的操作序列是否一致。
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from autosnapmanager.actions.clicks.android.touch import Touch
+from autosnapmanager.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class ClickAction:
+    """记录的一次操作"""
+    kind: str  # 'click' 或 'swipe'
+    points: Tuple[Tuple[int, int], ...]  # 点击位置，或滑动的起点与终点(屏幕坐标)
+    duration: Optional[int]  # 按压或滑动时长(毫秒)，None 表示未指定
+    timestamp: float  # 操作时的 time.monotonic()
+
+
+class RecordingClick(Touch):
+    """
+    点击记录类，Android 与 Windows 均以 'record' 字符串使用
+
+    操作按调用顺序追加到 actions，线程安全
+    """
+
+    def __init__(self, serial: Optional[str] = None, window_name: Optional[str] = None):
+        """
+        初始化点击记录对象
+
+        Args:
+            serial: 设备序列号，Manager 以字符串 'record' 创建时传入，仅用于日志
+            window_name: 窗口名称，Manager 以字符串 'record' 创建时传入，仅用于日志
+        """
+        self.name = serial or window_name
+        self.actions: List[ClickAction] = []
+        self._lock = threading.Lock()
+
+    @property
+    def points(self) -> List[Tuple[int, int]]:
+        """所有点击操作的位置"""
+        with self._lock:
+            return [action.points[0] for action in self.actions if action.kind == 'click']
+
+    def click(self, x: int, y: int, duration: int = None) -> None:
+        self._record('click', ((int(x), int(y)),), duration)
+
+    def swipe(self, start_x: int, start_y: int, end_x: int, end_y: int, duration: int = None) -> None:
+        self._record('swipe', ((int(start_x), int(start_y)), (int(end_x), int(end_y))), duration)
+
+    def clear(self) -> None:
+        """清空已记录的操作"""
+        with self._lock:
+            self.actions.clear()
+
+    def _record(self, kind: str, points: Tuple[Tuple[int, int], ...], duration: Optional[int]) -> None:
+        """追加一次操作"""
+        with self._lock:
+            self.actions.append(ClickAction(kind, points, duration, time.monotonic()))
+        logger.debug(f"已记录操作 | {self.name} | {kind} {points}")
+
+
+if __name__ == "__main__":
+    touch = RecordingClick("127.0.0.1:16384")
+    touch.click(500, 500)
+    touch.swipe(800, 800, 100, 800)
+    print(touch.actions)
@@ -5,10 +5,13 @@ from adbutils import adb
 
 from autosnapmanager.actions.clicks.android.touch import Touch
 from autosnapmanager.managers.manager import Manager
-from autosnapmanager.managers.manager_config import System, ScreenCaps, Matches, Clicks, DefaultArgs
-from autosnapmanager.matches.match import Match
+from autosnapmanager.managers.manager_config import (
+    System, ScreenCaps, Matches, Clicks, DefaultArgs, CLASSMAP, OfflineMethods
+)
+from autosnapmanager.matches.match import Match, Region
 from autosnapmanager.screencaps.screencap import ScreenCap
 from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.module_class import get_class_name, check_class_name
 
 
 class AndroidManager(Manager):
@@ -25,9 +28,12 @@ class AndroidManager(Manager):
             serial: 设备名
             screencap: 截图方法
             match: 匹配方法
-            click: 点击方法
+            click: 点击方法；截图与点击均为离线方法(如 'replay' 与 'record')时不连接设备
         """
-        logger.info(f"正在连接设备: {adb.connect(serial)}")
+        if self._requires_device(screencap, 'ScreenCap') or self._requires_device(click, 'Click'):
+            logger.info(f"正在连接设备: {adb.connect(serial)}")
+        else:
+            logger.info(f"截图与点击均为离线方法，不连接设备: {serial}")
 
         for key in ['ScreenCap', 'Click']:
             DefaultArgs[System.Android][key]['serial'] = serial
@@ -37,21 +43,21 @@ class AndroidManager(Manager):
 
     def screenshot(self, save_path: str = None) -> None:
         """获取屏幕截图"""
-        self.screenCaps.save_screencap(save_path)
+        self.screenCaps.save_screencap(save_path=save_path)
 
-    def match(self, template: str, threshold: float = None) -> bool:
-        """匹配模板"""
-        return self.matches.match(self.screenCaps.screencap(), template, threshold)
+    def match(self, template: str, threshold: float = None, region: Optional[Region] = None) -> bool:
+        """匹配模板，region 限定搜索区域 (x, y, w, h)"""
+        return self.matches.match(self._capture(), template, threshold, self._to_frame_region(region))
 
     def click(self, template: Union[str, tuple], threshold: float = None,
               repeat: bool = False, min_distance: Tuple[int, int] = (1, 1),
-              duration: int = None
+              duration: int = None, region: Optional[Region] = None
               ) -> None:
-        """点击匹配位置, 接受图片路径与点击坐标元组"""
+        """点击匹配位置, 接受图片路径与点击坐标元组，region 限定模板搜索区域"""
         if isinstance(template, str):
-            x, y = self._locate_center(template, threshold) \
+            x, y = self._locate_center(template, threshold, region) \
                 if not repeat \
-                else self._locate_center_repeated(template, min_distance, threshold)
+                else self._locate_center_repeated(template, min_distance, threshold, region)
         else:
             x, y = template
 
@@ -65,16 +71,33 @@ class AndroidManager(Manager):
     def swipe(self, start_x: int, start_y: int, end_x: int, end_y: int) -> None:
         self.clicks.swipe(start_x, start_y, end_x, end_y)
 
-    def _locate_center(self, template: Union[str, np.ndarray], threshold: float = None) -> Tuple[int, int]:
-        """定位匹配区域最大相似度的中心坐标"""
-        return self.matches.locate_center(self.screenCaps.screencap(), template, threshold)
+    @staticmethod
+    def _requires_device(method: Optional[Union[str, ScreenCap, Touch]], key: str) -> bool:
+        """截图或点击方法是否需要连接设备，默认方法需要"""
+        if method is None:
+            return True
+        offline = OfflineMethods[key]
+        if isinstance(method, str):
+            return method not in offline
+        class_name = get_class_name(method)
+        return not any(check_class_name(CLASSMAP[key], [System.Android, name], class_name) for name in offline)
+
+    def _locate_center(self, template: Union[str, np.ndarray], threshold: float = None,
+                       region: Optional[Region] = None) -> Tuple[int, int]:
+        """定位匹配区域最大相似度的中心坐标，返回屏幕坐标"""
+        x, y = self.matches.locate_center(self._capture(), template, threshold, self._to_frame_region(region))
+        return self._to_screen(x, y)
 
     def _locate_center_repeated(self, template: Union[str, np.ndarray],
                                 min_distance: Tuple[int, int] = (0, 0),
-                                threshold: float = None
+                                threshold: float = None,
+                                region: Optional[Region] = None
                                 ) -> Tuple[List[int], List[int]]:
-        """定位匹配区域中指定阈值内的所有中心坐标"""
-        return self.matches.locate_center_repeated(self.screenCaps.screencap(), template, min_distance, threshold)
+        """定位匹配区域中指定阈值内的所有中心坐标，返回屏幕坐标"""
+        xs, ys = self.matches.locate_center_repeated(self._capture(), template, min_distance, threshold,
+                                                     self._to_frame_region(region))
+        points = [self._to_screen(x, y) for x, y in zip(xs, ys)]
+        return [x for x, _ in points], [y for _, y in points]
 
 
 if __name__ == '__main__':
@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
+from dataclasses import replace
 from threading import Lock
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, List, Sequence, Tuple
+
+import numpy as np
 
 from autosnapmanager.actions.clicks.click import Click
 from autosnapmanager.managers.manager_config import (
     CLASSMAP, DefaultMethods, System, ScreenCaps, Matches, Clicks
 )
-from autosnapmanager.matches.match import Match
+from autosnapmanager.matches.match import Match, MatchResult, Region
 from autosnapmanager.screencaps.screencap import ScreenCap
+from autosnapmanager.utils.process_image_tools import is_fractional_region
 from autosnapmanager.utils.module_class import get_class_name, check_class_name, get_module_class as module
 
 
@@ -37,15 +41,56 @@ class Manager(ABC):
         pass
 
     @abstractmethod
-    def match(self, template_path: str, threshold: float = None) -> bool:
-        """匹配模板是否存在"""
+    def match(self, template_path: str, threshold: float = None, region: Optional[Region] = None) -> bool:
+        """匹配模板是否存在，region 限定搜索区域"""
         pass
 
     @abstractmethod
-    def click(self, template: Union[str, tuple], threshold: float, repeat: bool, min_distance: tuple) -> None:
+    def click(self, template: Union[str, tuple], threshold: float, repeat: bool, min_distance: tuple,
+              region: Optional[Region] = None) -> None:
         """点击匹配位置(可选图片路径或元组坐标)"""
         pass
 
+    def match_all(self, templates: Sequence[str], thresholds: Optional[Union[float, Sequence[float]]] = None,
+                  region: Optional[Region] = None) -> List[MatchResult]:
+        """只截图一次，在同一帧上匹配所有模板，返回每个模板的匹配结果"""
+        results = self.matches.match_many(self._capture(), templates, thresholds, self._to_frame_region(region))
+        return [self._to_screen_result(result) for result in results]
+
+    def match_any(self, templates: Sequence[str], thresholds: Optional[Union[float, Sequence[float]]] = None,
+                  region: Optional[Region] = None) -> Optional[MatchResult]:
+        """只截图一次，按顺序返回第一个命中的模板结果，均未命中时返回 None"""
+        results = self.matches.match_many(self._capture(), templates, thresholds, self._to_frame_region(region),
+                                          first_hit=True)
+        return next((self._to_screen_result(result) for result in results if result.hit), None)
+
+    def _capture(self) -> np.ndarray:
+        """截图，并将截图缩放率同步给支持缩放的匹配方法，使模板与缩小解码的截图分辨率一致"""
+        image = self.screenCaps.screencap()
+        if hasattr(self.matches, 'frame_scale'):
+            self.matches.frame_scale = self.screenCaps.frame_scale
+        return image
+
+    def _to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """将截图坐标映射为屏幕坐标"""
+        scale = self.screenCaps.frame_scale
+        if scale == 1:
+            return x, y
+        return int(x / scale), int(y / scale)
+
+    def _to_screen_result(self, result: MatchResult) -> MatchResult:
+        """将匹配结果中的截图坐标映射为屏幕坐标"""
+        if result.location is None or self.screenCaps.frame_scale == 1:
+            return result
+        return replace(result, location=self._to_screen(*result.location))
+
+    def _to_frame_region(self, region: Optional[Region]) -> Optional[Region]:
+        """将屏幕坐标的搜索区域映射到截图坐标，比例形式的区域保持不变"""
+        scale = self.screenCaps.frame_scale
+        if region is None or scale == 1 or is_fractional_region(region):
+            return region
+        return tuple(int(v * scale) for v in region)
+
     def _init_method(self, system: System, params: dict, method: Any, super_class) -> Union[ScreenCap, Match, Click]:
         """初始化方法类"""
         if method is None:
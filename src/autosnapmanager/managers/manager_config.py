@@ -17,10 +17,13 @@ class ScreenCaps(StrEnum):
     Window = 'window'
     Adb = 'adb'
     MiniCap = 'minicap'
+    SharedMemory = 'shm'
+    Replay = 'replay'
 
 
 class Matches(StrEnum):
     OpenCV = 'opencv'
+    Feature = 'feature'
 
 
 class Clicks(StrEnum):
@@ -30,6 +33,7 @@ class Clicks(StrEnum):
     Adb = 'adb'
     MiniTouch = 'minitouch'
     MAATouch = 'maatouch'
+    Record = 'record'
 
 
 PARAMS_MAP = {
@@ -46,19 +50,24 @@ SCREENCAP = {
     System.Windows: {
         'fullscreen': 'autosnapmanager.screencaps.windows.fullscreencap.FullScreenCap',
         'window': 'autosnapmanager.screencaps.windows.windowcap.WindowCap',
+        'replay': 'autosnapmanager.screencaps.replay_cap.ReplayCap',
     },
     System.Android: {
         'adb': 'autosnapmanager.screencaps.android.adbcap.ADBCap',
         'minicap': 'autosnapmanager.screencaps.android.minicap.MiniCap',
+        'shm': 'autosnapmanager.screencaps.shared_memory_cap.SharedMemoryCap',
+        'replay': 'autosnapmanager.screencaps.replay_cap.ReplayCap',
     },
 }
 
 MATCH = {
     System.Windows: {
         'opencv': 'autosnapmanager.matches.windows.opencv_match.OpenCVMatch',
+        'feature': 'autosnapmanager.matches.windows.feature_match.FeatureMatch',
     },
     System.Android: {
         'opencv': 'autosnapmanager.matches.android.opencv_match.OpenCVMatch',
+        'feature': 'autosnapmanager.matches.android.feature_match.FeatureMatch',
     },
 }
 
@@ -67,11 +76,13 @@ CLICK = {
         'pyautogui': 'autosnapmanager.actions.clicks.windows.pyautogui_click.PyAutoGuiClick',
         'win32api': 'autosnapmanager.actions.clicks.windows.win32api_click.Win32ApiClick',
         'win32gui': 'autosnapmanager.actions.clicks.windows.win32gui_click.Win32GuiClick',
+        'record': 'autosnapmanager.actions.clicks.recording_click.RecordingClick',
     },
     System.Android: {
         'adb': 'autosnapmanager.actions.clicks.android.adb_touch.ADBTouch',
         'minitouch': 'autosnapmanager.actions.clicks.android.minitouch.MiniTouch',
         'maatouch': 'autosnapmanager.actions.clicks.android.maatouch.MAATouch',
+        'record': 'autosnapmanager.actions.clicks.recording_click.RecordingClick',
     },
 }
 
@@ -98,6 +109,12 @@ DefaultMethods = {
     },
 }
 
+# 不需要连接设备的方法，截图与点击均为离线方法时 AndroidManager 不连接设备
+OfflineMethods = {
+    'ScreenCap': ('replay',),
+    'Click': ('record',),
+}
+
 DefaultArgs = {
     System.Windows: {
         'ScreenCap': {'window_name': None},
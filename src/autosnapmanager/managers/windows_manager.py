@@ -5,7 +5,7 @@ import numpy as np
 from autosnapmanager.actions.clicks.click import Click
 from autosnapmanager.managers.manager import Manager
 from autosnapmanager.managers.manager_config import System, ScreenCaps, Matches, Clicks, DefaultArgs
-from autosnapmanager.matches.match import Match
+from autosnapmanager.matches.match import Match, Region
 from autosnapmanager.screencaps.screencap import ScreenCap
 from autosnapmanager.utils.dpi_tools import set_dpi_awareness
 
@@ -36,20 +36,21 @@ class WindowsManager(Manager):
 
     def screenshot(self, save_path: str = None) -> None:
         """获取屏幕截图"""
-        self.screenCaps.save_screencap(save_path)
+        self.screenCaps.save_screencap(save_path=save_path)
 
-    def match(self, template: str, threshold: float = None) -> bool:
-        """匹配模板"""
-        return self.matches.match(self.screenCaps.screencap(), template, threshold)
+    def match(self, template: str, threshold: float = None, region: Optional[Region] = None) -> bool:
+        """匹配模板，region 限定搜索区域 (x, y, w, h)"""
+        return self.matches.match(self._capture(), template, threshold, self._to_frame_region(region))
 
     def click(self, template: Union[str, tuple], threshold: float = None,
-              repeat: bool = False, min_distance: Tuple[int, int] = (1, 1)
+              repeat: bool = False, min_distance: Tuple[int, int] = (1, 1),
+              region: Optional[Region] = None
               ) -> None:
-        """点击匹配位置, 接受图片路径与点击坐标元组"""
+        """点击匹配位置, 接受图片路径与点击坐标元组，region 限定模板搜索区域"""
         if isinstance(template, str):
-            x, y = self._locate_center(template, threshold) \
+            x, y = self._locate_center(template, threshold, region) \
                 if not repeat \
-                else self._locate_center_repeated(template, min_distance, threshold)
+                else self._locate_center_repeated(template, min_distance, threshold, region)
         else:
             x, y = template
 
@@ -60,16 +61,22 @@ class WindowsManager(Manager):
             else:
                 self.clicks.click(x, y)
 
-    def _locate_center(self, template: Union[str, np.ndarray], threshold: float = None) -> Tuple[int, int]:
-        """定位匹配区域最大相似度的中心坐标"""
-        return self.matches.locate_center(self.screenCaps.screencap(), template, threshold)
+    def _locate_center(self, template: Union[str, np.ndarray], threshold: float = None,
+                       region: Optional[Region] = None) -> Tuple[int, int]:
+        """定位匹配区域最大相似度的中心坐标，返回屏幕坐标"""
+        x, y = self.matches.locate_center(self._capture(), template, threshold, self._to_frame_region(region))
+        return self._to_screen(x, y)
 
     def _locate_center_repeated(self, template: Union[str, np.ndarray],
                                 min_distance: Tuple[int, int] = (0, 0),
-                                threshold: float = None
+                                threshold: float = None,
+                                region: Optional[Region] = None
                                 ) -> Tuple[List[int], List[int]]:
-        """定位匹配区域中指定阈值内的所有中心坐标"""
-        return self.matches.locate_center_repeated(self.screenCaps.screencap(), template, min_distance, threshold)
+        """定位匹配区域中指定阈值内的所有中心坐标，返回屏幕坐标"""
+        xs, ys = self.matches.locate_center_repeated(self._capture(), template, min_distance, threshold,
+                                                     self._to_frame_region(region))
+        points = [self._to_screen(x, y) for x, y in zip(xs, ys)]
+        return [x for x, _ in points], [y for _, y in points]
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+from autosnapmanager.matches.windows.feature_match import FeatureMatch
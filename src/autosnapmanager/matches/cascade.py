@@ -0,0 +1,182 @@
+"""
+级联拒绝模块
+在完整的模板相关计算之前，用低成本的检查排除不可能达到匹配阈值的模板
+"""
+import threading
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+
+from autosnapmanager.matches.match_config import (
+    CASCADE_HIST_BINS, CASCADE_HIST_TOLERANCE, CASCADE_MIN_CONTAINMENT, CASCADE_COARSE_LEVELS, CASCADE_COARSE_RELAX,
+    PYRAMID_MIN_TEMPLATE_SIZE
+)
+from autosnapmanager.matches.template_cache import TemplateCache
+from autosnapmanager.utils.process_image_tools import image_signature
+
+
+class RejectionCascade:
+    """
+    模板匹配的级联拒绝器
+
+    第一级比较颜色直方图：模板出现在帧中时，模板各分箱的像素数不应多于帧(允许少量亮度偏移)；
+    第二级在缩小 2^n 倍的帧与模板上做相关，粗匹配相似度低于放宽后的阈值时拒绝。
+    两级检查均为启发式，误拒率可通过 OpenCVMatch.evaluate_cascade 在样本集上测量。
+    """
+
+    def __init__(self,
+                 hist_bins: int = CASCADE_HIST_BINS,
+                 hist_tolerance: int = CASCADE_HIST_TOLERANCE,
+                 min_containment: float = CASCADE_MIN_CONTAINMENT,
+                 coarse_levels: int = CASCADE_COARSE_LEVELS,
+                 coarse_relax: float = CASCADE_COARSE_RELAX
+                 ):
+        """
+        初始化级联拒绝器
+
+        Args:
+            hist_bins: 直方图每通道的分箱数
+            hist_tolerance: 直方图比较时允许的亮度偏移(分箱数)
+            min_containment: 模板直方图被帧直方图包含的最低比例，0 表示关闭直方图检查
+            coarse_levels: 粗相关阶段的金字塔层数，0 表示关闭粗相关检查
+            coarse_relax: 粗相关阶段每层相对匹配阈值的放宽量
+        """
+        if not (0 <= min_containment <= 1):
+            raise ValueError("直方图包含比例必须在 [0, 1] 范围内")
+        if coarse_levels < 0:
+            raise ValueError("金字塔层数不能为负数")
+
+        self.hist_bins = hist_bins
+        self.hist_tolerance = hist_tolerance
+        self.min_containment = min_containment
+        self.coarse_levels = coarse_levels
+        self.coarse_relax = coarse_relax
+
+        self._frame = threading.local()  # 最近一帧的直方图与金字塔，同一帧上的多个模板复用
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected_histogram = 0
+        self.rejected_coarse = 0
+
+    def reject(self, image: np.ndarray, template: np.ndarray, threshold: float, method: int,
+               template_cache: TemplateCache) -> bool:
+        """
+        判断模板是否可以跳过完整相关计算
+
+        Args:
+            image: 预处理后的图像
+            template: 预处理后的模板
+            threshold: 匹配阈值
+            method: 相关方法(须为相似度越大越匹配的归一化方法)
+            template_cache: 模板缓存，模板的直方图与缩小后的模板随模板缓存
+
+        Returns:
+            bool: True 表示模板不可能达到匹配阈值
+        """
+        stage = self.rejecting_stage(image, template, threshold, method, template_cache)
+        with self._lock:
+            self.checked += 1
+            if stage == 'histogram':
+                self.rejected_histogram += 1
+            elif stage == 'coarse':
+                self.rejected_coarse += 1
+        return stage is not None
+
+    def rejecting_stage(self, image: np.ndarray, template: np.ndarray, threshold: float, method: int,
+                        template_cache: TemplateCache) -> Optional[str]:
+        """
+        返回拒绝模板的阶段，不计入统计
+
+        Returns:
+            Optional[str]: 'histogram' 或 'coarse'，未被拒绝时为 None
+        """
+        signature = image_signature(template)
+
+        if self.min_containment > 0:
+            template_hist = template_cache.get((signature, 'hist', self.hist_bins), lambda: self._histogram(template))
+            if self._containment(template_hist, self._frame_histogram(image)) < self.min_containment:
+                return 'histogram'
+
+        levels = self._get_levels(template)
+        if levels:
+            def load() -> np.ndarray:
+                coarse = self._pyr_down(template, levels)
+                coarse.flags.writeable = False
+                return coarse
+
+            coarse_template = template_cache.get((signature, 'pyramid', levels), load)
+            coarse_image = self._frame_pyramid(image, levels)
+            if coarse_template.shape[0] <= coarse_image.shape[0] and coarse_template.shape[1] <= coarse_image.shape[1]:
+                _, max_var, _, _ = cv2.minMaxLoc(cv2.matchTemplate(coarse_image, coarse_template, method))
+                if max_var < threshold - self.coarse_relax * levels:
+                    return 'coarse'
+
+        return None
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """获取拒绝统计信息"""
+        with self._lock:
+            rejected = self.rejected_histogram + self.rejected_coarse
+            return {
+                'checked': self.checked,
+                'rejected': rejected,
+                'rejected_histogram': self.rejected_histogram,
+                'rejected_coarse': self.rejected_coarse,
+                'rejection_rate': rejected / self.checked if self.checked else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """重置拒绝统计信息"""
+        with self._lock:
+            self.checked = self.rejected_histogram = self.rejected_coarse = 0
+
+    def _frame_histogram(self, image: np.ndarray) -> np.ndarray:
+        """获取帧直方图，同一帧只计算一次"""
+        if getattr(self._frame, 'image', None) is not image:
+            self._frame.image, self._frame.hist, self._frame.pyramid = image, None, {}
+        if self._frame.hist is None:
+            self._frame.hist = self._dilate(self._histogram(image))
+        return self._frame.hist
+
+    def _frame_pyramid(self, image: np.ndarray, levels: int) -> np.ndarray:
+        """获取缩小 2^levels 倍的帧，同一帧只计算一次"""
+        if getattr(self._frame, 'image', None) is not image:
+            self._frame.image, self._frame.hist, self._frame.pyramid = image, None, {}
+        if levels not in self._frame.pyramid:
+            self._frame.pyramid[levels] = self._pyr_down(image, levels)
+        return self._frame.pyramid[levels]
+
+    def _histogram(self, img: np.ndarray) -> np.ndarray:
+        """计算各通道直方图，形状为 (通道数, 分箱数)"""
+        channels = 1 if img.ndim == 2 else img.shape[2]
+        return np.stack([cv2.calcHist([img], [c], None, [self.hist_bins], [0, 256]).ravel()
+                         for c in range(channels)])
+
+    def _dilate(self, hist: np.ndarray) -> np.ndarray:
+        """帧直方图在相邻分箱内取最大值，容许模板整体亮度的轻微偏移"""
+        if self.hist_tolerance <= 0:
+            return hist
+        size = 2 * self.hist_tolerance + 1
+        return cv2.dilate(hist.astype(np.float32), np.ones((1, size), dtype=np.uint8),
+                          borderType=cv2.BORDER_REPLICATE)
+
+    @staticmethod
+    def _containment(template_hist: np.ndarray, frame_hist: np.ndarray) -> float:
+        """模板直方图被帧直方图包含的比例，取各通道的最小值"""
+        covered = np.minimum(template_hist, frame_hist).sum(axis=1)
+        return float(np.min(covered / np.maximum(template_hist.sum(axis=1), 1)))
+
+    def _get_levels(self, template: np.ndarray) -> int:
+        """根据模板尺寸确定可用的金字塔层数"""
+        levels = self.coarse_levels
+        while levels > 0 and min(template.shape[:2]) // (2 ** levels) < PYRAMID_MIN_TEMPLATE_SIZE:
+            levels -= 1
+        return levels
+
+    @staticmethod
+    def _pyr_down(img: np.ndarray, levels: int) -> np.ndarray:
+        """高斯金字塔逐层缩小"""
+        for _ in range(levels):
+            img = cv2.pyrDown(img)
+        return img
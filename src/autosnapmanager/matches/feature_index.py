@@ -0,0 +1,175 @@
+"""
+模板特征索引模块
+提取模板的特征点与描述子，并以 .npz 文件持久化到磁盘，进程重启后无需重新提取
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from autosnapmanager.matches.match_config import (
+    FEATURE_DETECTORS, FEATURE_INDEX_DIR, FEATURE_TEMPLATE_MAX_KEYPOINTS, FEATURE_FRAME_MAX_KEYPOINTS
+)
+from autosnapmanager.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class Features:
+    """图像的特征点坐标与描述子"""
+    points: np.ndarray  # (N, 2) float32 特征点坐标 (x, y)
+    descriptors: np.ndarray  # (N, D) uint8 二进制描述子
+    size: Tuple[int, int]  # 图像 (高, 宽)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+def create_detector(detector: str, max_keypoints: int) -> cv2.Feature2D:
+    """
+    创建特征检测器
+
+    Args:
+        detector: 检测器名称，'orb' 或 'akaze'（均为二进制描述子，使用汉明距离匹配）
+        max_keypoints: 最多提取的特征点数，仅 ORB 有效
+
+    Returns:
+        cv2.Feature2D: 特征检测器
+    """
+    if detector == 'orb':
+        return cv2.ORB_create(nfeatures=max_keypoints)
+    if detector == 'akaze':
+        if not hasattr(cv2, 'AKAZE_create'):
+            raise ValueError("当前 OpenCV 版本未包含 AKAZE，请使用 'orb'")
+        return cv2.AKAZE_create()
+    raise ValueError(f"不支持的特征检测器: {detector}，可选: {FEATURE_DETECTORS}")
+
+
+def extract_features(detector: cv2.Feature2D, gray: np.ndarray) -> Features:
+    """
+    提取灰度图的特征
+
+    Args:
+        detector: create_detector 创建的特征检测器
+        gray: 灰度图像
+
+    Returns:
+        Features: 特征点与描述子，未检出特征时为空数组
+    """
+    keypoints, descriptors = detector.detectAndCompute(gray, None)
+    if descriptors is None or not keypoints:
+        return Features(points=np.empty((0, 2), dtype=np.float32),
+                        descriptors=np.empty((0, 0), dtype=np.uint8),
+                        size=gray.shape[:2])
+    points = np.array([kp.pt for kp in keypoints], dtype=np.float32)
+    return Features(points=points, descriptors=descriptors, size=gray.shape[:2])
+
+
+class FeatureIndex:
+    """
+    模板特征的磁盘索引
+
+    每个模板对应索引目录下的一个 .npz 文件，文件名由模板身份(路径或内容摘要)与检测器参数生成，
+    文件内记录模板签名，模板文件被修改后签名不一致，自动重新提取并覆盖。
+    """
+
+    def __init__(self, index_dir: Optional[str] = FEATURE_INDEX_DIR, detector: str = 'orb',
+                 max_keypoints: int = FEATURE_TEMPLATE_MAX_KEYPOINTS,
+                 frame_max_keypoints: int = FEATURE_FRAME_MAX_KEYPOINTS):
+        """
+        初始化特征索引
+
+        Args:
+            index_dir: 索引目录，None(默认)表示不持久化
+            detector: 特征检测器名称
+            max_keypoints: 每个模板最多提取的特征点数
+            frame_max_keypoints: 每帧最多提取的特征点数
+        """
+        self.index_dir = index_dir
+        self.detector = detector
+        self.max_keypoints = max_keypoints
+        self._template_detector = create_detector(detector, max_keypoints)
+        self._frame_detector = create_detector(detector, frame_max_keypoints)
+
+    def load(self, signature: Tuple, gray_loader: Callable[[], np.ndarray]) -> Features:
+        """
+        读取模板特征，索引中不存在或已过期时提取并写入索引
+
+        Args:
+            signature: image_signature 生成的模板签名
+            gray_loader: 返回模板灰度图的无参函数，仅在需要重新提取时调用
+
+        Returns:
+            Features: 模板特征
+        """
+        path = self._index_path(signature)
+        features = self._read(path, signature) if path else None
+        if features is not None:
+            return features
+
+        features = extract_features(self._template_detector, gray_loader())
+        if len(features) == 0:
+            logger.warning(f"模板未检出任何特征点 | 签名: {signature[:2]}")
+        if path:
+            self._write(path, signature, features)
+        return features
+
+    def extract_frame(self, gray: np.ndarray) -> Features:
+        """提取帧特征"""
+        return extract_features(self._frame_detector, gray)
+
+    def clear(self) -> int:
+        """
+        清空磁盘索引
+
+        Returns:
+            int: 被删除的索引文件数量
+        """
+        if not self.index_dir or not os.path.isdir(self.index_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(self.index_dir):
+            if name.endswith('.npz'):
+                os.remove(os.path.join(self.index_dir, name))
+                removed += 1
+        return removed
+
+    def _index_path(self, signature: Tuple) -> str:
+        """生成模板对应的索引文件路径，路径模板以路径为身份，同一文件的新旧版本共用一个索引文件"""
+        if not self.index_dir:
+            return ''
+        identity = signature[:2] + (self.detector, self.max_keypoints)
+        digest = hashlib.blake2b(repr(identity).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.index_dir, f"{digest}.npz")
+
+    @staticmethod
+    def _read(path: str, signature: Tuple) -> Optional[Features]:
+        """读取索引文件，文件不存在、已损坏或签名不一致时返回 None"""
+        if not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['signature']) != repr(signature):
+                    return None
+                return Features(points=data['points'], descriptors=data['descriptors'],
+                                size=tuple(int(v) for v in data['size']))
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"特征索引文件读取失败，将重新提取 | 文件: {path} | 错误: {e}")
+            return None
+
+    @staticmethod
+    def _write(path: str, signature: Tuple, features: Features) -> None:
+        """写入索引文件，先写临时文件再替换，避免并发读取到不完整的文件"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, signature=np.array(repr(signature)), points=features.points,
+                         descriptors=features.descriptors, size=np.array(features.size))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"特征索引文件写入失败 | 文件: {path} | 错误: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,162 @@
+"""
+频域相关模块
+在频域计算与 cv2.TM_CCOEFF_NORMED 等价的归一化互相关，模板频谱可按帧尺寸预先计算并缓存
+"""
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TemplateSpectrum:
+    """零均值模板在指定 DFT 尺寸下的频谱"""
+    spectra: Tuple[np.ndarray, ...]  # 各通道 CCS 压缩格式的频谱
+    norm: float  # 零均值模板的 L2 范数（所有通道）
+    template_size: Tuple[int, int]  # 模板 (高, 宽)
+    frame_size: Tuple[int, int]  # 适用的帧 (高, 宽)
+
+    @property
+    def nbytes(self) -> int:
+        """频谱占用的内存(字节)，供模板缓存计入内存上限"""
+        return sum(spectrum.nbytes for spectrum in self.spectra)
+
+
+def _split_channels(img: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """按通道拆分为 float32 单通道数组"""
+    img = img.astype(np.float32)
+    if img.ndim == 2:
+        return img,
+    return tuple(img[:, :, c] for c in range(img.shape[2]))
+
+
+def template_spectrum(template: np.ndarray, frame_size: Tuple[int, int]) -> TemplateSpectrum:
+    """
+    计算模板频谱
+
+    Args:
+        template: 预处理后的模板(GRAY 或 BGR)
+        frame_size: 待匹配帧的 (高, 宽)
+
+    Returns:
+        TemplateSpectrum: 可在同尺寸帧上复用的模板频谱
+    """
+    height, width = template.shape[:2]
+    dft_height = cv2.getOptimalDFTSize(frame_size[0])
+    dft_width = cv2.getOptimalDFTSize(frame_size[1])
+
+    spectra = []
+    norm = 0.0
+    for channel in _split_channels(template):
+        # TM_CCOEFF 的模板按通道减去均值，窗口均值项因此在分子中抵消
+        channel = channel - channel.mean()
+        norm += float(np.sum(np.square(channel, dtype=np.float64)))
+
+        padded = np.zeros((dft_height, dft_width), dtype=np.float32)
+        padded[:height, :width] = channel
+        spectra.append(cv2.dft(padded, nonzeroRows=height))
+
+    return TemplateSpectrum(
+        spectra=tuple(spectra),
+        norm=float(np.sqrt(norm)),
+        template_size=(height, width),
+        frame_size=tuple(frame_size[:2])
+    )
+
+
+@dataclass(frozen=True)
+class FrameSpectrum:
+    """帧在指定 DFT 尺寸下的频谱与积分图，可被同一帧上的多个模板复用"""
+    spectra: Tuple[np.ndarray, ...]  # 各通道 CCS 压缩格式的频谱
+    integrals: Tuple[Tuple[np.ndarray, np.ndarray], ...]  # 各通道的 (积分图, 平方积分图)
+    frame_size: Tuple[int, int]  # 帧 (高, 宽)
+
+
+def frame_spectrum(image: np.ndarray) -> FrameSpectrum:
+    """
+    计算帧频谱与积分图
+
+    Args:
+        image: 预处理后的图像(GRAY 或 BGR)
+
+    Returns:
+        FrameSpectrum: 帧频谱
+    """
+    image_height, image_width = image.shape[:2]
+    dft_height = cv2.getOptimalDFTSize(image_height)
+    dft_width = cv2.getOptimalDFTSize(image_width)
+
+    spectra = []
+    integrals = []
+    for channel in _split_channels(image):
+        padded = np.zeros((dft_height, dft_width), dtype=np.float32)
+        padded[:image_height, :image_width] = channel
+        spectra.append(cv2.dft(padded, nonzeroRows=image_height))
+        integrals.append(cv2.integral2(channel, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F))
+
+    return FrameSpectrum(
+        spectra=tuple(spectra),
+        integrals=tuple(integrals),
+        frame_size=(image_height, image_width)
+    )
+
+
+def fft_match_template(image: Union[np.ndarray, FrameSpectrum], spectrum: TemplateSpectrum) -> np.ndarray:
+    """
+    在频域计算归一化相关系数矩阵，结果与 cv2.matchTemplate(..., cv2.TM_CCOEFF_NORMED) 一致（浮点误差内）
+
+    Args:
+        image: 预处理后的图像(通道数须与模板一致)，或 frame_spectrum 预先计算的帧频谱
+        spectrum: template_spectrum 计算的模板频谱
+
+    Returns:
+        np.ndarray: 尺寸为 (H - h + 1, W - w + 1) 的 float32 相似度矩阵
+    """
+    frame = image if isinstance(image, FrameSpectrum) else frame_spectrum(image)
+    if frame.frame_size != spectrum.frame_size:
+        raise ValueError(f"模板频谱适用的帧尺寸 {spectrum.frame_size} 与图像尺寸 {frame.frame_size} 不一致")
+
+    image_height, image_width = frame.frame_size
+    height, width = spectrum.template_size
+    result_height = image_height - height + 1
+    result_width = image_width - width + 1
+    count = height * width
+
+    numerator = None
+    variance = None
+    square_sum = None
+
+    for frame_spectrum_, (window_sum, window_square), template_spectrum_ in zip(
+            frame.spectra, frame.integrals, spectrum.spectra):
+        product = cv2.mulSpectrums(frame_spectrum_, template_spectrum_, 0, conjB=True)
+        correlation = cv2.idft(product, flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE, nonzeroRows=result_height)
+        correlation = correlation[:result_height, :result_width]
+
+        # 积分图计算每个窗口的和与平方和，方差在 float64 下相减以避免精度损失
+        sums = _window_sum(window_sum, height, width)
+        squares = _window_sum(window_square, height, width)
+        channel_variance = cv2.subtract(squares, cv2.multiply(sums, sums, scale=1 / count))
+
+        if numerator is None:
+            numerator, variance, square_sum = correlation.copy(), channel_variance, squares
+        else:
+            numerator += correlation
+            variance += channel_variance
+            square_sum += squares
+
+    # 与 OpenCV 一致：窗口方差过小时视为常数区域，相似度记为 0
+    valid = variance > np.minimum(0.5, 10 * np.finfo(np.float32).eps * square_sum)
+    denominator = cv2.sqrt(np.maximum(variance, 0).astype(np.float32)) * np.float32(spectrum.norm)
+
+    result = np.zeros((result_height, result_width), dtype=np.float32)
+    np.divide(numerator, denominator, out=result, where=valid & (denominator > 0))
+    # 浮点误差可能使相似度略微超出 [-1, 1]，超出过多说明数值不稳定，记为 0
+    result[np.abs(result) >= 1.125] = 0
+    return np.clip(result, -1, 1, out=result)
+
+
+def _window_sum(integral: np.ndarray, height: int, width: int) -> np.ndarray:
+    """由积分图计算所有 height x width 窗口的和"""
+    return (integral[height:, width:] - integral[:-height, width:]
+            - integral[height:, :-width] + integral[:-height, :-width])
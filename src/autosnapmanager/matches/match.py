@@ -1,24 +1,74 @@
 from abc import ABC, abstractmethod
-from typing import Union, Tuple, List
+from dataclasses import dataclass
+from typing import Union, Tuple, List, Optional, Sequence
 
 import numpy as np
 
+# 搜索区域 (x, y, w, h)，整数为像素坐标；全部在 [0, 1] 内且含浮点数时为相对图像宽高的比例，如 (0, 0.5, 1.0, 0.5)
+Region = Tuple[Union[int, float], Union[int, float], Union[int, float], Union[int, float]]
+
+
+@dataclass
+class MatchResult:
+    """单个模板的匹配结果"""
+    template: Union[str, np.ndarray]
+    hit: bool
+    score: float
+    location: Optional[Tuple[int, int]] = None  # 匹配中心坐标(整幅图像坐标系)，未命中时为 None
+
 
 class Match(ABC):
     @abstractmethod
-    def match(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None) -> bool:
-        """匹配模板"""
+    def match(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None,
+              region: Optional[Region] = None) -> bool:
+        """匹配模板，region 限定搜索区域"""
         pass
 
     @abstractmethod
     def locate_center(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray],
-                      threshold: float = None) -> Tuple[int, int]:
-        """定位匹配区域最大相似度的中心坐标"""
+                      threshold: float = None, region: Optional[Region] = None) -> Tuple[int, int]:
+        """定位匹配区域最大相似度的中心坐标，返回整幅图像坐标系下的坐标"""
         pass
 
     def locate_center_repeated(self,
                                image: Union[str, np.ndarray], template: Union[str, np.ndarray],
-                               min_distance: Tuple[int, int] = (0, 0), threshold: float = None
+                               min_distance: Tuple[int, int] = (0, 0), threshold: float = None,
+                               region: Optional[Region] = None
                                ) -> Tuple[List[int], List[int]]:
-        """定位匹配区域中指定阈值内的所有中心坐标"""
+        """定位匹配区域中指定阈值内的所有中心坐标，返回整幅图像坐标系下的坐标"""
         pass
+
+    def match_many(self,
+                   image: Union[str, np.ndarray], templates: Sequence[Union[str, np.ndarray]],
+                   thresholds: Optional[Union[float, Sequence[float]]] = None,
+                   region: Optional[Region] = None, first_hit: bool = False
+                   ) -> List[MatchResult]:
+        """
+        在同一帧图像上依次匹配多个模板，first_hit 为 True 时命中第一个模板后即停止
+
+        通用实现逐个调用 match 与 locate_center，无法获得相似度，score 以 1.0/0.0 表示命中与否；
+        子类可覆盖以共享图像预处理并返回实际相似度
+
+        Args:
+            image: 输入图像，可以是路径或numpy数组
+            templates: 模板列表
+            thresholds: 匹配阈值，可以是统一阈值或与模板一一对应的阈值列表，None 使用默认阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
+            first_hit: 是否在第一个命中的模板处停止（按模板顺序作为优先级）
+
+        Returns:
+            List[MatchResult]: 每个模板的匹配结果（first_hit 时仅包含已匹配的模板）
+        """
+        if thresholds is None or isinstance(thresholds, (int, float)):
+            thresholds = [thresholds] * len(templates)
+        elif len(thresholds) != len(templates):
+            raise ValueError("阈值数量必须与模板数量一致")
+
+        results = []
+        for template, threshold in zip(templates, thresholds):
+            hit = self.match(image, template, threshold, region)
+            location = self.locate_center(image, template, threshold, region) if hit else None
+            results.append(MatchResult(template=template, hit=hit, score=1.0 if hit else 0.0, location=location))
+            if hit and first_hit:
+                break
+        return results
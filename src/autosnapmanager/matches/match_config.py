@@ -0,0 +1,49 @@
+import os
+
+WORK_DIR = os.path.dirname(__file__)
+
+# template cache
+TEMPLATE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 模板缓存内存上限(字节)
+TEMPLATE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+# pyramid
+PYRAMID_THRESHOLD_RELAX = 0.15  # 粗匹配阶段每层相对匹配阈值的放宽量
+PYRAMID_MIN_TEMPLATE_SIZE = 8  # 粗匹配模板的最小边长(像素)，不足时自动减少金字塔层数
+PYRAMID_REFINE_MARGIN = 2  # 精匹配窗口在候选点周围额外扩展的像素
+PYRAMID_MAX_COVERAGE = 0.3  # 精匹配窗口覆盖率超过该比例时退化为全图匹配
+
+# fft
+MATCH_ENGINES = ('spatial', 'fft', 'auto')
+FFT_AUTO_AREA_RATIO = 1 / 4  # auto 模式下模板面积占帧面积不低于该比例时使用频域相关
+
+# scale
+SCALE_MODES = ('frame', 'template')  # scale=True 时缩放帧(每次匹配)或缩放模板(随模板缓存一次)
+
+# multi-scale
+MULTISCALE_STEPS = 9  # 多尺度搜索在缩放范围内(按等比)采样的尺度数
+MULTISCALE_MIN_TEMPLATE_SIZE = 8  # 缩放后模板的最小边长(像素)，更小的尺度将被跳过
+MULTISCALE_MEMORY_SIZE = 1024  # 记住的命中尺度条数(模板 x 帧尺寸)，超出时淘汰最久未用的
+
+# cascade
+CASCADE_HIST_BINS = 32  # 直方图每通道的分箱数
+CASCADE_HIST_TOLERANCE = 1  # 直方图比较时允许的亮度偏移(分箱数)
+CASCADE_MIN_CONTAINMENT = 0.8  # 模板直方图被帧直方图包含的比例低于该值时拒绝
+CASCADE_COARSE_LEVELS = 2  # 粗相关阶段的金字塔层数
+CASCADE_COARSE_RELAX = 0.05  # 粗相关阶段每层相对匹配阈值的放宽量(高斯平滑后真实匹配的相似度下降很小)
+
+# feature
+FEATURE_DETECTORS = ('orb', 'akaze')
+FEATURE_INDEX_DIR = None  # 模板特征磁盘索引目录，默认不持久化(包安装目录可能只读或被多个用户共享)
+FEATURE_TEMPLATE_MAX_KEYPOINTS = 500  # 每个模板最多提取的特征点数(ORB)
+FEATURE_FRAME_MAX_KEYPOINTS = 20000  # 每帧最多提取的特征点数(ORB)，过少时模板区域的特征点可能被全帧响应更强的点挤掉
+FEATURE_RATIO_TEST = 0.75  # 最近邻与次近邻距离比阈值(Lowe's ratio test)
+FEATURE_MIN_INLIERS = 8  # 单应性校验所需的最少内点数
+FEATURE_RANSAC_REPROJ_THRESHOLD = 5.0  # RANSAC 重投影误差阈值(像素)
+FEATURE_MATCH_THRESHOLD = 0.3  # 默认匹配阈值(通过单应性校验的模板特征点 / 模板特征点总数)
+FEATURE_MAX_SCALE_CHANGE = 8.0  # 单应性允许的最大缩放倍数，超出视为退化解
+FEATURE_MAX_INSTANCES = 32  # locate_center_repeated 最多检出的实例数
+
+if __name__ == "__main__":
+    from autosnapmanager.utils.print_config import print_config
+
+    print_config()
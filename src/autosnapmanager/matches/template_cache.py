@@ -0,0 +1,189 @@
+"""
+模板缓存模块
+按模板内容签名缓存预处理后的模板，避免每次匹配重复解码与颜色转换
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from autosnapmanager.matches.match_config import TEMPLATE_CACHE_MAX_BYTES, TEMPLATE_EXTENSIONS
+from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.process_image_tools import image_signature
+
+
+class TemplateCache:
+    """
+    有内存上限的 LRU 模板缓存
+
+    缓存键为 (模板签名, *预处理参数)，模板签名由 image_signature 生成：
+    路径模板以 路径+修改时间+文件大小 为键，文件变化后自动失效；数组模板以内容摘要为键。
+    """
+
+    def __init__(self, max_bytes: int = TEMPLATE_CACHE_MAX_BYTES):
+        """
+        初始化模板缓存
+
+        Args:
+            max_bytes: 缓存内存上限(字节)，超出时按最近最少使用顺序淘汰
+        """
+        if max_bytes <= 0:
+            raise ValueError("缓存内存上限必须大于0")
+
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple, factory: Callable[[], Any]) -> Any:
+        """
+        获取缓存项，未命中时调用 factory 生成并写入缓存
+
+        Args:
+            key: 缓存键，首元素必须为模板签名
+            factory: 生成缓存值的无参函数
+
+        Returns:
+            Any: 缓存值
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = factory()
+        self._put(key, value)
+        return value
+
+    def preload(self, directory: Union[str, Path], loader: Callable[[str], Any], recursive: bool = True) -> int:
+        """
+        预加载目录下的所有模板
+
+        Args:
+            directory: 模板目录
+            loader: 接收模板路径并通过本缓存加载模板的函数
+            recursive: 是否递归子目录
+
+        Returns:
+            int: 预加载的模板数量
+        """
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"模板目录不存在: {directory}")
+
+        pattern = '**/*' if recursive else '*'
+        count = 0
+        for path in sorted(Path(directory).glob(pattern)):
+            if path.is_file() and path.suffix.lower() in TEMPLATE_EXTENSIONS:
+                loader(str(path))
+                count += 1
+
+        logger.info(f"模板预加载完成 | 目录: {directory} | 数量: {count}")
+        return count
+
+    def invalidate(self, template: Optional[Union[str, Path, Image.Image, np.ndarray]] = None) -> int:
+        """
+        使缓存失效
+
+        Args:
+            template: 要失效的模板路径或数组，None 表示清空全部缓存
+
+        Returns:
+            int: 被移除的缓存项数量
+        """
+        with self._lock:
+            if template is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+
+            if isinstance(template, (str, Path)):
+                # 同一路径的所有版本（不同修改时间）一并失效
+                path = os.path.abspath(str(template))
+                keys = [key for key in self._entries if key[0][0] == 'file' and key[0][1] == path]
+            else:
+                signature = image_signature(template)
+                keys = [key for key in self._entries if key[0] == signature]
+
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def _put(self, key: Tuple, value: Any) -> None:
+        """写入缓存项并按内存上限淘汰"""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            logger.warning(f"模板大小 {size} 字节超出缓存上限 {self.max_bytes}，不予缓存")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            else:
+                self._drop_stale_versions(key[0])
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _drop_stale_versions(self, signature: Tuple) -> None:
+        """移除同一路径下已过期（文件已被修改）的缓存项"""
+        if signature[0] != 'file':
+            return
+        stale = [key for key in self._entries if key[0][0] == 'file' and key[0][1] == signature[1]
+                 and key[0] != signature]
+        for key in stale:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        """移除缓存项（调用方需持有锁）"""
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    @classmethod
+    def _sizeof(cls, value: Any) -> int:
+        """估算缓存值占用的内存"""
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(getattr(value, 'nbytes', None), int):
+            # 自行报告内存占用的缓存值，如 TemplateSpectrum
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sum(cls._sizeof(v) for v in value)
+        if isinstance(value, dict):
+            return sum(cls._sizeof(v) for v in value.values())
+        if is_dataclass(value):
+            return sum(cls._sizeof(getattr(value, field.name)) for field in fields(value))
+        return 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
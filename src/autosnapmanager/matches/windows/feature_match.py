@@ -0,0 +1,318 @@
+"""
+特征点匹配模块
+使用 ORB/AKAZE 特征点与单应性校验实现图像匹配，适用于目标存在缩放或轻微旋转的场景
+"""
+from collections import defaultdict
+from pathlib import Path
+from typing import Union, Tuple, List, Optional, Dict, Sequence
+
+import cv2
+import numpy as np
+
+from autosnapmanager.matches.feature_index import Features, FeatureIndex
+from autosnapmanager.matches.match import Match, MatchResult, Region
+from autosnapmanager.matches.match_config import (
+    FEATURE_INDEX_DIR, FEATURE_TEMPLATE_MAX_KEYPOINTS, FEATURE_FRAME_MAX_KEYPOINTS, FEATURE_RATIO_TEST,
+    FEATURE_MIN_INLIERS, FEATURE_RANSAC_REPROJ_THRESHOLD, FEATURE_MATCH_THRESHOLD, FEATURE_MAX_SCALE_CHANGE,
+    FEATURE_MAX_INSTANCES
+)
+from autosnapmanager.matches.template_cache import TemplateCache
+from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.process_image_tools import image2array, convert_color, image_signature, crop_region
+
+# 单个模板的候选实例：(相似度, 中心点)
+Instance = Tuple[float, Tuple[int, int]]
+
+
+class FeatureMatchError(Exception):
+    pass
+
+
+class FeatureMatch(Match):
+    def __init__(self,
+                 threshold: float = FEATURE_MATCH_THRESHOLD,
+                 detector: str = 'orb',
+                 ratio: float = FEATURE_RATIO_TEST,
+                 min_inliers: int = FEATURE_MIN_INLIERS,
+                 index_dir: Optional[str] = FEATURE_INDEX_DIR,
+                 max_keypoints: int = FEATURE_TEMPLATE_MAX_KEYPOINTS,
+                 frame_max_keypoints: int = FEATURE_FRAME_MAX_KEYPOINTS,
+                 template_cache: Optional[TemplateCache] = None
+                 ):
+        """
+        初始化 FeatureMatch 对象
+
+        Args:
+            threshold: 匹配阈值，相似度为通过单应性校验的模板特征点占模板全部特征点的比例
+            detector: 特征检测器，'orb' 或 'akaze'
+            ratio: 最近邻与次近邻距离比阈值，越小越严格
+            min_inliers: 单应性校验所需的最少内点数
+            index_dir: 模板特征磁盘索引目录，None(默认)表示不持久化
+            max_keypoints: 每个模板最多提取的特征点数(ORB)
+            frame_max_keypoints: 每帧最多提取的特征点数(ORB)
+            template_cache: 模板缓存，None 时创建独立缓存；多个匹配对象可共享同一缓存
+        """
+        if not (0 < ratio <= 1):
+            raise ValueError("比值检验阈值必须在 (0, 1] 范围内")
+        if min_inliers < 4:
+            raise ValueError("单应性校验至少需要4个内点")
+
+        self.threshold = threshold
+        self.ratio = ratio
+        self.min_inliers = min_inliers
+        self.index = FeatureIndex(index_dir, detector, max_keypoints, frame_max_keypoints)
+        self.template_cache = template_cache if template_cache is not None else TemplateCache()
+
+    def _get_threshold(self, threshold: float):
+        """设置匹配阈值"""
+        if threshold is not None:
+            if not (0 <= threshold <= 1):
+                raise ValueError("阈值必须在 [0, 1] 范围内")
+            return threshold
+        else:
+            return self.threshold
+
+    def match(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None,
+              region: Optional[Region] = None) -> bool:
+        """
+        匹配图像与模板
+
+        Args:
+            image: 输入图像，可以是路径或numpy数组
+            template: 模板图像，可以是路径或numpy数组
+            threshold: 指定匹配阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
+
+        Returns:
+            bool: 匹配是否成功
+        """
+        try:
+            self.locate_center(image, template, threshold, region)
+            return True
+
+        except FeatureMatchError:
+            return False
+
+    def locate_center(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray],
+                      threshold: float = None, region: Optional[Region] = None) -> Tuple[int, int]:
+        """定位匹配区域中心点坐标，region 限定搜索区域，返回整幅图像坐标系下的坐标"""
+        threshold = self._get_threshold(threshold)
+        frame, offset = self._prepare_image(image, region)
+
+        instances = self._search(frame, [self._get_features(template)], threshold, max_instances=1)[0]
+        if not instances:
+            logger.info(f"匹配失败 | 阈值: {threshold}")
+            raise FeatureMatchError("未能在图像中找到模板")
+
+        score, (x, y) = instances[0]
+        center = (x + offset[0], y + offset[1])
+        logger.info(f"匹配成功 | 相似度: {score} | 阈值: {threshold} | 匹配中心点：{center}")
+        return center
+
+    def locate_center_repeated(self,
+                               image: Union[str, np.ndarray],
+                               template: Union[str, np.ndarray],
+                               min_distance: Tuple[int, int] = (0, 0),
+                               threshold: float = None,
+                               region: Optional[Region] = None
+                               ) -> Tuple[List[int], List[int]]:
+        """
+        定位模板在图像中的所有实例的中心坐标，每次单应性校验后移除其内点再继续检测
+
+        Args:
+            image: 输入图像，可以是路径或numpy数组
+            template: 模板图像，可以是路径或numpy数组
+            min_distance: 实例中心之间能容忍的最小间距，更近的实例视为重复
+            threshold: 匹配阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
+        Returns:
+            Tuple[List[int], List[int]: 中心坐标值列表（x, y）
+        """
+        threshold = self._get_threshold(threshold)
+        frame, (offset_x, offset_y) = self._prepare_image(image, region)
+
+        instances = self._search(frame, [self._get_features(template)], threshold, FEATURE_MAX_INSTANCES)[0]
+        if not instances:
+            logger.info(f"匹配失败 | 阈值: {threshold}")
+            raise FeatureMatchError("未能在图像中找到模板")
+
+        x_arr, y_arr = [], []
+        for score, (x, y) in instances:
+            x, y = x + offset_x, y + offset_y
+            if any(abs(x - ox) < min_distance[0] and abs(y - oy) < min_distance[1] for ox, oy in zip(x_arr, y_arr)):
+                continue
+            logger.debug(f"发现匹配点{len(x_arr) + 1:<4} | 中心: {str((x, y)):<14} | 匹配度: {score:.6f}")
+            x_arr.append(x)
+            y_arr.append(y)
+
+        return x_arr, y_arr
+
+    def match_many(self,
+                   image: Union[str, np.ndarray],
+                   templates: Sequence[Union[str, np.ndarray]],
+                   thresholds: Optional[Union[float, Sequence[float]]] = None,
+                   region: Optional[Region] = None,
+                   first_hit: bool = False
+                   ) -> List[MatchResult]:
+        """
+        在同一帧图像上批量匹配多个模板，帧特征只提取一次，所有模板在一次最近邻搜索中完成匹配
+
+        Args:
+            image: 输入图像，可以是路径或numpy数组
+            templates: 模板列表
+            thresholds: 匹配阈值，可以是统一阈值或与模板一一对应的阈值列表，None 使用默认阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
+            first_hit: 是否在第一个命中的模板处停止（按模板顺序作为优先级）
+
+        Returns:
+            List[MatchResult]: 每个模板的匹配结果（first_hit 时仅包含已匹配的模板）
+        """
+        if thresholds is None or isinstance(thresholds, (int, float)):
+            thresholds = [thresholds] * len(templates)
+        elif len(thresholds) != len(templates):
+            raise ValueError("阈值数量必须与模板数量一致")
+        thresholds = [self._get_threshold(t) for t in thresholds]
+
+        frame, (offset_x, offset_y) = self._prepare_image(image, region)
+        features = [self._get_features(template) for template in templates]
+        # 按最低阈值统一搜索，再按各模板阈值判定
+        candidates = self._search(frame, features, min(thresholds, default=1), max_instances=1)
+
+        results = []
+        for template, threshold, instances in zip(templates, thresholds, candidates):
+            score, (x, y) = instances[0] if instances else (0.0, (0, 0))
+            hit = bool(instances) and score >= threshold
+            location = (x + offset_x, y + offset_y) if hit else None
+            results.append(MatchResult(template=template, hit=hit, score=score, location=location))
+            if hit and first_hit:
+                break
+
+        logger.info(f"批量匹配完成 | 命中: {sum(r.hit for r in results)}/{len(results)}")
+        return results
+
+    def preload(self, directory: Union[str, Path], recursive: bool = True) -> int:
+        """
+        预加载目录下所有模板的特征(不存在索引时提取并写入磁盘)
+
+        Args:
+            directory: 模板目录
+            recursive: 是否递归子目录
+
+        Returns:
+            int: 预加载的模板数量
+        """
+        return self.template_cache.preload(directory, self._get_features, recursive)
+
+    def _search(self, frame: np.ndarray, templates: Sequence[Features], threshold: float,
+                max_instances: int) -> List[List[Instance]]:
+        """
+        在帧上搜索所有模板
+
+        帧特征提取一次，所有模板的描述子加入同一个匹配器，帧上每个特征点在一次 knn 搜索中找到
+        最近的模板特征点，按所属模板分组后分别做单应性校验。
+
+        Returns:
+            List[List[Instance]]: 每个模板按相似度降序排列的实例列表
+        """
+        instances: List[List[Instance]] = [[] for _ in templates]
+        frame_features = self.index.extract_frame(frame)
+        trained = [i for i, features in enumerate(templates) if len(features) >= self.min_inliers]
+        if len(frame_features) < self.min_inliers or not trained:
+            return instances
+
+        matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        matcher.add([templates[i].descriptors for i in trained])
+        matcher.train()
+
+        # 模板序号 -> [(模板特征点序号, 帧特征点序号)]
+        pairs: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for neighbours in matcher.knnMatch(frame_features.descriptors, k=2):
+            if not neighbours:
+                continue
+            best = neighbours[0]
+            # 次近邻属于其他模板时不做比值检验，避免相似模板之间互相抑制
+            if len(neighbours) == 2 and neighbours[1].imgIdx == best.imgIdx \
+                    and best.distance >= self.ratio * neighbours[1].distance:
+                continue
+            pairs[trained[best.imgIdx]].append((best.trainIdx, best.queryIdx))
+
+        for index, matched in pairs.items():
+            instances[index] = self._find_instances(templates[index], frame_features, matched, threshold,
+                                                    max_instances)
+        return instances
+
+    def _find_instances(self, template: Features, frame: Features, pairs: List[Tuple[int, int]],
+                        threshold: float, max_instances: int) -> List[Instance]:
+        """逐个拟合单应性，每次移除已解释的匹配对，直至剩余匹配不足或拟合失败"""
+        template_indices = np.array([t for t, _ in pairs])
+        src = template.points[template_indices]
+        dst = frame.points[[f for _, f in pairs]]
+
+        instances = []
+        while len(src) >= self.min_inliers and len(instances) < max_instances:
+            homography, mask = cv2.findHomography(src, dst, cv2.RANSAC, FEATURE_RANSAC_REPROJ_THRESHOLD)
+            if homography is None:
+                break
+            mask = mask.ravel().astype(bool)
+            inliers = int(mask.sum())
+            if inliers < self.min_inliers or not self._is_valid_homography(homography, template.size):
+                break
+
+            # 相似度为内点覆盖的模板特征点占模板全部特征点的比例（帧上多个点可能匹配到同一模板特征点）
+            score = len(np.unique(template_indices[mask])) / len(template)
+            if score < threshold:
+                break
+
+            height, width = template.size
+            center = cv2.perspectiveTransform(np.array([[[width / 2, height / 2]]], dtype=np.float32), homography)
+            instances.append((float(score), (int(center[0, 0, 0]), int(center[0, 0, 1]))))
+            template_indices, src, dst = template_indices[~mask], src[~mask], dst[~mask]
+
+        return instances
+
+    @staticmethod
+    def _is_valid_homography(homography: np.ndarray, size: Tuple[int, int]) -> bool:
+        """校验单应性：模板四角投影后须为凸四边形，且缩放倍数在合理范围内（排除翻转与退化解）"""
+        height, width = size
+        corners = np.array([[[0, 0]], [[width, 0]], [[width, height]], [[0, height]]], dtype=np.float32)
+        projected = cv2.perspectiveTransform(corners, homography)
+        if not cv2.isContourConvex(projected):
+            return False
+
+        # 有向面积与模板四角顺序的朝向一致(为正)，为负说明投影发生了镜像翻转
+        area = cv2.contourArea(projected, oriented=True)
+        if area <= 0:
+            return False
+        scale = np.sqrt(area / (width * height))
+        return 1 / FEATURE_MAX_SCALE_CHANGE <= scale <= FEATURE_MAX_SCALE_CHANGE
+
+    def _get_features(self, template: Union[str, np.ndarray]) -> Features:
+        """获取模板特征，优先从内存缓存读取，其次读取磁盘索引"""
+        signature = image_signature(template)
+        key = (signature, 'features', self.index.detector, self.index.max_keypoints)
+        return self.template_cache.get(key, lambda: self.index.load(signature, lambda: self._to_gray(template)))
+
+    def _prepare_image(self, image: Union[str, np.ndarray],
+                       region: Optional[Region] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        预处理待匹配图像，指定区域时仅处理该区域
+
+        Returns:
+            Tuple[np.ndarray, Tuple[int, int]]: 灰度图像与区域在原图中的偏移 (x, y)
+        """
+        image = image2array(image)
+        offset = (0, 0)
+        if region is not None:
+            image, offset = crop_region(image, region)
+        return self._to_gray(image), offset
+
+    @staticmethod
+    def _to_gray(img: Union[str, np.ndarray]) -> np.ndarray:
+        """转换为灰度图"""
+        img = image2array(img)
+        return convert_color(img, 'GRAY' if img.ndim == 2 else 'RGB', 'GRAY')
+
+
+if __name__ == '__main__':
+    m = FeatureMatch()
+    print(m.locate_center(r"C:\Users\YXS\Downloads\t1.png", r"C:\Users\YXS\Downloads\t2.png"))
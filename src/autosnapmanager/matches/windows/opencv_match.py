@@ -2,15 +2,29 @@
 OpenCV 匹配模块
 使用 OpenCV 实现图像匹配功能
 """
-from collections import defaultdict
-from typing import Union, Tuple, Generator, List
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Union, Tuple, Generator, List, Optional, Dict, Sequence, Iterable
 
 import cv2
 import numpy as np
 
-from autosnapmanager.matches.match import Match
+from autosnapmanager.matches.cascade import RejectionCascade
+from autosnapmanager.matches.fft_correlation import FrameSpectrum, frame_spectrum, template_spectrum, \
+    fft_match_template
+from autosnapmanager.matches.match import Match, MatchResult, Region
+from autosnapmanager.matches.match_config import (
+    PYRAMID_THRESHOLD_RELAX, PYRAMID_MIN_TEMPLATE_SIZE, PYRAMID_REFINE_MARGIN, PYRAMID_MAX_COVERAGE,
+    MATCH_ENGINES, FFT_AUTO_AREA_RATIO, MULTISCALE_STEPS, MULTISCALE_MIN_TEMPLATE_SIZE, MULTISCALE_MEMORY_SIZE,
+    SCALE_MODES
+)
+from autosnapmanager.matches.template_cache import TemplateCache
 from autosnapmanager.utils.logger import logger
-from autosnapmanager.utils.process_image_tools import image2array, convert_color, resize_image
+from autosnapmanager.utils.process_image_tools import (
+    image2array, convert_color, resize_image, image_signature, crop_region, find_local_peaks
+)
 from autosnapmanager.utils.window_tools import get_screen_scale_factors
 
 
@@ -23,7 +37,15 @@ class OpenCVMatch(Match):
                  threshold: float = 0.9,
                  method: int = cv2.TM_CCOEFF_NORMED,
                  colors=False,
-                 scale=False
+                 scale=False,
+                 template_cache: Optional[TemplateCache] = None,
+                 pyramid_levels: int = 0,
+                 engine: str = 'spatial',
+                 scale_range: Optional[Tuple[float, float]] = None,
+                 scale_steps: int = MULTISCALE_STEPS,
+                 scale_mode: str = 'frame',
+                 cascade: Optional[RejectionCascade] = None,
+                 frame_scale: float = 1.0
                  ):
         """
         初始化 OpenCVMatch 对象
@@ -33,11 +55,48 @@ class OpenCVMatch(Match):
             method: 指定匹配方法
             colors: 是否使用颜色匹配
             scale: 是否使用缩放，适用于同一模板匹配多分辨率图像的场景，模板的默认缩放率为100%，仅支持windows端
+            template_cache: 模板缓存，None 时创建独立缓存；多个匹配对象可共享同一缓存
+            pyramid_levels: 金字塔层数，大于0时先在缩小 2^n 倍的图像上粗匹配，再在候选点附近做原分辨率精匹配
+            engine: 相关计算引擎，'spatial' 空域(cv2.matchTemplate)，'fft' 频域(缓存模板频谱)，
+                    'auto' 按模板与帧的面积比自动选择；'fft' 与 'auto' 仅支持 TM_CCOEFF_NORMED
+            scale_range: 多尺度搜索的模板缩放范围 (最小, 最大)，如 (0.5, 2.0)，适用于同一模板匹配不同分辨率设备的场景；
+                         每个模板在每种帧尺寸下命中的尺度会被记住，之后优先尝试该尺度，命中即返回
+            scale_steps: 多尺度搜索在缩放范围内按等比采样的尺度数
+            scale_mode: scale 为 True 时的缩放方式，'frame' 每次匹配将截图缩放到模板缩放率，
+                        'template' 将模板放大到屏幕缩放率并随模板缓存，直接在原分辨率截图上匹配
+            cascade: 级联拒绝器，在完整相关计算前用直方图与粗相关排除不可能命中的模板，None 表示关闭
+            frame_scale: 截图相对模板分辨率的缩放率，如 MiniCap 以 decode_scale=2 缩小解码时为 0.5；
+                         模板按该比例缩小并随模板缓存，返回的坐标位于截图坐标系
         """
+        if pyramid_levels < 0:
+            raise ValueError("金字塔层数不能为负数")
+        if engine not in MATCH_ENGINES:
+            raise ValueError(f"不支持的匹配引擎: {engine}，可选: {MATCH_ENGINES}")
+        if engine != 'spatial' and method != cv2.TM_CCOEFF_NORMED:
+            raise ValueError("频域相关引擎仅支持 cv2.TM_CCOEFF_NORMED")
+        if scale_range is not None and not (0 < scale_range[0] <= scale_range[1]):
+            raise ValueError("缩放范围必须满足 0 < 最小值 <= 最大值")
+        if scale_steps < 1:
+            raise ValueError("尺度数必须大于0")
+        if scale_mode not in SCALE_MODES:
+            raise ValueError(f"不支持的缩放方式: {scale_mode}，可选: {SCALE_MODES}")
+        if frame_scale <= 0:
+            raise ValueError("截图缩放率必须大于0")
+
         self.threshold = threshold
         self.method = method
         self.colors = colors
         self.scale = scale
+        self.scale_mode = scale_mode
+        self.template_cache = template_cache if template_cache is not None else TemplateCache()
+        self.pyramid_levels = pyramid_levels
+        self.engine = engine
+        self._batch = threading.local()  # 批量匹配期间复用的帧频谱
+        self.scales = self._get_scales(scale_range, scale_steps)
+        self._scale_memory: "OrderedDict[Tuple, float]" = OrderedDict()  # (模板签名, 帧尺寸) -> 上次命中的尺度，LRU
+        self._scale_memory_lock = threading.Lock()
+        self.cascade = cascade
+        self.frame_scale = frame_scale
 
         if scale:
             self.screen_ratio = get_screen_scale_factors()
@@ -66,7 +125,8 @@ class OpenCVMatch(Match):
         else:
             return self.threshold
 
-    def match(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None) -> bool:
+    def match(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None,
+              region: Optional[Region] = None) -> bool:
         """
         匹配图像与模板
 
@@ -74,32 +134,88 @@ class OpenCVMatch(Match):
             image: 输入图像，可以是路径或numpy数组
             template: 模板图像，可以是路径或numpy数组
             threshold: 指定匹配阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
 
         Returns:
             bool: 匹配是否成功
         """
         threshold = self._get_threshold(threshold)
         try:
-            self._get_matches(image, template, threshold)
+            frame, _ = self._prepare_image(image, region)
+            self._get_matches(frame, self._get_template(template), threshold)
             return True
 
         except OpenCVMatchError:
             return False
 
-    def _get_matches(self, image: Union[str, np.ndarray],
-                     template: Union[str, np.ndarray],
+    def match_many(self,
+                   image: Union[str, np.ndarray],
+                   templates: Sequence[Union[str, np.ndarray]],
+                   thresholds: Optional[Union[float, Sequence[float]]] = None,
+                   region: Optional[Region] = None,
+                   first_hit: bool = False
+                   ) -> List[MatchResult]:
+        """
+        在同一帧图像上批量匹配多个模板，图像只做一次预处理
+
+        Args:
+            image: 输入图像，可以是路径或numpy数组
+            templates: 模板列表
+            thresholds: 匹配阈值，可以是统一阈值或与模板一一对应的阈值列表，None 使用默认阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
+            first_hit: 是否在第一个命中的模板处停止（按模板顺序作为优先级）
+
+        Returns:
+            List[MatchResult]: 每个模板的匹配结果（first_hit 时仅包含已匹配的模板）
+        """
+        if thresholds is None or isinstance(thresholds, (int, float)):
+            thresholds = [thresholds] * len(templates)
+        elif len(thresholds) != len(templates):
+            raise ValueError("阈值数量必须与模板数量一致")
+
+        frame, offset = self._prepare_image(image, region)
+        self._batch.active, self._batch.frame_spectrum = True, None
+
+        results = []
+        try:
+            self._match_many(frame, offset, templates, thresholds, first_hit, results)
+        finally:
+            self._batch.active, self._batch.frame_spectrum = False, None
+
+        logger.info(f"批量匹配完成 | 命中: {sum(r.hit for r in results)}/{len(results)}")
+        return results
+
+    def _match_many(self, frame: np.ndarray, offset: Tuple[int, int],
+                    templates: Sequence[Union[str, np.ndarray]], thresholds: Sequence[Optional[float]],
+                    first_hit: bool, results: List[MatchResult]) -> None:
+        """依次匹配各模板并将结果追加到 results"""
+        for template, threshold in zip(templates, thresholds):
+            threshold = self._get_threshold(threshold)
+            result, prepared = self._search(frame, self._get_template(template), threshold)
+
+            _, max_var, _, max_loc = cv2.minMaxLoc(result)
+            hit = max_var >= threshold
+            location = self._get_center(self._map_loc(max_loc), prepared.shape, offset) if hit else None
+            results.append(MatchResult(template=template, hit=hit, score=float(max_var), location=location))
+
+            logger.debug(f"批量匹配 | 模板: {template if isinstance(template, str) else prepared.shape} | "
+                         f"相似度: {max_var} | 阈值: {threshold} | 中心点: {location}")
+            if hit and first_hit:
+                break
+
+    def _get_matches(self, image: np.ndarray,
+                     template: np.ndarray,
                      threshold: float = None
-                     ) -> np.ndarray:
-        """获取匹配结果"""
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取匹配结果，image 与 template 分别为 _prepare_image 与 _get_template 预处理后的图像
 
-        image = self._preprocess_image(image)
-        template = self._preprocess_image(template, is_template=True)
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 相似度矩阵与实际匹配所用的模板(多尺度搜索时为缩放后的模板)
+        """
         threshold = self._get_threshold(threshold)
 
-        if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
-            raise ValueError("输入模板尺寸大于图像尺寸，请检查图像或模板是否合规")
-
-        result = cv2.matchTemplate(image, template, self.method)
+        result, matched_template = self._search(image, template, threshold)
         min_var, max_var, min_loc, max_loc = cv2.minMaxLoc(result)
 
         if max_var < threshold:
@@ -107,111 +223,321 @@ class OpenCVMatch(Match):
             raise OpenCVMatchError("未能在图像中找到模板")
 
         logger.info(f"匹配成功 | 相似度: {max_var} | 阈值: {threshold}")
+        return result, matched_template
+
+    def _search(self, image: np.ndarray, template: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        搜索模板，未开启多尺度时直接匹配
+
+        多尺度搜索时优先尝试该模板在该帧尺寸下上次命中的尺度，命中即返回；
+        否则遍历全部尺度并取相似度最高者，命中时记住该尺度。
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 相似度矩阵与实际匹配所用的模板
+        """
+        if self.scales is None:
+            if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+                raise ValueError("输入模板尺寸大于图像尺寸，请检查图像或模板是否合规")
+            return self._correlate(image, template, threshold), template
+
+        signature = image_signature(template)
+        memory_key = (signature, image.shape[:2])
+        remembered = self._recall_scale(memory_key)
+        scales = self.scales if remembered is None else (remembered,) + tuple(
+            s for s in self.scales if s != remembered)
+
+        best = None  # (相似度, 尺度, 相似度矩阵, 模板)
+        for scale in scales:
+            scaled = self._get_scaled_template(template, signature, scale)
+            if scaled is None or scaled.shape[0] > image.shape[0] or scaled.shape[1] > image.shape[1]:
+                continue
+
+            result = self._correlate(image, scaled, threshold)
+            _, max_var, _, _ = cv2.minMaxLoc(result)
+            if best is None or max_var > best[0]:
+                best = (max_var, scale, result, scaled)
+            if scale == remembered and max_var >= threshold:
+                break
+
+        if best is None:
+            raise ValueError("所有尺度下的模板尺寸均大于图像尺寸，请检查图像、模板或缩放范围是否合规")
+
+        max_var, scale, result, scaled = best
+        if max_var >= threshold:
+            self._remember_scale(memory_key, scale)
+        logger.debug(f"多尺度搜索 | 尺度: {scale:.3f} | 上次命中尺度: {remembered} | 相似度: {max_var}")
+        return result, scaled
+
+    @staticmethod
+    def _get_scales(scale_range: Optional[Tuple[float, float]], steps: int) -> Optional[Tuple[float, ...]]:
+        """在缩放范围内按等比采样尺度，按与原尺寸的接近程度排序"""
+        if scale_range is None:
+            return None
+        low, high = scale_range
+        scales = {round(float(s), 4) for s in np.geomspace(low, high, steps if low != high else 1)}
+        if low <= 1 <= high:
+            scales.add(1.0)
+        return tuple(sorted(scales, key=lambda s: abs(np.log(s))))
+
+    def _get_scaled_template(self, template: np.ndarray, signature: Tuple, scale: float) -> Optional[np.ndarray]:
+        """获取按指定尺度缩放的模板，结果随模板一并缓存；缩放后过小时返回 None"""
+        if scale == 1.0:
+            return template
+
+        height, width = template.shape[:2]
+        size = (round(width * scale), round(height * scale))
+        if min(size) < MULTISCALE_MIN_TEMPLATE_SIZE:
+            return None
+
+        def load() -> np.ndarray:
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            scaled = cv2.resize(template, size, interpolation=interpolation)
+            scaled.flags.writeable = False
+            return scaled
+
+        return self.template_cache.get((signature, 'scaled', scale), load)
+
+    def clear_scale_memory(self) -> None:
+        """清除多尺度搜索记住的命中尺度，设备分辨率变化后可调用"""
+        with self._scale_memory_lock:
+            self._scale_memory.clear()
+
+    def _recall_scale(self, key: Tuple) -> Optional[float]:
+        """读取模板在该帧尺寸下上次命中的尺度"""
+        with self._scale_memory_lock:
+            scale = self._scale_memory.get(key)
+            if scale is not None:
+                self._scale_memory.move_to_end(key)
+            return scale
+
+    def _remember_scale(self, key: Tuple, scale: float) -> None:
+        """记住命中尺度，超出 MULTISCALE_MEMORY_SIZE 条时淘汰最久未用的"""
+        with self._scale_memory_lock:
+            self._scale_memory[key] = scale
+            self._scale_memory.move_to_end(key)
+            while len(self._scale_memory) > MULTISCALE_MEMORY_SIZE:
+                self._scale_memory.popitem(last=False)
+
+    def _correlate(self, image: np.ndarray, template: np.ndarray, threshold: float) -> np.ndarray:
+        """计算相似度矩阵，级联拒绝的模板返回 1x1 的 -1 矩阵"""
+        if self.cascade is not None and self.cascade.reject(image, template, threshold, self.method,
+                                                            self.template_cache):
+            logger.debug(f"级联拒绝 | 模板尺寸: {template.shape[:2]} | 阈值: {threshold}")
+            return np.full((1, 1), -1, dtype=np.float32)
+        return self._match_template(image, template, threshold)
+
+    def _match_template(self, image: np.ndarray, template: np.ndarray, threshold: float) -> np.ndarray:
+        """计算模板在图像上的相似度矩阵"""
+        if self.pyramid_levels:
+            return self._match_pyramid(image, template, threshold)
+        if self._use_fft(image, template):
+            return self._match_fft(image, template)
+        return cv2.matchTemplate(image, template, self.method)
+
+    def _use_fft(self, image: np.ndarray, template: np.ndarray) -> bool:
+        """判断是否使用频域相关：大模板下空域相关的耗时由模板面积主导"""
+        if self.engine == 'auto':
+            return template.shape[0] * template.shape[1] >= FFT_AUTO_AREA_RATIO * image.shape[0] * image.shape[1]
+        return self.engine == 'fft'
+
+    def _match_fft(self, image: np.ndarray, template: np.ndarray) -> np.ndarray:
+        """频域相关，模板频谱按帧尺寸缓存，批量匹配时帧频谱在模板间复用"""
+        frame_size = image.shape[:2]
+        key = (image_signature(template), 'fft', frame_size)
+        spectrum = self.template_cache.get(key, lambda: template_spectrum(template, frame_size))
+        return fft_match_template(self._get_frame_spectrum(image), spectrum)
+
+    def _get_frame_spectrum(self, image: np.ndarray) -> Union[np.ndarray, FrameSpectrum]:
+        """批量匹配期间计算一次帧频谱并复用；单次匹配直接返回图像，由频域相关自行计算"""
+        if not getattr(self._batch, 'active', False):
+            return image
+
+        cached = self._batch.frame_spectrum
+        if cached is not None and cached[0] is image:
+            return cached[1]
+
+        spectrum = frame_spectrum(image)
+        self._batch.frame_spectrum = (image, spectrum)
+        return spectrum
+
+    def _match_pyramid(self, image: np.ndarray, template: np.ndarray, threshold: float) -> np.ndarray:
+        """
+        金字塔由粗到精匹配
+
+        先在缩小的图像上以放宽的阈值筛选候选区域，再仅在候选区域附近做原分辨率匹配。
+        返回与全图匹配同尺寸的相似度矩阵，未参与精匹配的位置填充为 -1。
+        """
+        levels = self._get_pyramid_levels(template)
+        if levels == 0:
+            return cv2.matchTemplate(image, template, self.method)
+
+        image_height, image_width = image.shape[:2]
+        template_height, template_width = template.shape[:2]
+
+        coarse_image = self._pyr_down(image, levels)
+        coarse_template = self._get_pyramid_template(template, levels)
+        coarse = cv2.matchTemplate(coarse_image, coarse_template, self.method)
+
+        result_height = image_height - template_height + 1
+        result_width = image_width - template_width + 1
+        result = np.full((result_height, result_width), -1, dtype=np.float32)
+
+        # 缩小后细节丢失导致相似度下降，层数越多阈值放得越宽
+        candidates = (coarse >= threshold - PYRAMID_THRESHOLD_RELAX * levels).astype(np.uint8)
+        if not candidates.any():
+            return result
+
+        # 粗匹配坐标到原图坐标的实际缩放比（整除导致的误差由精匹配半径覆盖）
+        ratio_x = image_width / coarse_image.shape[1]
+        ratio_y = image_height / coarse_image.shape[0]
+        radius = int(np.ceil(max(ratio_x, ratio_y))) + PYRAMID_REFINE_MARGIN
+
+        windows = []
+        _, _, regions, _ = cv2.connectedComponentsWithStats(candidates, connectivity=8)
+        for x, y, w, h, _ in regions[1:]:
+            x0 = max(int(x * ratio_x) - radius, 0)
+            y0 = max(int(y * ratio_y) - radius, 0)
+            x1 = min(int((x + w - 1) * ratio_x) + radius, result_width - 1)
+            y1 = min(int((y + h - 1) * ratio_y) + radius, result_height - 1)
+            windows.append((x0, y0, x1, y1))
+
+        coverage = sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, y0, x1, y1 in windows)
+        if coverage > PYRAMID_MAX_COVERAGE * result.size:
+            logger.debug(f"候选区域覆盖率过高，退化为全图匹配 | 候选区域数: {len(windows)}")
+            return cv2.matchTemplate(image, template, self.method)
+
+        for x0, y0, x1, y1 in windows:
+            window = image[y0:y1 + template_height, x0:x1 + template_width]
+            result[y0:y1 + 1, x0:x1 + 1] = cv2.matchTemplate(window, template, self.method)
+
         return result
 
-    def _locate_matches(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray], threshold: float = None):
+    def _get_pyramid_levels(self, template: np.ndarray) -> int:
+        """根据模板尺寸确定可用的金字塔层数"""
+        levels = self.pyramid_levels
+        while levels > 0 and min(template.shape[:2]) // (2 ** levels) < PYRAMID_MIN_TEMPLATE_SIZE:
+            levels -= 1
+        return levels
+
+    def _get_pyramid_template(self, template: np.ndarray, levels: int) -> np.ndarray:
+        """获取缩小 2^levels 倍的模板，结果随模板一并缓存"""
+        key = (image_signature(template), 'pyramid', levels)
+
+        def load() -> np.ndarray:
+            coarse = self._pyr_down(template, levels)
+            coarse.flags.writeable = False
+            return coarse
+
+        return self.template_cache.get(key, load)
+
+    @staticmethod
+    def _pyr_down(img: np.ndarray, levels: int) -> np.ndarray:
+        """高斯金字塔逐层缩小，高斯平滑可降低亚像素错位对粗匹配相似度的影响"""
+        for _ in range(levels):
+            img = cv2.pyrDown(img)
+        return img
+
+    def _locate_matches(self, image: np.ndarray, template: np.ndarray, threshold: float = None):
         """
-        定位匹配的最大左上角坐标
+        定位匹配的最大左上角坐标，image 与 template 均为预处理后的图像
 
         Returns:
-           Tuple[int, int]: 最大左上角坐标值（x, y）
+           Tuple[Tuple[int, int], Tuple[int, ...]]: 最大左上角坐标值（x, y）与实际匹配所用模板的尺寸
         """
         threshold = self._get_threshold(threshold)
-        matched_result = self._get_matches(image, template, threshold)
+        matched_result, matched_template = self._get_matches(image, template, threshold)
         _, _, _, max_loc = cv2.minMaxLoc(matched_result)
+        return self._map_loc(max_loc), matched_template.shape
 
-        if self.scale:
-            # 将缩放后的坐标映射回原始坐标系统
-            return tuple(int(coord / self.relative_scale_ratio) for coord in max_loc)
+    def _map_loc(self, loc: Tuple[int, int]) -> Tuple[int, int]:
+        """将预处理图像上的坐标映射回原始坐标系统"""
+        if self._frame_scale_ratio != 1:
+            return tuple(int(coord / self._frame_scale_ratio) for coord in loc)
+        return loc
 
-        return max_loc
+    @property
+    def _frame_scale_ratio(self) -> float:
+        """预处理图像相对原始截图的缩放率，仅 'frame' 缩放方式下不为1"""
+        if self.scale and self.scale_mode == 'frame':
+            return self.relative_scale_ratio
+        return 1
 
-    def locate_center(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray],
-                      threshold: float = None) -> Tuple[int, int]:
-        """定位匹配区域中心点坐标"""
-        template = image2array(template)
-        height, width = template.shape[:2]
-        threshold = self._get_threshold(threshold)
+    @property
+    def _template_scale(self) -> float:
+        """模板预处理时的缩放率，由截图缩放率与 'template' 缩放方式下的屏幕缩放率共同决定"""
+        if self.scale and self.scale_mode == 'template':
+            return self.frame_scale / self.relative_scale_ratio
+        return self.frame_scale
 
-        max_loc = self._locate_matches(image, template, threshold)
+    def _get_center(self, loc: Tuple[int, int], template_shape: Tuple[int, ...],
+                    offset: Tuple[int, int] = (0, 0)) -> Tuple[int, int]:
+        """根据匹配左上角坐标计算整幅图像坐标系下的匹配中心点"""
+        height, width = template_shape[:2]
 
         # 计算模板对应原图像缩放率的宽高
-        scale_factor = self.relative_scale_ratio if self.scale else 1
+        scale_factor = self._frame_scale_ratio
         scale_width = int(width / scale_factor)
         scale_height = int(height / scale_factor)
 
-        center = (int(max_loc[0] + scale_width / 2), int(max_loc[1] + scale_height / 2))
+        return int(offset[0] + loc[0] + scale_width / 2), int(offset[1] + loc[1] + scale_height / 2)
+
+    def locate_center(self, image: Union[str, np.ndarray], template: Union[str, np.ndarray],
+                      threshold: float = None, region: Optional[Region] = None) -> Tuple[int, int]:
+        """定位匹配区域中心点坐标，region 限定搜索区域，返回整幅图像坐标系下的坐标"""
+        template = self._get_template(template)
+        threshold = self._get_threshold(threshold)
+
+        frame, offset = self._prepare_image(image, region)
+        max_loc, template_shape = self._locate_matches(frame, template, threshold)
+
+        center = self._get_center(max_loc, template_shape, offset)
         logger.info(f"匹配中心点：{center}")
 
         return center
 
     def _locate_matches_repeated(
             self,
-            image: Union[str, np.ndarray],
-            template: Union[str, np.ndarray],
+            result: np.ndarray,
             min_distance: Tuple[int, int] = (0, 0),
             threshold: float = None
     ) -> Generator[Tuple[int, int, float], None, None]:
         """
-        定位模板在图像中所有匹配成功的左上角位置，并确保匹配区域之间不重合
+        从相似度矩阵中定位所有匹配成功的左上角位置，并确保匹配区域之间不重合
 
         Args:
+            result: _get_matches 返回的相似度矩阵
             min_distance: 匹配模板之间能容忍的最小间距
         yield:
             Tuple[int, int, float]: 左上角坐标值（x, y）和匹配相似度
         """
         threshold = self._get_threshold(threshold)
-        result = self._get_matches(image, template, threshold)
-
-        # 解析匹配位置坐标
-        y_coords, x_coords = np.where(result >= threshold)
-        matching_values = result[y_coords, x_coords]
-        # 匹配率降值索引值数组（优先处理高置信度点）
-        sorted_indices = np.argsort(-matching_values)
-
-        scale_factor = self.relative_scale_ratio if getattr(self, 'scale', False) else 1
-        x_coords = np.round(x_coords / scale_factor).astype(int)
-        y_coords = np.round(y_coords / scale_factor).astype(int)
 
+        scale_factor = self._frame_scale_ratio
         min_distance_x, min_distance_y = min_distance
-        if min_distance_x <= 0 or min_distance_y <= 0:
-            for idx in sorted_indices:
-                yield x_coords[idx], y_coords[idx], matching_values[idx]
 
+        if min_distance_x <= 0 or min_distance_y <= 0:
+            # 解析匹配位置坐标
+            y_coords, x_coords = np.where(result >= threshold)
+            matching_values = result[y_coords, x_coords]
+            # 匹配率降值排序（优先处理高置信度点）
+            sorted_indices = np.argsort(-matching_values, kind='stable')
+            y_coords, x_coords = y_coords[sorted_indices], x_coords[sorted_indices]
+            matching_values = matching_values[sorted_indices]
+            x_coords = np.round(x_coords / scale_factor).astype(int)
+            y_coords = np.round(y_coords / scale_factor).astype(int)
         else:
-            # 基于网格空间划分的NMS算法，复杂度O(n)
-            cell_size_x = min_distance_x
-            cell_size_y = min_distance_y
-            grid = defaultdict(list)
-
-            def get_cell_key(cx, cy):
-                return cx // cell_size_x, cy // cell_size_y
-
-            def is_overlap(ix, iy):
-                cell_key = get_cell_key(ix, iy)
-                # 检查相邻9个单元格
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        check_key = (cell_key[0] + dx, cell_key[1] + dy)
-                        if check_key in grid:
-                            for (ax, ay) in grid[check_key]:
-                                if abs(x - ax) <= min_distance_x and abs(y - ay) <= min_distance_y:
-                                    return True
-                return False
-
-            for idx in sorted_indices:
-                x = x_coords[idx]
-                y = y_coords[idx]
-                value = matching_values[idx]
-                if not is_overlap(x, y):
-                    grid[get_cell_key(x, y)].append((x, y))
-                    yield x, y, value
+            # 最小间距以原始坐标系为准，在映射回原始坐标系的匹配点上抑制
+            y_coords, x_coords, matching_values = find_local_peaks(result, threshold, min_distance, scale_factor)
+
+        for x, y, value in zip(x_coords, y_coords, matching_values):
+            yield x, y, value
 
     def locate_center_repeated(self,
                                image: Union[str, np.ndarray],
                                template: Union[str, np.ndarray],
                                min_distance: Tuple[int, int] = (0, 0),
-                               threshold: float = None
+                               threshold: float = None,
+                               region: Optional[Region] = None
                                ) -> Tuple[List[int], List[int]]:
         """
         定位模板在图像中所有匹配成功的中心坐标
@@ -220,22 +546,25 @@ class OpenCVMatch(Match):
             template: 模板图像，可以是路径或numpy数组
             min_distance: 匹配模板之间能容忍的最小间距
             threshold: 匹配阈值
+            region: 搜索区域 (x, y, w, h)，None 表示整幅图像
         Returns:
             Tuple[List[int], List[int]: 中心坐标值列表（x, y）
         """
         threshold = self._get_threshold(threshold)
-        template = image2array(template)
-        height, width = template.shape[:2]
+        frame, (offset_x, offset_y) = self._prepare_image(image, region)
+        result, matched_template = self._get_matches(frame, self._get_template(template), threshold)
+        height, width = matched_template.shape[:2]
 
-        scale_factor = self.relative_scale_ratio if self.scale else 1
+        scale_factor = self._frame_scale_ratio
         scaled_width = round(width / scale_factor)
         scaled_height = round(height / scale_factor)
 
         x_arr = []
         y_arr = []
-        for num, (x, y, value) in enumerate(self._locate_matches_repeated(image, template, min_distance, threshold),
+        for num, (x, y, value) in enumerate(self._locate_matches_repeated(result, min_distance, threshold),
                                             start=1):
-            # 计算中心坐标
+            # 计算中心坐标（映射回整幅图像坐标系）
+            x, y = x + offset_x, y + offset_y
             center_x = x + scaled_width // 2
             center_y = y + scaled_height // 2
             logger.debug(
@@ -248,6 +577,114 @@ class OpenCVMatch(Match):
 
         return x_arr, y_arr
 
+    def preload(self, directory: Union[str, Path], recursive: bool = True) -> int:
+        """
+        预加载目录下的所有模板到缓存
+
+        Args:
+            directory: 模板目录
+            recursive: 是否递归子目录
+
+        Returns:
+            int: 预加载的模板数量
+        """
+        return self.template_cache.preload(directory, self._get_template, recursive)
+
+    def invalidate(self, template: Optional[Union[str, np.ndarray]] = None) -> int:
+        """
+        使模板缓存失效，模板文件被替换后调用
+
+        Args:
+            template: 要失效的模板，None 表示清空全部缓存
+
+        Returns:
+            int: 被移除的缓存项数量
+        """
+        return self.template_cache.invalidate(template)
+
+    def cache_stats(self) -> Dict[str, Union[int, float]]:
+        """获取模板缓存统计信息(命中/未命中次数、内存占用等)"""
+        return self.template_cache.stats()
+
+    def cascade_stats(self) -> Dict[str, Union[int, float]]:
+        """获取级联拒绝统计信息(检查次数、各阶段拒绝次数、拒绝率)，未启用级联时为空"""
+        return self.cascade.stats() if self.cascade is not None else {}
+
+    def evaluate_cascade(self,
+                         corpus: Iterable[Tuple[Union[str, np.ndarray], Union[str, np.ndarray]]],
+                         threshold: float = None
+                         ) -> Dict[str, Union[int, float]]:
+        """
+        在样本集上测量级联拒绝的效果，每个样本同时做级联检查与完整相关计算，不计入级联统计
+
+        Args:
+            corpus: (图像, 模板) 样本集
+            threshold: 匹配阈值
+
+        Returns:
+            Dict[str, Union[int, float]]: 样本数、完整匹配命中数、拒绝数、误拒数(完整匹配命中却被拒绝)、
+                                          误拒率(误拒数 / 命中数)、拒绝率以及两者的总耗时(秒)
+        """
+        if self.cascade is None:
+            raise ValueError("未启用级联拒绝")
+        threshold = self._get_threshold(threshold)
+
+        samples = positives = rejected = false_rejections = 0
+        cascade_time = full_time = 0.0
+        for image, template in corpus:
+            frame, _ = self._prepare_image(image)
+            prepared = self._get_template(template)
+
+            start = time.perf_counter()
+            stage = self.cascade.rejecting_stage(frame, prepared, threshold, self.method, self.template_cache)
+            cascade_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, max_var, _, _ = cv2.minMaxLoc(self._match_template(frame, prepared, threshold))
+            full_time += time.perf_counter() - start
+
+            hit = max_var >= threshold
+            samples += 1
+            positives += hit
+            rejected += stage is not None
+            false_rejections += hit and stage is not None
+            if hit and stage is not None:
+                logger.warning(f"级联误拒 | 阶段: {stage} | 模板: {template if isinstance(template, str) else ''} | "
+                               f"相似度: {max_var}")
+
+        report = {
+            'samples': samples,
+            'positives': positives,
+            'rejected': rejected,
+            'false_rejections': false_rejections,
+            'false_rejection_rate': false_rejections / positives if positives else 0.0,
+            'rejection_rate': rejected / samples if samples else 0.0,
+            'cascade_time': cascade_time,
+            'full_time': full_time,
+        }
+        logger.info(f"级联评估完成 | {report}")
+        return report
+
+    def _get_template(self, template: Union[str, np.ndarray]) -> np.ndarray:
+        """获取预处理后的模板，优先从缓存读取"""
+        key = (image_signature(template), self._color_mode, self._template_scale)
+
+        def load() -> np.ndarray:
+            prepared = self._preprocess_image(template, is_template=True)
+            if self._template_scale != 1:
+                # 模板缩放到截图的分辨率，代价随模板缓存一次性支付，截图保持原分辨率
+                interpolation = cv2.INTER_AREA if self._template_scale < 1 else cv2.INTER_LINEAR
+                prepared = resize_image(prepared, self._template_scale, interpolation=interpolation)
+            prepared.flags.writeable = False  # 缓存共享的模板禁止原地修改
+            return prepared
+
+        return self.template_cache.get(key, load)
+
+    @property
+    def _color_mode(self) -> str:
+        """匹配所用的颜色空间"""
+        return 'BGR' if self.colors else 'GRAY'
+
     def _check_screen_ratio(self) -> None:
         """检查当前屏幕比例"""
         if self.screen_ratio[0] != self.screen_ratio[1]:
@@ -255,12 +692,25 @@ class OpenCVMatch(Match):
         if self.screen_ratio[0] < self.template_scale_ratio or self.screen_ratio[1] < self.template_scale_ratio:
             raise ValueError(f"屏幕缩放率需 ≥ {self.template_scale_ratio * 100}%")
 
+    def _prepare_image(self, image: Union[str, np.ndarray],
+                       region: Optional[Region] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        预处理待匹配图像，指定区域时仅处理该区域（零拷贝切片后再做颜色转换与缩放）
+
+        Returns:
+            Tuple[np.ndarray, Tuple[int, int]]: 预处理后的图像与区域在原图中的偏移 (x, y)
+        """
+        image = image2array(image)
+        offset = (0, 0)
+        if region is not None:
+            image, offset = crop_region(image, region)
+        return self._preprocess_image(image), offset
+
     def _preprocess_image(self, img: Union[str, np.ndarray], is_template: bool = False) -> np.ndarray:
         """预处理图像"""
         img = image2array(img)
-        color_mode = 'BGR' if self.colors else 'GRAY'
-        img = convert_color(img, 'RGB', color_mode)
-        if self.scale and not is_template:
+        img = convert_color(img, 'GRAY' if img.ndim == 2 else 'RGB', self._color_mode)
+        if self._frame_scale_ratio != 1 and not is_template:
             img = self._resize_img(img)
         return img
 
@@ -1,6 +1,16 @@
+import socket
+import struct
+import time
+import zlib
+
+import cv2
 import numpy as np
 from adbutils import adb
 from autosnapmanager.screencaps.screencap import ScreenCap
+from autosnapmanager.screencaps.screencap_config import (
+    ADBCAP_MODES, ADBCAP_RAW_BYTES_PER_PIXEL, ADBCAP_RAW_HEADER_SIZES, ADBCAP_RAW_COMPRESS_COMMAND,
+    ADBCAP_RECV_CHUNK, ADBCAP_TIMEOUT
+)
 from autosnapmanager.utils.logger import logger
 
 
@@ -8,19 +18,29 @@ class ADBCap(ScreenCap):
     """
     ADB截图类，用于通过ADB捕获Android设备屏幕内容
     
-    继承自ScreenCap抽象基类，实现了ADB截图的具体逻辑
+    继承自ScreenCap抽象基类，实现了ADB截图的具体逻辑。
+    raw 模式通过 exec:screencap 直接读取原始像素，省去设备端 PNG 压缩与本地解码；
+    返回的数组是复用缓冲区上的视图，在下次 screencap 前有效。
     """
 
-    __slots__ = ('__adb',)
+    __slots__ = ('_adb', 'mode', 'compress', '_buffer')
 
-    def __init__(self, serial: str) -> None:
+    def __init__(self, serial: str, mode: str = 'png', compress: bool = False) -> None:
         """
         初始化ADB截图对象
         
         Args:
             serial (str): Android设备序列号或地址，如 "127.0.0.1:16384"
+            mode (str): 截图方式，'png' 设备端 PNG 压缩后本地解码，'raw' 读取原始像素
+            compress (bool): raw 模式下是否在设备端以 gzip -1 压缩传输，适用于网络 adb；设备不支持时自动关闭
         """
+        if mode not in ADBCAP_MODES:
+            raise ValueError(f"不支持的截图方式: {mode}，可选: {ADBCAP_MODES}")
+
         self._adb = adb.device(serial)
+        self.mode = mode
+        self.compress = compress and mode == 'raw' and self._has_gzip()
+        self._buffer = bytearray()  # raw 模式复用的像素缓冲区
 
     def screencap(self) -> np.ndarray:
         """
@@ -33,24 +53,120 @@ class ADBCap(ScreenCap):
             RuntimeError: 当无法通过ADB捕获屏幕时抛出
         """
         try:
+            start = time.perf_counter()
+            if self.mode == 'raw':
+                return self._screencap_raw(start)
+
             img = self._adb.screenshot()
             img_array = np.array(img)
 
             # 处理4通道RGBA图像
             if img_array.ndim == 3 and img_array.shape[2] == 4:
-                return img_array[:, :, :3]  # 移除alpha通道
+                img_array = img_array[:, :, :3]  # 移除alpha通道
 
+            # png 由 adbutils 传输并解码，无法单独计时，数据量以解码后的像素计
+            self.capture_stats.record_received(img_array.nbytes)
+            self.capture_stats.record_delivered(time.perf_counter() - start)
             return img_array
 
         except Exception as e:
             logger.error(f"ADB截图失败: {str(e)}")
             raise RuntimeError(f"无法通过ADB捕获屏幕: {str(e)}")
 
+    def _screencap_raw(self, start: float) -> np.ndarray:
+        """读取 screencap 原始输出并解析为 RGB 数组，start 为截图开始的 time.perf_counter()"""
+        command = ADBCAP_RAW_COMPRESS_COMMAND if self.compress else "screencap"
+        conn = self._adb.open_transport(timeout=ADBCAP_TIMEOUT)
+        try:
+            conn.send_command(f"exec:{command}")
+            conn.check_okay()
+            sock = conn.conn
+            sock.settimeout(ADBCAP_TIMEOUT)
+            length = self._recv_gzip(sock) if self.compress else self._recv_raw(sock)
+        finally:
+            conn.conn.close()  # 数据已读到连接关闭，无需 AdbConnection.close 的半关闭等待
 
-if __name__ == "__main__":
-    import time
+        self.capture_stats.record_received(length)
+        parse_start = time.perf_counter()
+        image = self._parse_raw(length)
+        end = time.perf_counter()
+        self.capture_stats.record_decode(end - parse_start)
+        self.capture_stats.record_delivered(end - start)
+        return image
+
+    def _recv_raw(self, sock: socket.socket) -> int:
+        """将数据读入复用缓冲区直到连接关闭，返回数据长度"""
+        received = 0
+        while True:
+            if received == len(self._buffer):
+                self._grow_buffer(max(received * 2, ADBCAP_RECV_CHUNK))
+            count = sock.recv_into(memoryview(self._buffer)[received:])
+            if count == 0:
+                return received
+            received += count
+
+    def _recv_gzip(self, sock: socket.socket) -> int:
+        """读取 gzip 数据流并解压到复用缓冲区，返回解压后的数据长度"""
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        written = 0
+        while True:
+            chunk = sock.recv(ADBCAP_RECV_CHUNK)
+            data = decompressor.decompress(chunk) if chunk else decompressor.flush()
+            if written + len(data) > len(self._buffer):
+                self._grow_buffer(max((written + len(data)) * 2, ADBCAP_RECV_CHUNK))
+            self._buffer[written:written + len(data)] = data
+            written += len(data)
+            if not chunk:
+                return written
+
+    def _grow_buffer(self, size: int) -> None:
+        """扩大缓冲区，已有数据保留"""
+        # 上次返回的数组仍引用旧缓冲区，bytearray 不能原地扩容，替换为新缓冲区
+        buffer = bytearray(size)
+        buffer[:len(self._buffer)] = self._buffer
+        self._buffer = buffer
+
+    def _parse_raw(self, length: int) -> np.ndarray:
+        """
+        解析 screencap 原始输出，RGBA/RGBX/RGB 格式直接返回缓冲区上的视图
 
+        Raises:
+            ValueError: 当数据长度与头部描述不一致或格式不受支持时抛出
+        """
+        if length < ADBCAP_RAW_HEADER_SIZES[0]:
+            raise ValueError(f"screencap 输出过短: {length} 字节")
+
+        width, height, pixel_format = struct.unpack_from('<III', self._buffer)
+        if pixel_format not in ADBCAP_RAW_BYTES_PER_PIXEL:
+            raise ValueError(f"不支持的像素格式: {pixel_format}")
+
+        bpp = ADBCAP_RAW_BYTES_PER_PIXEL[pixel_format]
+        pixels_size = width * height * bpp
+        header_size = length - pixels_size  # 头部长度随 Android 版本不同，由总长度推断
+        if header_size not in ADBCAP_RAW_HEADER_SIZES:
+            raise ValueError(f"screencap 输出长度异常: {length} 字节 | {width}x{height} 格式 {pixel_format}")
+
+        pixels = np.frombuffer(self._buffer, dtype=np.uint8, count=pixels_size, offset=header_size)
+        pixels = pixels.reshape(height, width, bpp)
+
+        if pixel_format in (1, 2):  # RGBA_8888 / RGBX_8888
+            return pixels[:, :, :3]
+        if pixel_format == 3:  # RGB_888
+            return pixels
+        if pixel_format == 4:  # RGB_565
+            return cv2.cvtColor(pixels, cv2.COLOR_BGR5652RGB)
+        return cv2.cvtColor(pixels, cv2.COLOR_BGRA2RGB)  # BGRA_8888
+
+    def _has_gzip(self) -> bool:
+        """检查设备是否支持 gzip"""
+        if self._adb.shell("command -v gzip"):
+            return True
+        logger.warning("设备不支持 gzip，raw 模式不压缩传输")
+        return False
+
+
+if __name__ == "__main__":
     start_time = time.time()
-    adb_cap = ADBCap("127.0.0.1:16384")
+    adb_cap = ADBCap("127.0.0.1:16384", mode='raw')
     adb_cap.save_screencap()
     logger.info(f"运行时间：{time.time() - start_time}")
@@ -1,24 +1,30 @@
-import io
 import json
 import socket
 import struct
 import subprocess
 import threading
-from queue import Queue, Empty
-from time import sleep
-from typing import Optional, Dict, Tuple
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from PIL import Image
 from adbutils import adb
+from autosnapmanager.screencaps.android.minicap_governor import MiniCapGovernor
+from autosnapmanager.screencaps.android.minicap_supervisor import MiniCapSupervisor
+from autosnapmanager.screencaps.capture_stats import CaptureStats, CaptureStatsGroup
+from autosnapmanager.screencaps.decode_worker import DecodeWorker, decode_jpeg, check_decode_options
+from autosnapmanager.screencaps.frame_slot import Frame, FrameSlot, FrameTimeoutError
 from autosnapmanager.screencaps.screencap import ScreenCap
 from autosnapmanager.screencaps.screencap_config import (
     DEFAULT_HOST, ADB_EXE, MINICAP_PATH, MINICAPSO_PATH,
     MINICAP_REMOTE_HOME, MINICAPSO_REMOTE_HOME, MINITOUCH_REMOTE_ADDR,
-    MINICAP_COMMAND, MINICAP_SERVER_START_DELAY, DEFAULT_BUFFER_SIZE
+    MINICAP_COMMAND, MINICAP_START_TIMEOUT, MINICAP_BANNER_SIZE, MINICAP_FRAME_HEADER_SIZE,
+    MINICAP_FRAME_BUFFERS, MINICAP_BUFFER_HEADROOM, MINICAP_FIRST_FRAME_TIMEOUT, MINICAP_DECODE_RETRIES,
+    MINICAP_DECODE_IDLE_TIMEOUT, MINICAP_GOVERNOR_RATE_RANGE, MINICAP_GOVERNOR_QUALITY_RANGE, MINICAP_RECONNECT_TIMEOUT
 )
 from autosnapmanager.utils.adb_devices import DeviceInfo
 from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.provision_tools import push_if_changed
+from autosnapmanager.utils.readiness_tools import wait_until_ready, probe_socket
 
 
 class MiniCapError(Exception):
@@ -31,6 +37,11 @@ class StreamHandleError(MiniCapError):
     pass
 
 
+class StreamClosedError(StreamHandleError):
+    """数据流连接已关闭"""
+    pass
+
+
 class MiniCapUnSupportError(MiniCapError):
     """设备不支持 MiniCap"""
     pass
@@ -45,7 +56,12 @@ class MiniCapManager:
             timeout: Optional[int] = None,
             host: str = DEFAULT_HOST,
             skip_frame: bool = True,
-            use_stream: bool = True
+            use_stream: bool = True,
+            decoder: Optional[Dict] = None,
+            start_timeout: float = MINICAP_START_TIMEOUT,
+            projection: Optional[Union[float, Tuple[int, int]]] = None,
+            governor: Optional[Dict] = None,
+            supervisor: Optional[Dict] = None
     ):
         """
         初始化 MiniCap 对象
@@ -58,8 +74,15 @@ class MiniCapManager:
             host: 连接地址（默认：127.0.0.1）
             skip_frame: 当处理帧的速度跟不上捕获速度时,是否跳过它们
             use_stream: 是否使用流模式
+            decoder: 后台解码参数(mode, scale, idle_timeout)，数据流启动时附加后台解码线程，None 表示不使用
+            start_timeout: 等待 minicap 服务就绪的期限(秒)
+            projection: 虚拟投影尺寸，(0, 1] 的缩放系数或 (宽, 高)，设备端按该尺寸缩小后编码；None 表示原始尺寸
+            governor: 自适应调节参数(rate_range, quality_range, interval, cooldown)，仅流模式；None 表示不调节
+            supervisor: 数据流监护参数(reconnect_timeout, stall_timeout, interval)，仅流模式；None 表示不监护
         """
         self._adb = adb.device(serial)
+        self.capture_stats = CaptureStatsGroup()  # 订阅者的截图统计，数据流向其记录接收的帧与数据量
+        self.frame_listeners: List[Callable[[Frame], None]] = []  # 帧监听回调，重建数据流后仍然有效
         self.config: [Optional[int], int, Optional[int], str, int, bool, bool] = {
             'rate': rate,
             'quality': quality,
@@ -68,17 +91,28 @@ class MiniCapManager:
             'mapped_port': 0,
             'skip_frame': skip_frame,
             'use_stream': use_stream,
+            'decoder': decoder,
+            'start_timeout': start_timeout,
+            'projection': projection,
+            'governor': governor,
+            'supervisor': supervisor,
         }
 
         self.stream: Optional[MiniCapStream] = None
+        self.governor: Optional[MiniCapGovernor] = None
+        self.supervisor: Optional[MiniCapSupervisor] = None
         self._process: Optional[subprocess.Popen] = None
+        self._restart_lock = threading.Lock()  # 自适应调节与数据流监护不同时重启服务
 
         try:
             # 初始化设备信息和MiniCap服务
             self.device_info = self._get_device_base_info()
             self.init_minicap()
             self.device_info = self._init_device()
+            self.virtual_size = self._get_virtual_size()
             self.start_minicap_service() if self.config['use_stream'] else None
+            self._init_governor()
+            self._init_supervisor()
         except Exception as e:
             logger.error(f"MiniCap初始化失败: {e}")
             self.stop_minicap_service()
@@ -93,11 +127,20 @@ class MiniCapManager:
         """启动 MiniCap 服务"""
         self._start_minicap_process()
         self._setup_port_forwarding()
+        self._wait_minicap_ready()
         self._init_stream()
 
     def stop_minicap_service(self) -> None:
         """停止 MiniCap 服务 并清理 MiniCap 相关资源"""
         try:
+            if self.supervisor:
+                self.supervisor.stop()
+                self.supervisor = None
+
+            if self.governor:
+                self.governor.stop()
+                self.governor = None
+
             if self.stream:
                 self.stream.stop()
                 self.stream = None
@@ -111,6 +154,71 @@ class MiniCapManager:
             logger.error(f"MiniCap 资源清理过程中出错: {e}")
             raise
 
+    def restart_minicap_service(self) -> None:
+        """
+        重启 minicap 进程、端口转发与数据流，并重新读取设备信息(如旋转方向)
+
+        重启期间旧数据流保留最新帧，新数据流就绪后替换旧数据流。
+
+        Raises:
+            ServiceNotReadyError: 当重启后的 minicap 服务在期限内未就绪时抛出
+        """
+        with self._restart_lock:
+            if self._process and self._process.poll() is None:
+                self._process.kill()
+            self._kill_minicap_process()
+            self.device_info = self._init_device()
+            self.virtual_size = self._get_virtual_size()
+            self.start_minicap_service()
+
+    def check_stream(self, stall_timeout: Optional[float] = None) -> Optional[str]:
+        """
+        检查数据流状态
+
+        Args:
+            stall_timeout: 最新帧超过该秒数未更新时视为停滞，None 表示不检查
+
+        Returns:
+            Optional[str]: 中断原因，数据流正常或正在重启时为 None
+        """
+        if not self._restart_lock.acquire(blocking=False):
+            return None
+        try:
+            if self.stream is None or not self.stream.thread.is_alive():
+                return "数据流读取线程已退出"
+            if self._process is None or self._process.poll() is not None:
+                return "minicap 进程已退出"
+            frame = self.stream.slot.latest()
+            if stall_timeout is not None and frame is not None and frame.age > stall_timeout:
+                return f"数据流已停滞 {frame.age:.1f}s"
+            return None
+        finally:
+            self._restart_lock.release()
+
+    def reconfigure(self, rate: Optional[int] = None, quality: Optional[int] = None,
+                    skip_frame: Optional[bool] = None) -> None:
+        """
+        以新的帧率、质量或跳帧设置重启 minicap 服务
+
+        重启期间旧数据流保留最新帧，截图不中断(帧龄增大)，新数据流就绪后替换旧数据流。
+
+        Args:
+            rate: 帧率，None 表示不变
+            quality: 图像质量(1-100)，None 表示不变
+            skip_frame: 是否开启 -S 跳帧，None 表示不变
+
+        Raises:
+            ServiceNotReadyError: 当重启后的 minicap 服务在期限内未就绪时抛出
+        """
+        if rate is not None:
+            self.config['rate'] = self.device_info.fps = rate
+        if quality is not None:
+            self.config['quality'] = quality
+        if skip_frame is not None:
+            self.config['skip_frame'] = skip_frame
+        if self.config['use_stream']:
+            self.restart_minicap_service()
+
     def capture_frame(self) -> bytes:
         """
         捕获单帧图像
@@ -123,7 +231,7 @@ class MiniCapManager:
         """
         try:
             adb_command = MINICAP_COMMAND + [
-                "-P", f"{self.device_info.vm_size}@{self.device_info.vm_size}/{self.device_info.rotation}",
+                "-P", self._projection_arg(),
                 "-Q", str(self.config['quality']),
                 "-s"
             ]
@@ -200,6 +308,41 @@ class MiniCapManager:
             logger.error(f"设备初始化失败: {e}")
             raise
 
+    @property
+    def projection_scale(self) -> float:
+        """虚拟投影相对真实屏幕的缩放率(虚拟尺寸/真实尺寸)"""
+        width, height = self.virtual_size
+        return min(width / self.device_info.width, height / self.device_info.height)
+
+    def _get_virtual_size(self) -> Tuple[int, int]:
+        """
+        根据 projection 计算虚拟投影尺寸(宽, 高)
+
+        Raises:
+            ValueError: 当 projection 无效时抛出
+        """
+        projection = self.config['projection']
+        width, height = self.device_info.width, self.device_info.height
+        if projection is None:
+            return width, height
+
+        if isinstance(projection, (int, float)):
+            if not 0 < projection <= 1:
+                raise ValueError(f"投影缩放系数需在 (0, 1] 之间: {projection}")
+            return max(round(width * projection), 1), max(round(height * projection), 1)
+
+        virtual_width, virtual_height = projection
+        if not (0 < virtual_width <= width and 0 < virtual_height <= height):
+            raise ValueError(f"投影尺寸需为正数且不超过屏幕尺寸 {width}x{height}: {projection}")
+        # minicap 保持宽高比，按较小的缩放率投影
+        scale = min(virtual_width / width, virtual_height / height)
+        return max(round(width * scale), 1), max(round(height * scale), 1)
+
+    def _projection_arg(self) -> str:
+        """minicap -P 参数：{真实尺寸}@{虚拟尺寸}/{旋转角度}，尺寸与 vm_size 同为 高x宽"""
+        virtual_width, virtual_height = self.virtual_size
+        return f"{self.device_info.vm_size}@{virtual_height}x{virtual_width}/{self.device_info.rotation}"
+
     def _kill_minicap_process(self) -> None:
         """终止设备上运行的 minicap 进程"""
         try:
@@ -210,23 +353,17 @@ class MiniCapManager:
 
     def _setup_minicap(self) -> None:
         """
-        安装 minicap 到设备
+        安装 minicap 到设备，设备端文件已是最新时跳过推送
 
         Raises:
             RuntimeError: 安装失败时抛出
         """
         try:
-            self._adb.sync.push(
-                f"{MINICAP_PATH}/{self.device_info.abi}/minicap",
-                MINICAP_REMOTE_HOME
-            )
-
-            self._adb.sync.push(
-                f"{MINICAPSO_PATH}/android-{self.device_info.sdk}/{self.device_info.abi}/minicap.so",
-                MINICAPSO_REMOTE_HOME
-            )
-
-            self._adb.shell(["chmod", "+x", MINICAP_REMOTE_HOME])
+            push_if_changed(self._adb, [
+                (f"{MINICAP_PATH}/{self.device_info.abi}/minicap", MINICAP_REMOTE_HOME),
+                (f"{MINICAPSO_PATH}/android-{self.device_info.sdk}/{self.device_info.abi}/minicap.so",
+                 MINICAPSO_REMOTE_HOME),
+            ])
 
         except Exception as e:
             logger.error(f"MiniCap 安装失败: {e}")
@@ -247,7 +384,7 @@ class MiniCapManager:
             adb_command.extend([
                 "shell",
                 *MINICAP_COMMAND,
-                "-P", f"{self.device_info.vm_size}@{self.device_info.vm_size}/{self.device_info.rotation}",
+                "-P", self._projection_arg(),
                 "-Q", str(self.config['quality']),
                 "-r", str(self.device_info.fps)
             ])
@@ -263,10 +400,6 @@ class MiniCapManager:
                 stderr=subprocess.DEVNULL
             )
 
-            for i in range(MINICAP_SERVER_START_DELAY):
-                logger.info(f"MiniCap启动中: {MINICAP_SERVER_START_DELAY - i}秒")
-                sleep(1)
-
         except Exception as e:
             logger.error(f"MiniCap 服务启动失败: {e}")
             raise
@@ -284,6 +417,24 @@ class MiniCapManager:
             logger.error(f"MiniCap 端口转发设置失败: {e}")
             raise
 
+    def _wait_minicap_ready(self) -> None:
+        """
+        探测 minicap 服务，收到 banner 即视为就绪
+
+        Raises:
+            ServiceNotReadyError: 超过期限仍未就绪或 minicap 进程已退出时抛出
+        """
+
+        def probe() -> bool:
+            sock = probe_socket(self.config['host'], self.config['mapped_port'])
+            if sock is None:
+                return False
+            sock.close()  # minicap 在探测连接断开后接受下一个连接，数据流重新收到 banner
+            return True
+
+        wait_until_ready(probe, self.config['start_timeout'], "MiniCap",
+                         alive=lambda: self._process is not None and self._process.poll() is None)
+
     def _init_stream(self) -> None:
         """
         初始化并启动数据流读取
@@ -292,36 +443,72 @@ class MiniCapManager:
             RuntimeError: 数据流初始化失败时抛出
         """
         try:
-            self.stream = MiniCapStream(
+            stream = MiniCapStream(
                 self.config['host'],
                 self.config['mapped_port'],
-                self.config['timeout']
+                self.config['timeout'],
+                self.capture_stats,
+                self.frame_listeners
             )
-            self.stream.start()
+            stream.start()
+            if self.config['decoder'] is not None:
+                stream.start_decoder(**self.config['decoder'])
+
+            # 重启时旧数据流在新数据流就绪前继续提供最新帧
+            previous, self.stream = self.stream, stream
+            if previous is not None:
+                previous.stop()
         except Exception as e:
             logger.error(f"MiniCap 数据流初始化失败: {e}")
             raise
 
+    def _init_governor(self) -> None:
+        """按配置启动自适应调节线程"""
+        if self.config['governor'] is None or not self.config['use_stream']:
+            return
+        self.governor = MiniCapGovernor(self, **self.config['governor'])
+        self.governor.start()
+
+    def _init_supervisor(self) -> None:
+        """按配置启动数据流监护线程"""
+        if self.config['supervisor'] is None or not self.config['use_stream']:
+            return
+        self.supervisor = MiniCapSupervisor(self, **self.config['supervisor'])
+        self.supervisor.start()
+
     def __del__(self) -> None:
         """析构时确保资源被清理"""
         self.stop_minicap_service()
 
 
 class MiniCapStream:
-    """MiniCap 数据流处理类"""
+    """
+    MiniCap 数据流处理类
+
+    读取线程将帧体通过 recv_into 直接读入预分配的帧缓冲区，并发布到最新帧槽，读取方无需等待即可获得最新帧。
+    缓冲区按帧序号轮换，帧数据(memoryview)在其后第 MINICAP_FRAME_BUFFERS - 1 帧开始写入前有效，
+    可用 is_intact 在使用后校验。可附加后台解码线程，由其提前解码最新帧。
+    """
 
-    __slots__ = ('host', 'port', 'timeout', 'sock', 'data', 'cache', 'lock', 'stop_event', 'thread')
+    __slots__ = ('host', 'port', 'timeout', 'sock', 'slot', 'stop_event', 'thread', 'banner', 'decoder',
+                 'projection_scale', 'capture_stats', 'listeners', '_buffers')
 
-    def __init__(self, host: str, port: int, timeout: Optional[int] = None):
+    def __init__(self, host: str, port: int, timeout: Optional[int] = None,
+                 capture_stats: Optional[Union[CaptureStats, CaptureStatsGroup]] = None,
+                 listeners: Optional[List[Callable[[Frame], None]]] = None):
         self.host = host
         self.port = port
         self.timeout = timeout  # ms
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.data = Queue(maxsize=1)  # 存储图像数据的队列(只保留最新数据）
-        self.cache: bytes = b''  # 缓存帧
-        self.lock = threading.Lock()
+        self.slot = FrameSlot()  # 最新帧槽
         self.stop_event = threading.Event()
         self.thread = threading.Thread(target=self._read_stream, daemon=True)
+        self.banner: Dict = {}
+        self.decoder: Optional[DecodeWorker] = None
+        self.projection_scale = 1.0  # 虚拟投影相对真实屏幕的缩放率，读取 banner 后更新
+        self.capture_stats = capture_stats
+        self.listeners = listeners if listeners is not None else []  # 在读取线程中以新帧(JPEG 数据)调用
+        self._buffers = [bytearray() for _ in range(MINICAP_FRAME_BUFFERS)]
 
     def start(self) -> None:
         """启动数据流处理"""
@@ -334,32 +521,72 @@ class MiniCapStream:
             self._close_socket()
             raise
 
+    def start_decoder(self, mode: str = 'rgb', scale: int = 1,
+                      idle_timeout: Optional[float] = MINICAP_DECODE_IDLE_TIMEOUT) -> DecodeWorker:
+        """
+        附加并启动后台解码线程
+
+        Args:
+            mode: 解码方式，'rgb' 或 'gray'
+            scale: 解码缩小倍数(1/2/4/8)
+            idle_timeout: 空闲时间(秒)，超过该时间无人取帧时暂停解码；None 表示一直解码
+        """
+        if self.decoder is not None:
+            self.decoder.stop()
+        self.decoder = DecodeWorker(self, mode, scale, idle_timeout, self.capture_stats)
+        self.decoder.start()
+        return self.decoder
+
     def stop(self) -> None:
         """停止数据流处理"""
         logger.info("正在停止数据流")
+        if self.decoder is not None:
+            self.decoder.stop()
         self.stop_event.set()
+        try:
+            # 关闭读写使阻塞中的 recv_into 立即返回，无需等待 socket 超时
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
         self.thread.join()
         self._close_socket()
 
-    def capture_frame(self, use_cache: bool = True) -> bytes:
+    def capture_frame(self) -> Frame:
         """
-        捕获一帧数据
-        
-        Args:
-            use_cache: 捕获超时时是否使用缓存帧
+        立即返回最新帧，尚未收到任何帧时等待首帧
+
         Returns:
-            bytes: JPEG 图像数据
+            Frame: 最新帧，data 为 JPEG 图像数据
+
+        Raises:
+            FrameTimeoutError: 等待首帧超时时抛出
         """
-        with self.lock:
-            self.cache = self.data.get()
+        frame = self.slot.latest()
+        if frame is None:
+            frame = self.slot.wait_newer_than(0, self.wait_timeout)
+        return frame
 
-        try:
-            with self.lock:
-                timeout = self.timeout / 1000 if self.timeout and use_cache else None
-                return self.data.get(timeout=timeout)
-        except Empty:
-            logger.debug("获取超时，返回缓存帧")
-            return self.cache
+    def wait_newer_than(self, seq: int, timeout: Optional[float] = None) -> Frame:
+        """
+        等待序号大于 seq 的新帧
+
+        Args:
+            seq: 已见过的帧序号
+            timeout: 超时时间(秒)，None 表示一直等待
+
+        Raises:
+            FrameTimeoutError: 超时仍无新帧时抛出
+        """
+        return self.slot.wait_newer_than(seq, timeout)
+
+    def is_intact(self, frame: Frame) -> bool:
+        """判断帧所在缓冲区是否尚未被新帧覆盖，读取帧数据后调用"""
+        return self.slot.seq - frame.seq <= len(self._buffers) - 2
+
+    @property
+    def wait_timeout(self) -> float:
+        """等待帧的超时时间(秒)"""
+        return self.timeout / 1000 if self.timeout else MINICAP_FIRST_FRAME_TIMEOUT
 
     def _create_socket(self) -> bool:
         """连接到指定主机和端口"""
@@ -382,72 +609,65 @@ class MiniCapStream:
             raise
 
     def _read_stream(self) -> None:
-        """读取数据流"""
-        banner = {}  # 24bytes(1+1+(4*5)+1+1)
-        state = "banner"
-        expected_size = 2  # 初始读取version和length
-        buffer = bytearray()
-        frame_body_length = remaining_bytes = 0  # 帧体长度与剩余需读取字节数
-
-        while not self.stop_event.is_set():
-            try:
-                # (24, 1024, ...)
-                chunk = self.sock.recv(remaining_bytes or DEFAULT_BUFFER_SIZE)
-                if not chunk:
-                    break
-
-                buffer.extend(chunk)
-                cursor = 0
-
-                while cursor < len(buffer):
-                    if state == "banner" and len(buffer) >= cursor + expected_size:
-                        banner, state = self._read_banner(buffer, cursor)
-                        cursor += 2
-
-                    elif state == "banner_rest" and len(buffer) >= cursor + expected_size:
-                        banner_rest, state, expected_size = self._read_banner_rest(buffer, cursor)
-                        banner.update(banner_rest)
-                        logger.info(f"banner {banner}")
-                        buffer.clear()
-                        break
-
-                    elif state == "frame_header" and len(buffer) >= cursor + expected_size:
-                        frame_body_length, state = self._read_frame_header(buffer, cursor)
-                        cursor += 4
-
-                    elif state == "frame_body" and len(buffer) >= cursor + frame_body_length:
-                        frame_body = self._read_frame_body(buffer, cursor, frame_body_length)
+        """读取数据流：先读取 banner，之后循环读取 4 字节帧头与帧体"""
+        try:
+            self.banner = self._read_banner()
+            logger.info(f"banner {self.banner}")
+            if self.banner['realWidth']:
+                self.projection_scale = self.banner['virtualWidth'] / self.banner['realWidth']
 
-                        while not self.data.empty():
-                            self.data.get_nowait()
-                        self.data.put_nowait(frame_body)
+            header = memoryview(bytearray(MINICAP_FRAME_HEADER_SIZE))
+            while not self.stop_event.is_set():
+                self._recv_into(header)
+                frame_body_length = struct.unpack_from('<I', header)[0]
 
-                        state = "frame_header"
-                        frame_body_length = remaining_bytes = 0
-                        buffer.clear()
-                        break
+                frame_body = self._acquire_buffer(self.slot.seq + 1, frame_body_length)
+                self._recv_into(frame_body)
+                if frame_body[:2] != b'\xFF\xD8':
+                    raise StreamHandleError("无效的JPEG头")
 
-                    else:
-                        buffer = buffer[cursor:]
-                        remaining_bytes = frame_body_length - len(buffer)
-                        break
+                self._publish(frame_body)
 
-            except Exception as e:
+        except StreamClosedError as e:
+            logger.info(f"数据流已结束: {e}")
+        except Exception as e:
+            if not self.stop_event.is_set():
                 logger.error(f"读取数据流错误: {e}")
-                break
 
-    @staticmethod
-    def _read_banner(buffer: bytearray, cursor: int) -> Tuple[Dict, str]:
+    def _recv_into(self, view: memoryview) -> None:
+        """
+        读满整个 view，数据跨越多次 recv 时自动拼接
+
+        Raises:
+            StreamClosedError: 连接关闭或数据流被停止时抛出
+        """
+        received, size = 0, len(view)
+        while received < size:
+            try:
+                count = self.sock.recv_into(view[received:], size - received)
+            except socket.timeout:
+                if self.stop_event.is_set():
+                    raise StreamClosedError("数据流已停止")
+                continue
+            if count == 0:
+                raise StreamClosedError("MiniCap 连接已关闭")
+            received += count
+
+    def _read_banner(self) -> Dict:
         """读取banner信息"""
-        version, length = struct.unpack_from('BB', buffer, cursor)
-        banner = {'version': version, 'length': length}
-        return banner, "banner_rest"
+        head = memoryview(bytearray(2))
+        self._recv_into(head)
+        version, length = struct.unpack_from('BB', head)
+
+        rest = memoryview(bytearray(max(length, MINICAP_BANNER_SIZE) - 2))
+        self._recv_into(rest[:length - 2])
+        return {'version': version, 'length': length, **self._parse_banner_rest(rest)}
 
     @staticmethod
-    def _read_banner_rest(buffer: bytearray, cursor: int) -> Tuple[Dict, str, int]:
-        """读取剩余banner信息"""
+    def _parse_banner_rest(buffer: memoryview) -> Dict:
+        """解析剩余banner信息"""
         fmt = '<IIIIIBB'
-        fields = struct.unpack_from(fmt, buffer, cursor)
+        fields = struct.unpack_from(fmt, buffer)
         return {
             'pid': fields[0],
             'realWidth': fields[1],
@@ -456,27 +676,117 @@ class MiniCapStream:
             'virtualHeight': fields[4],
             'orientation': fields[5] * 90,
             'quirks': fields[6]
-        }, "frame_header", 4
+        }
 
-    @staticmethod
-    def _read_frame_header(buffer: bytearray, cursor: int) -> Tuple[int, str]:
-        """读取帧头信息"""
-        # 循环迭代四次获取完整帧体长
-        # frame_body_length += (buffer[cursor] << (i * 8)) & 0xFFFFFFFF  # i = cursor = (0,1,2,3)
-        frame_body_length = struct.unpack_from('<I', buffer, cursor)[0]
-        return frame_body_length, "frame_body"
+    def _acquire_buffer(self, seq: int, length: int) -> memoryview:
+        """获取帧序号对应的缓冲区，容量不足时按帧大小重新分配"""
+        index = seq % len(self._buffers)
+        if len(self._buffers[index]) < length:
+            # 已导出 memoryview 的 bytearray 不能原地扩容，替换为新缓冲区
+            self._buffers[index] = bytearray(int(length * MINICAP_BUFFER_HEADROOM))
+        return memoryview(self._buffers[index])[:length]
+
+    def _publish(self, frame_body: memoryview) -> Frame:
+        """发布最新帧，帧缩放率取自 banner"""
+        frame = self.slot.publish(frame_body, scale=self.projection_scale)
+        if self.capture_stats is not None:
+            self.capture_stats.record_received(len(frame_body), frame.timestamp)
+        for listener in self.listeners:
+            try:
+                listener(frame)
+            except Exception as e:
+                logger.error(f"帧监听回调失败: {e}")
+        return frame
 
-    @staticmethod
-    def _read_frame_body(buffer: bytearray, cursor: int, length: int) -> bytes:
-        """读取帧体数据"""
-        frame_body = buffer[cursor:cursor + length]
-        if frame_body[:2] != b'\xFF\xD8':
-            raise StreamHandleError("无效的JPEG头")
-        return frame_body
+
+class MiniCapHub:
+    """
+    按设备序列号共享 MiniCapManager 的引用计数容器
+
+    同一进程内同一设备的多个 MiniCap 共用一个 minicap 服务、端口转发与读取线程，最新帧(及后台解码的只读数组)
+    直接交给所有订阅者，不复制；最后一个订阅者释放时停止服务。
+    """
+
+    _lock = threading.Lock()
+    _entries: Dict[str, Dict] = {}  # 序列号 -> {'manager', 'options', 'subscribers', 'ready'}
+
+    @classmethod
+    def acquire(cls, serial: str, **options) -> MiniCapManager:
+        """
+        订阅设备的 minicap 服务，尚未启动时按 options 启动
+
+        Args:
+            serial: 设备序列号
+            **options: MiniCapManager 的初始化参数，服务已由其他订阅者启动时沿用已有参数
+
+        Returns:
+            MiniCapManager: 共享的 minicap 服务管理对象
+
+        Raises:
+            MiniCapUnSupportError: 当设备不支持MiniCap时抛出
+            ServiceNotReadyError: 当 minicap 服务在期限内未就绪时抛出
+        """
+        with cls._lock:
+            entry = cls._entries.get(serial)
+            if entry is None:
+                entry = {'manager': None, 'options': options, 'subscribers': 0, 'ready': threading.Event()}
+                cls._entries[serial] = entry
+                owner = True
+            else:
+                owner = False
+                if entry['options'] != options:
+                    logger.warning(f"设备 {serial} 的 minicap 服务已由其他订阅者启动，沿用已有参数: {entry['options']}")
+            entry['subscribers'] += 1
+
+        if owner:
+            # 启动服务耗时较长，在全局锁之外进行，不阻塞其他设备
+            try:
+                entry['manager'] = MiniCapManager(serial, **options)
+            except Exception:
+                with cls._lock:
+                    if cls._entries.get(serial) is entry:
+                        del cls._entries[serial]  # 之后的订阅者重新启动服务
+                raise
+            finally:
+                entry['ready'].set()
+        else:
+            entry['ready'].wait()
+
+        if entry['manager'] is None:
+            raise MiniCapError(f"设备 {serial} 的 minicap 服务启动失败")
+        logger.debug(f"订阅 minicap 服务 | 设备: {serial} | 订阅者: {entry['subscribers']}")
+        return entry['manager']
+
+    @classmethod
+    def release(cls, serial: str) -> None:
+        """取消订阅，最后一个订阅者释放时停止 minicap 服务"""
+        with cls._lock:
+            entry = cls._entries.get(serial)
+            if entry is None:
+                return
+            entry['subscribers'] -= 1
+            if entry['subscribers'] > 0:
+                return
+            del cls._entries[serial]
+
+        if entry['manager'] is not None:
+            entry['manager'].stop_minicap_service()
+            logger.info(f"最后一个订阅者已释放，minicap 服务已停止 | 设备: {serial}")
+
+    @classmethod
+    def subscribers(cls, serial: str) -> int:
+        """设备的订阅者数量"""
+        with cls._lock:
+            entry = cls._entries.get(serial)
+            return entry['subscribers'] if entry is not None else 0
 
 
 class MiniCap(ScreenCap):
-    """MiniCap 截图类"""
+    """
+    MiniCap 截图类
+
+    同一进程内同一设备的多个实例通过 MiniCapHub 共享一个 minicap 服务，不再互相终止；用完后调用 close 释放。
+    """
 
     def __init__(
             self,
@@ -486,7 +796,19 @@ class MiniCap(ScreenCap):
             timeout: Optional[int] = None,
             host: str = DEFAULT_HOST,
             skip_frame: bool = True,
-            use_stream: bool = True
+            use_stream: bool = True,
+            decode: str = 'rgb',
+            decode_scale: int = 1,
+            decode_worker: bool = False,
+            decode_idle_timeout: Optional[float] = MINICAP_DECODE_IDLE_TIMEOUT,
+            start_timeout: float = MINICAP_START_TIMEOUT,
+            projection: Optional[Union[float, Tuple[int, int]]] = None,
+            governor: bool = False,
+            rate_range: Tuple[int, int] = MINICAP_GOVERNOR_RATE_RANGE,
+            quality_range: Tuple[int, int] = MINICAP_GOVERNOR_QUALITY_RANGE,
+            supervise: bool = True,
+            reconnect_timeout: float = MINICAP_RECONNECT_TIMEOUT,
+            stall_timeout: Optional[float] = None
     ):
         """
         初始化 MiniCap 截图对象
@@ -499,38 +821,199 @@ class MiniCap(ScreenCap):
             host: 连接地址（默认：127.0.0.1）
             skip_frame: 当处理帧的速度跟不上捕获速度时,是否跳过它们
             use_stream: 是否使用流模式
-            
+            decode: 解码方式，'rgb' 输出 RGB 三通道图像，'gray' 直接解码为单通道灰度图像(只做亮度分量的 IDCT)
+            decode_scale: 解码缩小倍数(1/2/4/8)，大于1时在 DCT 域缩小解码，截图坐标需除以 frame_scale 映射回屏幕坐标
+            decode_worker: 是否在后台线程提前解码最新帧(仅流模式)，截图时直接返回已解码的只读数组
+            decode_idle_timeout: 后台解码的空闲时间(秒)，超过该时间无人截图时暂停解码；None 表示一直解码
+            start_timeout: 等待 minicap 服务就绪的期限(秒)，服务就绪即返回
+            projection: 虚拟投影尺寸，(0, 1] 的缩放系数(如 0.5)或 (宽, 高)；设备端按该尺寸缩小后编码，
+                        减少编码、传输与解码开销，截图坐标按 frame_scale 自动映射回屏幕坐标。None 表示原始尺寸
+            governor: 是否按实际取帧帧率与解码耗时自适应调节 minicap 的帧率、质量与 -S 跳帧(仅流模式)，
+                      调节时重启 minicap 服务
+            rate_range: 自适应调节的帧率范围 (最小, 最大)
+            quality_range: 自适应调节的 JPEG 质量范围 (最小, 最大)
+            supervise: 是否监护数据流(仅流模式)，读取线程或 minicap 进程退出时自动重启进程、端口转发与数据流
+            reconnect_timeout: 数据流中断时截图等待恢复的期限(秒)，超过时抛出 StreamReconnectTimeoutError
+            stall_timeout: 最新帧超过该秒数未更新时视为停滞并重连；minicap 只在画面变化时发送帧，默认 None 不检查
+
         Raises:
+            ValueError: 当解码参数、投影尺寸或调节范围无效时抛出
             MiniCapUnSupportError: 当设备不支持MiniCap时抛出
+            ServiceNotReadyError: 当 minicap 服务在期限内未就绪时抛出
         """
+        check_decode_options(decode, decode_scale)
+
+        self.decode = decode
+        self.decode_scale = decode_scale
+        decoder = {'mode': decode, 'scale': decode_scale, 'idle_timeout': decode_idle_timeout} \
+            if decode_worker and use_stream else None
+        governor_options = {'rate_range': rate_range, 'quality_range': quality_range} if governor else None
+        supervisor_options = {'reconnect_timeout': reconnect_timeout, 'stall_timeout': stall_timeout} \
+            if supervise else None
+        self.serial = serial
+        self.minicap = MiniCapHub.acquire(
+            serial, rate=rate, quality=quality, timeout=timeout, host=host, skip_frame=skip_frame,
+            use_stream=use_stream, decoder=decoder, start_timeout=start_timeout, projection=projection,
+            governor=governor_options, supervisor=supervisor_options
+        )
+        self.minicap.capture_stats.add(self.capture_stats)
+        self._closed = False
+        self.last_frame: Optional[Frame] = None  # 最近一次 screencap 使用的帧
+        self._seq = 0  # 非流模式下的帧序号
+
+    @property
+    def frame_age(self) -> Optional[float]:
+        """最近一次 screencap 所用帧自接收以来经过的秒数，尚未截图时为 None"""
+        return self.last_frame.age if self.last_frame is not None else None
+
+    @property
+    def frame_scale(self) -> float:
+        """截图相对设备屏幕坐标的缩放率，即 投影缩放率 / decode_scale，投影缩放率取自最近一次截图所用帧"""
+        scale = self.last_frame.scale if self.last_frame is not None else self.minicap.projection_scale
+        return scale / self.decode_scale
+
+    def decode_stats(self) -> Optional[Dict]:
+        """后台解码统计信息(已解码帧数、丢帧数、解码帧率、是否暂停)，未使用后台解码时为 None"""
+        stream = self.minicap.stream
+        return stream.decoder.stats() if stream is not None and stream.decoder is not None else None
+
+    def governor_stats(self) -> Optional[Dict]:
+        """自适应调节统计信息(当前帧率/质量/跳帧、取帧帧率、解码耗时、重启次数与调节记录)，未启用时为 None"""
+        return self.minicap.governor.stats() if self.minicap.governor is not None else None
+
+    def supervisor_stats(self) -> Optional[Dict]:
+        """数据流监护统计信息(是否正常、中断与重连次数、停机时间)，未启用时为 None"""
+        return self.minicap.supervisor.stats() if self.minicap.supervisor is not None else None
+
+    def add_frame_listener(self, listener: Callable[[Frame], None]) -> None:
+        """
+        添加帧监听回调(仅流模式)，读取线程收到新帧时以 Frame 调用，Frame.data 为 JPEG 数据的 memoryview，
+        只在回调期间有效；回调应尽快返回，否则会拖慢数据流读取
+
+        Raises:
+            MiniCapError: 非流模式时抛出
+        """
+        if not self.minicap.config['use_stream']:
+            raise MiniCapError("帧监听只支持流模式")
+        if listener not in self.minicap.frame_listeners:
+            self.minicap.frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable[[Frame], None]) -> None:
+        """移除帧监听回调"""
+        if listener in self.minicap.frame_listeners:
+            self.minicap.frame_listeners.remove(listener)
+
+    def close(self) -> None:
+        """取消订阅共享的 minicap 服务，最后一个订阅者关闭时停止服务"""
+        if self._closed:
+            return
+        self._closed = True
+        self.minicap.capture_stats.remove(self.capture_stats)
+        MiniCapHub.release(self.serial)
 
-        self.minicap = MiniCapManager(serial, rate, quality, timeout, host, skip_frame, use_stream)
+    def __del__(self) -> None:
+        """析构时释放订阅"""
+        if getattr(self, '_closed', True) is False:
+            self.close()
 
-    def screencap(self) -> np.ndarray:
+    def screencap(self, max_age: Optional[float] = None) -> np.ndarray:
         """
         捕获屏幕内容
         
+        Args:
+            max_age: 可接受的最大帧龄(秒)，最新帧更旧时等待新帧；超时仍无新帧说明画面未变化，使用最新帧。
+                     None 表示直接使用最新帧
         Returns:
-            np.ndarray: RGB格式的图像数组
-            
+            np.ndarray: RGB格式的图像数组，decode 为 'gray' 时为单通道灰度数组；decode_scale 大于1时宽高按倍数缩小；
+                        使用后台解码时为只读数组
+
         Raises:
             RuntimeError: 当捕获或转换失败时抛出
+            FrameTimeoutError: 当等待首帧超时，或数据流中断后未能在 reconnect_timeout 内恢复时抛出
+            StreamHandleError: 当 MINICAP_DECODE_RETRIES 次解码期间帧缓冲区均被新帧覆盖时抛出
         """
         try:
-            # 获取图像数据
-            data = (self.minicap.stream.capture_frame() if self.minicap.config['use_stream']
-                    else self.minicap.capture_frame())
-
-            # 转换为numpy数组
-            image = Image.open(io.BytesIO(data))
-            return np.array(image)[:, :, :3]  # default 3
-
+            start = time.perf_counter()
+            if self.minicap.supervisor is not None:
+                self.minicap.supervisor.wait_streaming()
+
+            stream, governor = self.minicap.stream, self.minicap.governor
+            if self._uses_decoder(stream):
+                self.last_frame = stream.decoder.acquire(max_age, stream.wait_timeout)
+                if governor is not None:
+                    governor.record_pull()
+                self.capture_stats.record_delivered(time.perf_counter() - start, self.last_frame.seq)
+                return self.last_frame.data
+
+            for _ in range(MINICAP_DECODE_RETRIES):
+                frame = self._capture(max_age)
+
+                decode_start = time.perf_counter()
+                image = self._decode(frame.data)
+                if self.minicap.stream is None or self.minicap.stream.is_intact(frame):
+                    break
+                logger.debug(f"帧缓冲区在读取期间被覆盖，重新获取 | 序号: {frame.seq}")
+            else:
+                raise StreamHandleError(f"帧缓冲区在解码期间被连续覆盖 {MINICAP_DECODE_RETRIES} 次，"
+                                        f"解码速度跟不上数据流，可增大 MINICAP_FRAME_BUFFERS 或使用后台解码")
+
+            end = time.perf_counter()
+            self.capture_stats.record_decode(end - decode_start)
+            if governor is not None:
+                governor.record_pull(end - decode_start)
+            self.capture_stats.record_delivered(end - start, frame.seq)
+            self.last_frame = frame
+            return image
+
+        except (FrameTimeoutError, StreamHandleError):
+            raise
         except Exception as e:
             raise RuntimeError(f"屏幕捕获失败: {e}")
 
+    def _last_jpeg(self) -> Optional[bytes]:
+        """最近一次截图的原始 JPEG 数据；后台解码时取数据流中的对应帧，帧缓冲区已被覆盖时为 None"""
+        frame, stream = self.last_frame, self.minicap.stream
+        if frame is None:
+            return None
+        if isinstance(frame.data, np.ndarray):
+            source = stream.capture_frame() if stream is not None else None
+            if source is None or source.timestamp != frame.timestamp:
+                return None
+            frame = source
+
+        data = bytes(frame.data)
+        if stream is not None and not stream.is_intact(frame):
+            return None
+        return data
+
+    def _uses_decoder(self, stream: Optional[MiniCapStream]) -> bool:
+        """数据流的后台解码与本实例的解码方式一致时直接使用其结果(共享服务的订阅者可能使用不同的解码方式)"""
+        decoder = stream.decoder if stream is not None else None
+        return decoder is not None and decoder.mode == self.decode and decoder.scale == self.decode_scale
+
+    def _decode(self, data) -> np.ndarray:
+        """按解码方式与缩小倍数解码 JPEG 数据"""
+        return decode_jpeg(data, self.decode, self.decode_scale)
+
+    def _capture(self, max_age: Optional[float] = None) -> Frame:
+        """获取最新帧，超过 max_age 时等待新帧"""
+        if not self.minicap.config['use_stream']:
+            self._seq += 1
+            data = self.minicap.capture_frame()
+            self.capture_stats.record_received(len(data))
+            return Frame(data=data, seq=self._seq, timestamp=time.monotonic(), scale=self.minicap.projection_scale)
+
+        stream = self.minicap.stream
+        frame = stream.capture_frame()
+        if max_age is not None and frame.age > max_age:
+            try:
+                frame = stream.wait_newer_than(frame.seq, stream.wait_timeout)
+            except FrameTimeoutError:
+                logger.debug(f"等待新帧超时，画面可能未变化，使用最新帧 | 帧龄: {frame.age:.3f}s")
+        return frame
+
 
 if __name__ == "__main__":
     m = MiniCap("127.0.0.1:16384")
     m.save_screencap()
-    m.minicap.stop_minicap_service()
-    pass
+    m.close()
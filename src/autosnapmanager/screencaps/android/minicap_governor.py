@@ -0,0 +1,226 @@
+"""
+MiniCap 自适应调节模块
+统计调用方的取帧帧率与解码耗时，在给定范围内调整 minicap 的帧率(-r)、JPEG 质量(-Q)与跳帧(-S)并重启服务，
+避免以远高于实际需求的帧率与质量推流，浪费设备端 CPU、电量与传输带宽
+"""
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+from autosnapmanager.screencaps.screencap_config import (
+    MINICAP_GOVERNOR_INTERVAL, MINICAP_GOVERNOR_WINDOW, MINICAP_GOVERNOR_RATE_RANGE, MINICAP_GOVERNOR_QUALITY_RANGE,
+    MINICAP_GOVERNOR_QUALITY_STEP, MINICAP_GOVERNOR_HEADROOM, MINICAP_GOVERNOR_DECODE_BUDGET,
+    MINICAP_GOVERNOR_RATE_TOLERANCE, MINICAP_GOVERNOR_COOLDOWN, MINICAP_GOVERNOR_HISTORY
+)
+from autosnapmanager.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class GovernorDecision:
+    """一次调节记录"""
+    timestamp: float  # 决策时的 time.time()
+    pull_fps: float  # 统计窗口内的取帧帧率
+    decode_time: float  # 统计窗口内的平均解码耗时(秒)
+    rate: int  # 调节后的帧率
+    quality: int  # 调节后的 JPEG 质量
+    skip_frame: bool  # 调节后是否开启 -S
+    reason: str  # 调节原因
+    applied: bool  # 是否已成功重启 minicap
+
+
+class MiniCapGovernor:
+    """
+    MiniCap 自适应调节线程
+
+    被调节的 manager 需提供 config(rate/quality/skip_frame)、device_info.fps、stream 与 reconfigure(rate, quality,
+    skip_frame)，如 MiniCapManager。调用方每次取帧时调用 record_pull，调节线程每隔 interval 秒评估一次：
+    目标帧率为取帧帧率乘以余量；解码耗时超过帧间隔的预算时降低质量并开启 -S，远低于预算时逐步恢复质量。
+    设置变化超过容差且距上次重启超过冷却时间时才重启 minicap。
+    """
+
+    def __init__(
+            self,
+            manager,
+            rate_range: Tuple[int, int] = MINICAP_GOVERNOR_RATE_RANGE,
+            quality_range: Tuple[int, int] = MINICAP_GOVERNOR_QUALITY_RANGE,
+            interval: float = MINICAP_GOVERNOR_INTERVAL,
+            cooldown: float = MINICAP_GOVERNOR_COOLDOWN
+    ):
+        """
+        初始化自适应调节线程
+
+        Args:
+            manager: 被调节的 minicap 服务管理对象
+            rate_range: 帧率范围 (最小, 最大)
+            quality_range: JPEG 质量范围 (最小, 最大)，取值 1-100
+            interval: 评估间隔(秒)
+            cooldown: 两次重启的最小间隔(秒)
+
+        Raises:
+            ValueError: 当调节范围无效时抛出
+        """
+        if not 0 < rate_range[0] <= rate_range[1]:
+            raise ValueError(f"无效的帧率范围: {rate_range}")
+        if not 1 <= quality_range[0] <= quality_range[1] <= 100:
+            raise ValueError(f"无效的质量范围: {quality_range}")
+
+        self.manager = manager
+        self.rate_range = rate_range
+        self.quality_range = quality_range
+        self.interval = interval
+        self.cooldown = cooldown
+        self.skip_frame = manager.config['skip_frame']  # 用户设置的跳帧，解码负载恢复正常后还原
+
+        self.pull_fps = 0.0
+        self.decode_time = 0.0
+        self.restarts = 0
+        self.failures = 0
+        self.decisions = deque(maxlen=MINICAP_GOVERNOR_HISTORY)
+
+        self._pulls = deque()  # 取帧时间
+        self._decodes = deque()  # (解码完成时间, 解码耗时)，后台解码时不使用
+        self._started = time.monotonic()
+        self._last_restart = self._started
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def rate(self) -> int:
+        """当前帧率"""
+        return self.manager.device_info.fps
+
+    @property
+    def quality(self) -> int:
+        """当前 JPEG 质量"""
+        return self.manager.config['quality']
+
+    def start(self) -> None:
+        """启动调节线程"""
+        self._thread.start()
+        logger.info(f"MiniCap 自适应调节已启动 | 帧率范围: {self.rate_range} | 质量范围: {self.quality_range}")
+
+    def stop(self) -> None:
+        """停止调节线程，在调节线程内(如重启失败的清理过程中)调用时不等待"""
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def record_pull(self, decode_time: Optional[float] = None) -> None:
+        """
+        记录一次取帧
+
+        Args:
+            decode_time: 本次取帧的解码耗时(秒)，使用后台解码时为 None，解码耗时改取自后台解码统计
+        """
+        now = time.monotonic()
+        self._pulls.append(now)
+        if decode_time is not None:
+            self._decodes.append((now, decode_time))
+
+    def measure(self) -> Tuple[float, float]:
+        """
+        统计窗口内的取帧帧率与平均解码耗时
+
+        Returns:
+            Tuple[float, float]: (取帧帧率, 平均解码耗时(秒))，无解码记录时耗时为 0
+        """
+        now = time.monotonic()
+        for records, key in ((self._pulls, lambda t: t), (self._decodes, lambda r: r[0])):
+            while records and now - key(records[0]) > MINICAP_GOVERNOR_WINDOW:
+                records.popleft()
+
+        elapsed = min(MINICAP_GOVERNOR_WINDOW, now - self._started)
+        pull_fps = len(self._pulls) / elapsed if elapsed > 0 else 0.0
+
+        costs = [cost for _, cost in list(self._decodes)]
+        decoder = getattr(self.manager.stream, 'decoder', None)
+        if costs:
+            decode_time = sum(costs) / len(costs)
+        elif decoder is not None:
+            decode_time = decoder.stats()['decode_time']
+        else:
+            decode_time = 0.0
+        return pull_fps, decode_time
+
+    def plan(self, pull_fps: float, decode_time: float) -> Tuple[int, int, bool, str]:
+        """
+        根据取帧帧率与解码耗时计算目标设置
+
+        Returns:
+            Tuple[int, int, bool, str]: (帧率, JPEG 质量, 是否开启 -S, 原因)
+        """
+        rate_min, rate_max = self.rate_range
+        quality_min, quality_max = self.quality_range
+        rate = min(max(math.ceil(pull_fps * MINICAP_GOVERNOR_HEADROOM), rate_min), rate_max)
+        quality, skip_frame = min(max(self.quality, quality_min), quality_max), self.skip_frame
+        reasons = [f"取帧 {pull_fps:.1f}fps"]
+
+        if pull_fps > 0 and decode_time > 0:
+            budget = MINICAP_GOVERNOR_DECODE_BUDGET / rate
+            if decode_time > budget:
+                quality, skip_frame = max(quality - MINICAP_GOVERNOR_QUALITY_STEP, quality_min), True
+                reasons.append(f"解码 {decode_time * 1000:.1f}ms 超过预算 {budget * 1000:.1f}ms")
+            elif decode_time < budget / 2 and quality < quality_max:
+                quality = min(quality + MINICAP_GOVERNOR_QUALITY_STEP, quality_max)
+                reasons.append(f"解码 {decode_time * 1000:.1f}ms 低于预算 {budget * 1000:.1f}ms")
+        return rate, quality, skip_frame, "，".join(reasons)
+
+    def evaluate(self) -> Optional[GovernorDecision]:
+        """
+        评估一次，设置变化明显且已过冷却时间时重启 minicap
+
+        Returns:
+            Optional[GovernorDecision]: 调节记录，无需调节时为 None
+        """
+        self.pull_fps, self.decode_time = self.measure()
+        rate, quality, skip_frame, reason = self.plan(self.pull_fps, self.decode_time)
+
+        rate_changed = abs(rate - self.rate) > self.rate * MINICAP_GOVERNOR_RATE_TOLERANCE
+        if not rate_changed:
+            rate = self.rate
+        if not rate_changed and quality == self.quality and skip_frame == self.manager.config['skip_frame']:
+            return None
+        if time.monotonic() - self._last_restart < self.cooldown:
+            return None
+
+        logger.info(f"MiniCap 自适应调节 | 帧率: {self.rate} -> {rate} | 质量: {self.quality} -> {quality} | "
+                    f"跳帧: {skip_frame} | {reason}")
+        try:
+            self.manager.reconfigure(rate=rate, quality=quality, skip_frame=skip_frame)
+            self.restarts += 1
+            applied = True
+        except Exception as e:
+            logger.error(f"MiniCap 自适应调节重启失败: {e}")
+            self.failures += 1
+            applied = False
+        self._last_restart = time.monotonic()
+        self._decodes.clear()  # 旧设置下的解码耗时不再有参考价值
+
+        decision = GovernorDecision(time.time(), self.pull_fps, self.decode_time, rate, quality, skip_frame,
+                                    reason, applied)
+        self.decisions.append(decision)
+        return decision
+
+    def stats(self) -> Dict:
+        """当前设置、最近一次统计的取帧帧率与解码耗时、重启次数以及调节记录"""
+        return {
+            'rate': self.rate,
+            'quality': self.quality,
+            'skip_frame': self.manager.config['skip_frame'],
+            'pull_fps': self.pull_fps,
+            'decode_time': self.decode_time,
+            'restarts': self.restarts,
+            'failures': self.failures,
+            'decisions': [asdict(decision) for decision in self.decisions],
+        }
+
+    def _run(self) -> None:
+        """调节循环"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                logger.error(f"MiniCap 自适应调节评估失败: {e}")
@@ -0,0 +1,161 @@
+"""
+MiniCap 数据流监护模块
+监护线程定期检查数据流读取线程、minicap 进程与帧更新，发现中断(模拟器卡顿、adb 重启、设备旋转等)时
+重启设备端进程、端口转发与数据流；截图方在中断期间等待恢复，超过期限时得到超时错误而不是一直阻塞
+"""
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from autosnapmanager.screencaps.frame_slot import FrameTimeoutError
+from autosnapmanager.screencaps.screencap_config import (
+    MINICAP_SUPERVISOR_INTERVAL, MINICAP_RECONNECT_TIMEOUT, MINICAP_RECONNECT_DELAY, MINICAP_RECONNECT_MAX_DELAY
+)
+from autosnapmanager.utils.logger import logger
+
+
+class StreamReconnectTimeoutError(FrameTimeoutError):
+    """数据流中断后未能在期限内恢复"""
+    pass
+
+
+class MiniCapSupervisor:
+    """
+    MiniCap 数据流监护线程
+
+    被监护的 manager 需提供 check_stream(stall_timeout) 与 restart_minicap_service()，如 MiniCapManager。
+    重连失败时按指数退避持续重试，直到恢复或监护停止。
+    """
+
+    def __init__(
+            self,
+            manager,
+            reconnect_timeout: float = MINICAP_RECONNECT_TIMEOUT,
+            stall_timeout: Optional[float] = None,
+            interval: float = MINICAP_SUPERVISOR_INTERVAL
+    ):
+        """
+        初始化数据流监护线程
+
+        Args:
+            manager: 被监护的 minicap 服务管理对象
+            reconnect_timeout: 截图等待数据流恢复的期限(秒)
+            stall_timeout: 最新帧超过该秒数未更新时视为数据流停滞并重连；minicap 只在画面变化时发送帧，
+                           画面可能长时间静止时应为 None(不检查停滞)
+            interval: 健康检查间隔(秒)
+        """
+        self.manager = manager
+        self.reconnect_timeout = reconnect_timeout
+        self.stall_timeout = stall_timeout
+        self.interval = interval
+
+        self.disconnects = 0  # 检测到的中断次数
+        self.reconnects = 0  # 成功重连次数
+        self.failures = 0  # 失败的重连尝试次数
+        self.last_problem: Optional[str] = None
+        self.last_downtime = 0.0  # 最近一次中断到恢复的秒数
+        self.total_downtime = 0.0
+
+        self._streaming = threading.Event()
+        self._streaming.set()
+        self._wake = threading.Event()  # 截图方发现读取线程已退出时置位，立即检查
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def streaming(self) -> bool:
+        """数据流是否正常"""
+        return self._streaming.is_set()
+
+    def start(self) -> None:
+        """启动监护线程"""
+        self._thread.start()
+        logger.info(f"MiniCap 数据流监护已启动 | 恢复期限: {self.reconnect_timeout}s | 停滞判定(秒): {self.stall_timeout}")
+
+    def stop(self) -> None:
+        """停止监护线程"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def wait_streaming(self, timeout: Optional[float] = None) -> None:
+        """
+        确认数据流正常，中断时等待恢复
+
+        Args:
+            timeout: 等待期限(秒)，None 表示 reconnect_timeout
+
+        Raises:
+            StreamReconnectTimeoutError: 数据流未能在期限内恢复时抛出
+        """
+        stream = self.manager.stream
+        if self._streaming.is_set() and stream is not None and stream.thread.is_alive():
+            return
+
+        self._wake.set()
+        timeout = self.reconnect_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        # 读取线程已退出但监护线程尚未检查到时，先等待其确认中断，避免直接使用旧数据流
+        while self._streaming.is_set() and not self._is_reading():
+            if time.monotonic() >= deadline or self._stop_event.is_set():
+                raise StreamReconnectTimeoutError(f"MiniCap 数据流已中断 | 原因: {self.last_problem}")
+            time.sleep(min(self.interval, 0.05))
+
+        if not self._streaming.wait(max(deadline - time.monotonic(), 0)):
+            raise StreamReconnectTimeoutError(f"MiniCap 数据流未能在 {timeout}s 内恢复 | 原因: {self.last_problem}")
+
+    def stats(self) -> Dict[str, Union[int, float, bool, str, None]]:
+        """数据流状态、中断与重连次数以及停机时间"""
+        return {
+            'streaming': self.streaming,
+            'disconnects': self.disconnects,
+            'reconnects': self.reconnects,
+            'failures': self.failures,
+            'last_problem': self.last_problem,
+            'last_downtime': self.last_downtime,
+            'total_downtime': self.total_downtime,
+        }
+
+    def _is_reading(self) -> bool:
+        """读取线程是否仍在运行"""
+        stream = self.manager.stream
+        return stream is not None and stream.thread.is_alive()
+
+    def _run(self) -> None:
+        """监护循环"""
+        while not self._stop_event.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                break
+
+            problem = self.manager.check_stream(self.stall_timeout)
+            if problem is not None:
+                self._reconnect(problem)
+
+    def _reconnect(self, problem: str) -> None:
+        """重启 minicap 服务直到数据流恢复，失败时按指数退避重试"""
+        self._streaming.clear()
+        self.disconnects += 1
+        self.last_problem = problem
+        logger.warning(f"MiniCap 数据流中断，正在重连 | 原因: {problem}")
+
+        start, delay = time.monotonic(), MINICAP_RECONNECT_DELAY
+        while not self._stop_event.is_set():
+            try:
+                self.manager.restart_minicap_service()
+                break
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"MiniCap 重连失败，{delay:.1f}s 后重试 | 已中断: {time.monotonic() - start:.1f}s | {e}")
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, MINICAP_RECONNECT_MAX_DELAY)
+        else:
+            return
+
+        self.reconnects += 1
+        self.last_downtime = time.monotonic() - start
+        self.total_downtime += self.last_downtime
+        self._streaming.set()
+        logger.info(f"MiniCap 数据流已恢复 | 耗时: {self.last_downtime:.2f}s | 重连次数: {self.reconnects}")
@@ -0,0 +1,189 @@
+"""
+截图统计模块
+记录接收帧、交付帧、丢帧、数据量以及截图与解码耗时，快照开销只与统计窗口内的记录数有关，可由监控线程每秒轮询
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple, Union
+
+from autosnapmanager.screencaps.screencap_config import CAPTURE_STATS_WINDOW, CAPTURE_STATS_SAMPLES
+
+Number = Union[int, float]
+
+
+def percentiles(samples, points=(50, 90, 99)) -> Dict[str, float]:
+    """
+    计算百分位数(最近邻取值)
+
+    Returns:
+        Dict[str, float]: 如 {'p50': ..., 'p90': ..., 'p99': ...}，无样本时为 0
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{point}": 0.0 for point in points}
+    last = len(ordered) - 1
+    return {f"p{point}": ordered[min(round(last * point / 100), last)] for point in points}
+
+
+class CaptureStats:
+    """
+    截图统计
+
+    接收指后端收到一帧(如 minicap 数据流中的 JPEG 帧，拉取式截图即每次截图)，交付指 screencap 返回一帧；
+    单帧槽中未被取走就被新帧替换的帧计为丢帧。所有方法线程安全。
+    """
+
+    def __init__(self, window: float = CAPTURE_STATS_WINDOW, samples: int = CAPTURE_STATS_SAMPLES):
+        """
+        初始化截图统计
+
+        Args:
+            window: 计算帧率与数据速率的时间窗口(秒)
+            samples: 计算耗时百分位数时保留的最近样本数
+        """
+        self.window = window
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._received = deque()  # 窗口内的 (接收时间, 字节数)
+        self._delivered = deque()  # 窗口内的交付时间
+        self._capture_times = deque(maxlen=samples)  # screencap 调用耗时(秒)
+        self._decode_times = deque(maxlen=samples)  # 解码耗时(秒)
+        self._last_received: Optional[float] = None
+        self._last_seq = 0
+
+    def record_received(self, nbytes: int = 0, timestamp: Optional[float] = None) -> None:
+        """
+        记录接收一帧
+
+        Args:
+            nbytes: 帧数据量(字节)，如 JPEG 或原始像素的长度
+            timestamp: 接收时的 time.monotonic()，None 表示当前时间
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            self.received += 1
+            self._received.append((now, nbytes))
+            self._last_received = now
+            self._trim(now)
+
+    def record_delivered(self, capture_time: Optional[float] = None, seq: Optional[int] = None) -> None:
+        """
+        记录交付一帧
+
+        Args:
+            capture_time: 本次 screencap 的耗时(秒)
+            seq: 交付帧在接收方的序号，与上次交付帧之间跳过的序号计为丢帧；序号变小(数据流重建)时从头计算
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.delivered += 1
+            self._delivered.append(now)
+            if capture_time is not None:
+                self._capture_times.append(capture_time)
+            if seq is not None:
+                if seq < self._last_seq:
+                    self._last_seq = 0
+                self.dropped += max(seq - self._last_seq - 1, 0)
+                self._last_seq = max(seq, self._last_seq)
+            self._trim(now)
+
+    def record_decode(self, decode_time: float) -> None:
+        """记录一次解码耗时(秒)，解码可在截图调用之外进行，如后台解码线程"""
+        with self._lock:
+            self._decode_times.append(decode_time)
+
+    def record_dropped(self, count: int = 1) -> None:
+        """记录丢弃的帧"""
+        with self._lock:
+            self.dropped += count
+
+    def snapshot(self) -> Dict[str, Union[Number, Dict[str, float], None]]:
+        """
+        获取统计快照
+
+        Returns:
+            Dict: received/delivered/dropped 为累计帧数；received_fps、delivered_fps、bytes_per_second 为窗口内速率；
+                  capture_time、decode_time 为最近样本的 p50/p90/p99 耗时(秒)；last_frame_age 为最近接收帧的帧龄(秒)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            received_bytes = sum(nbytes for _, nbytes in self._received)
+            received_fps = len(self._received) / self.window
+            delivered_fps = len(self._delivered) / self.window
+            capture_times = list(self._capture_times)
+            decode_times = list(self._decode_times)
+            last_received = self._last_received
+            counts = self.received, self.delivered, self.dropped
+
+        return {
+            'received': counts[0],
+            'delivered': counts[1],
+            'dropped': counts[2],
+            'received_fps': received_fps,
+            'delivered_fps': delivered_fps,
+            'bytes_per_second': received_bytes / self.window,
+            'capture_time': percentiles(capture_times),
+            'decode_time': percentiles(decode_times),
+            'last_frame_age': now - last_received if last_received is not None else None,
+        }
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self.received = self.delivered = self.dropped = 0
+            self._received.clear()
+            self._delivered.clear()
+            self._capture_times.clear()
+            self._decode_times.clear()
+            self._last_received = None
+            self._last_seq = 0
+
+    def _trim(self, now: float) -> None:
+        """移除统计窗口之外的记录"""
+        while self._received and now - self._received[0][0] > self.window:
+            self._received.popleft()
+        while self._delivered and now - self._delivered[0] > self.window:
+            self._delivered.popleft()
+
+
+class CaptureStatsGroup:
+    """
+    截图统计组，将接收端的记录(接收帧、解码耗时、丢帧)转发给每个成员
+
+    多个截图对象共享同一数据流时，数据流向统计组记录，各截图对象的统计各自完整。成员列表写时复制，转发时不加锁。
+    """
+
+    def __init__(self):
+        self._members: Tuple[CaptureStats, ...] = ()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add(self, stats: CaptureStats) -> None:
+        """添加成员"""
+        with self._lock:
+            if stats not in self._members:
+                self._members = self._members + (stats,)
+
+    def remove(self, stats: CaptureStats) -> None:
+        """移除成员"""
+        with self._lock:
+            self._members = tuple(member for member in self._members if member is not stats)
+
+    def record_received(self, nbytes: int = 0, timestamp: Optional[float] = None) -> None:
+        for member in self._members:
+            member.record_received(nbytes, timestamp)
+
+    def record_decode(self, decode_time: float) -> None:
+        for member in self._members:
+            member.record_decode(decode_time)
+
+    def record_dropped(self, count: int = 1) -> None:
+        for member in self._members:
+            member.record_dropped(count)
@@ -0,0 +1,240 @@
+"""
+后台解码模块
+解码线程在新的 JPEG 帧到达时立即解码最新一帧并发布到已解码帧槽，截图调用直接取用已解码的图像数组，
+解码期间到达的旧帧被跳过；无人截图超过空闲时间后解码线程暂停，不占用 CPU
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+
+from autosnapmanager.screencaps.capture_stats import CaptureStats, CaptureStatsGroup
+from autosnapmanager.screencaps.frame_slot import Frame, FrameSlot, FrameTimeoutError
+from autosnapmanager.screencaps.screencap_config import (
+    MINICAP_DECODE_MODES, MINICAP_DECODE_SCALES, MINICAP_DECODE_POLL_INTERVAL, MINICAP_DECODE_FPS_WINDOW
+)
+from autosnapmanager.utils.logger import logger
+
+# (解码方式, 缩小倍数) -> cv2.imdecode 标志，缩小解码在 libjpeg 的 DCT 阶段完成，不会先解出全尺寸图像
+DECODE_FLAGS = {
+    ('rgb', 1): cv2.IMREAD_COLOR,
+    ('rgb', 2): cv2.IMREAD_REDUCED_COLOR_2,
+    ('rgb', 4): cv2.IMREAD_REDUCED_COLOR_4,
+    ('rgb', 8): cv2.IMREAD_REDUCED_COLOR_8,
+    ('gray', 1): cv2.IMREAD_GRAYSCALE,
+    ('gray', 2): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    ('gray', 4): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    ('gray', 8): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+class DecodeError(Exception):
+    """JPEG 解码失败"""
+    pass
+
+
+def check_decode_options(mode: str, scale: int) -> None:
+    """
+    校验解码参数
+
+    Raises:
+        ValueError: 当解码方式或缩小倍数不受支持时抛出
+    """
+    if mode not in MINICAP_DECODE_MODES:
+        raise ValueError(f"不支持的解码方式: {mode}，可选: {MINICAP_DECODE_MODES}")
+    if scale not in MINICAP_DECODE_SCALES:
+        raise ValueError(f"不支持的解码缩小倍数: {scale}，可选: {MINICAP_DECODE_SCALES}")
+
+
+def decode_jpeg(data, mode: str = 'rgb', scale: int = 1) -> np.ndarray:
+    """
+    按解码方式与缩小倍数解码 JPEG 数据
+
+    Args:
+        data: JPEG 数据(bytes、bytearray 或 memoryview)
+        mode: 'rgb' 输出 RGB 三通道图像，'gray' 输出单通道灰度图像
+        scale: 缩小倍数(1/2/4/8)
+
+    Returns:
+        np.ndarray: 解码后的图像数组
+
+    Raises:
+        DecodeError: 当 JPEG 数据无法解码时抛出
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), DECODE_FLAGS[(mode, scale)])
+    if image is None:
+        raise DecodeError("JPEG 解码失败")
+    if mode == 'rgb':
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)  # 原地交换通道，不额外分配
+    return image
+
+
+class DecodeWorker:
+    """
+    后台解码线程
+
+    数据源需提供 slot(最新帧槽)、wait_newer_than(seq, timeout) 与 is_intact(frame)，如 MiniCapStream。
+    已解码的图像数组只读，每帧独立分配，取用后不会被后续解码覆盖。
+    """
+
+    def __init__(self, source, mode: str = 'rgb', scale: int = 1, idle_timeout: Optional[float] = None,
+                 capture_stats: Optional[Union[CaptureStats, CaptureStatsGroup]] = None):
+        """
+        初始化后台解码线程
+
+        Args:
+            source: JPEG 帧数据源
+            mode: 解码方式，'rgb' 或 'gray'
+            scale: 解码缩小倍数(1/2/4/8)
+            idle_timeout: 空闲时间(秒)，超过该时间无人取帧时暂停解码，下次取帧时恢复；None 表示一直解码
+            capture_stats: 截图统计，记录解码耗时与未解码即被跳过的帧，None 表示不记录
+        """
+        check_decode_options(mode, scale)
+
+        self.source = source
+        self.mode = mode
+        self.scale = scale
+        self.idle_timeout = idle_timeout
+        self.slot = FrameSlot()  # 已解码帧槽
+        self.capture_stats = capture_stats
+
+        self._stop_event = threading.Event()
+        self._requested = threading.Event()  # 取帧时置位，唤醒暂停中的解码线程
+        self._last_request = time.monotonic()
+        self._paused = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+        self._lock = threading.Lock()
+        self.decoded = 0
+        self.dropped = 0  # 未解码即被更新帧取代、或解码期间缓冲区被覆盖的帧数
+        self._decode_times = deque()  # 最近 MINICAP_DECODE_FPS_WINDOW 秒内的 (完成解码时间, 解码耗时)
+
+    def start(self) -> None:
+        """启动解码线程"""
+        self._thread.start()
+        logger.info(f"后台解码已启动 | 方式: {self.mode} | 缩小倍数: {self.scale} | 空闲暂停: {self.idle_timeout}s")
+
+    def stop(self) -> None:
+        """停止解码线程"""
+        self._stop_event.set()
+        self._requested.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def acquire(self, max_age: Optional[float] = None, timeout: Optional[float] = None) -> Frame:
+        """
+        获取最新的已解码帧，解码线程暂停过或尚无已解码帧时等待一次新的解码
+
+        Args:
+            max_age: 可接受的最大帧龄(秒)，最新帧更旧时等待新帧，超时则使用最新帧；None 表示直接使用最新帧
+            timeout: 等待解码的超时时间(秒)
+
+        Returns:
+            Frame: data 为只读图像数组，timestamp 与 scale 取自原始 JPEG 帧
+
+        Raises:
+            FrameTimeoutError: 尚无已解码帧且等待超时时抛出
+        """
+        seen = self.slot.seq
+        resuming = self._paused
+        self._last_request = time.monotonic()
+        self._requested.set()
+
+        frame = self.slot.latest()
+        if frame is None or resuming:
+            # 暂停期间画面可能已变化，不使用暂停前解码的帧
+            return self.slot.wait_newer_than(seen, timeout)
+
+        if max_age is not None and frame.age > max_age:
+            try:
+                frame = self.slot.wait_newer_than(frame.seq, timeout)
+            except FrameTimeoutError:
+                logger.debug(f"等待新解码帧超时，画面可能未变化，使用最新帧 | 帧龄: {frame.age:.3f}s")
+        return frame
+
+    def stats(self) -> Dict[str, Union[int, float, bool]]:
+        """获取解码统计信息"""
+        with self._lock:
+            self._trim_decode_times(time.monotonic())
+            costs = [cost for _, cost in self._decode_times]
+            return {
+                'decoded': self.decoded,
+                'dropped': self.dropped,
+                'decoded_fps': len(costs) / MINICAP_DECODE_FPS_WINDOW,
+                'decode_time': sum(costs) / len(costs) if costs else 0.0,
+                'paused': self._paused,
+            }
+
+    def reset_stats(self) -> None:
+        """重置解码统计信息"""
+        with self._lock:
+            self.decoded = self.dropped = 0
+            self._decode_times.clear()
+
+    def _run(self) -> None:
+        """解码循环：等待新的 JPEG 帧，只解码最新一帧"""
+        last_seq = max(self.source.slot.seq - 1, 0)
+        while not self._stop_event.is_set():
+            if self._is_idle():
+                self._wait_request()
+                last_seq = max(self.source.slot.seq - 1, last_seq)  # 暂停期间跳过的帧不计入丢帧，恢复后立即解码最新帧
+                continue
+
+            try:
+                frame = self.source.wait_newer_than(last_seq, MINICAP_DECODE_POLL_INTERVAL)
+            except FrameTimeoutError:
+                continue
+
+            skipped, last_seq = frame.seq - last_seq - 1, frame.seq
+            start = time.perf_counter()
+            try:
+                image = decode_jpeg(frame.data, self.mode, self.scale)
+            except DecodeError as e:
+                logger.warning(f"后台解码失败，跳过该帧 | 序号: {frame.seq} | {e}")
+                self._count(skipped + 1)
+                continue
+
+            if not self.source.is_intact(frame):
+                self._count(skipped + 1)
+                continue
+
+            image.flags.writeable = False  # 多个调用方共享同一帧，禁止原地修改
+            self.slot.publish(image, frame.timestamp, frame.scale)
+            self._count(skipped, decode_time=time.perf_counter() - start)
+
+    def _is_idle(self) -> bool:
+        """判断是否超过空闲时间无人取帧"""
+        return self.idle_timeout is not None and time.monotonic() - self._last_request > self.idle_timeout
+
+    def _wait_request(self) -> None:
+        """暂停解码直到下次取帧或停止"""
+        self._requested.clear()
+        if not self._is_idle():  # 清除前刚好有取帧请求
+            return
+        self._paused = True
+        logger.debug("空闲超时，后台解码暂停")
+        self._requested.wait()
+        self._paused = False
+
+    def _count(self, dropped: int, decode_time: Optional[float] = None) -> None:
+        """更新解码统计，decode_time 为本次解码耗时(秒)，None 表示未完成解码"""
+        if self.capture_stats is not None:
+            if dropped:
+                self.capture_stats.record_dropped(dropped)
+            if decode_time is not None:
+                self.capture_stats.record_decode(decode_time)
+        with self._lock:
+            self.dropped += dropped
+            if decode_time is not None:
+                now = time.monotonic()
+                self.decoded += 1
+                self._decode_times.append((now, decode_time))
+                self._trim_decode_times(now)
+
+    def _trim_decode_times(self, now: float) -> None:
+        """移除统计窗口之外的解码时间"""
+        while self._decode_times and now - self._decode_times[0][0] > MINICAP_DECODE_FPS_WINDOW:
+            self._decode_times.popleft()
@@ -0,0 +1,327 @@
+"""
+共享内存帧总线模块
+一个截图进程将解码后的帧写入 multiprocessing.shared_memory 中按序号轮换的环形帧槽，其他进程附加后
+直接在共享内存上读取最新帧的 NumPy 视图，无需各自建立数据流或经队列序列化传输帧。
+
+内存布局：64 字节总线头(魔数、版本、槽数、关闭标记、槽容量、最新帧序号) + N 个帧槽，
+每个帧槽为 64 字节槽头(帧序号、接收时间、缩放率、高、宽、通道数) + 图像数据。
+写入方先将槽头序号置 0，写完数据与元信息后再写入帧序号(顺序锁)，读取方读取前后序号一致才视为完整。
+"""
+import os
+import re
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from autosnapmanager.screencaps.frame_pump import FramePump
+from autosnapmanager.screencaps.frame_slot import Frame, FrameTimeoutError
+from autosnapmanager.screencaps.screencap_config import (
+    FRAME_BUS_PREFIX, FRAME_BUS_SLOTS, FRAME_BUS_POLL_INTERVAL, FRAME_BUS_READ_RETRIES, FRAME_BUS_WAIT_TIMEOUT
+)
+from autosnapmanager.utils.logger import logger
+
+MAGIC = b'ASMB'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIQQ')  # 魔数, 版本, 槽数, 关闭标记, 槽容量, 最新帧序号
+HEADER_SIZE = 64
+CLOSED_OFFSET = 12
+LATEST_OFFSET = 24
+SLOT_HEADER = struct.Struct('<QddIII')  # 帧序号(0 表示正在写入), 接收时间, 缩放率, 高, 宽, 通道数(0 表示单通道二维)
+SLOT_HEADER_SIZE = 64
+SEQ = struct.Struct('<Q')
+
+
+class FrameBusError(Exception):
+    """帧总线错误"""
+    pass
+
+
+class FrameBusClosedError(FrameBusError):
+    """发布方已关闭帧总线"""
+    pass
+
+
+def frame_bus_name(serial: str) -> str:
+    """按设备序列号生成共享内存名称，如 127.0.0.1:16384 -> asm_frame_bus_127_0_0_1_16384"""
+    return FRAME_BUS_PREFIX + re.sub(r'[^0-9A-Za-z]', '_', serial)
+
+
+def _slot_stride(capacity: int) -> int:
+    """帧槽间距，数据区按 64 字节对齐"""
+    return SLOT_HEADER_SIZE + (capacity + 63) // 64 * 64
+
+
+class FrameBusPublisher:
+    """
+    帧总线发布方
+
+    可直接调用 publish 写入帧，也可调用 start 由发布线程持续从截图对象取帧写入。
+    共享内存在首次写入时按帧大小(或指定的槽容量)创建，close 时删除。未指定槽容量时，帧变大(如窗口被放大)后
+    按新的帧大小重新创建共享内存，读取方经 FrameBusClosedError 重新附加。
+    """
+
+    def __init__(self, name: str, capacity: Optional[int] = None, slots: int = FRAME_BUS_SLOTS):
+        """
+        初始化帧总线发布方
+
+        Args:
+            name: 共享内存名称，如 frame_bus_name(serial)
+            capacity: 每个帧槽的容量(字节)，None 表示按首帧大小，之后帧变大时自动扩容
+            slots: 环形帧槽数量，读取方的视图在其后第 slots-1 帧开始写入前有效
+        """
+        if slots < 2:
+            raise ValueError(f"帧槽数量至少为 2: {slots}")
+
+        self.name = name
+        self.capacity = capacity
+        self.fixed_capacity = capacity is not None
+        self.slots = slots
+        self.seq = 0
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._pump: Optional[FramePump] = None
+
+    def publish(self, image: np.ndarray, scale: float = 1.0, timestamp: Optional[float] = None) -> int:
+        """
+        写入一帧
+
+        Args:
+            image: uint8 图像数组(高x宽x通道，或高x宽灰度)
+            scale: 帧相对设备屏幕坐标的缩放率
+            timestamp: 帧接收时的 time.monotonic()，None 表示当前时间
+
+        Returns:
+            int: 帧序号
+
+        Raises:
+            FrameBusError: 当图像超过指定的帧槽容量或格式不受支持时抛出
+        """
+        if image.dtype != np.uint8 or image.ndim not in (2, 3):
+            raise FrameBusError(f"只支持 uint8 的二维或三维图像: {image.dtype} {image.shape}")
+        if self._shm is None:
+            self._create(self.capacity or image.nbytes)
+        if image.nbytes > self.capacity:
+            if self.fixed_capacity:
+                raise FrameBusError(f"图像大小 {image.nbytes} 超过帧槽容量 {self.capacity}")
+            # 标记旧总线关闭后按新的帧大小重新创建，读取方重新附加；帧序号延续
+            logger.warning(f"图像大小 {image.nbytes} 超过帧槽容量 {self.capacity}，重新创建帧总线 | 名称: {self.name}")
+            self._release()
+            self._create(image.nbytes)
+
+        seq = self.seq + 1
+        offset = HEADER_SIZE + (seq - 1) % self.slots * _slot_stride(self.capacity)
+        buf = self._shm.buf
+
+        SEQ.pack_into(buf, offset, 0)  # 标记正在写入
+        target = np.ndarray(image.shape, dtype=np.uint8, buffer=buf, offset=offset + SLOT_HEADER_SIZE)
+        np.copyto(target, image)
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 0
+        SLOT_HEADER.pack_into(buf, offset, 0, time.monotonic() if timestamp is None else timestamp, scale,
+                              height, width, channels)
+        SEQ.pack_into(buf, offset, seq)
+        SEQ.pack_into(buf, LATEST_OFFSET, seq)
+        self.seq = seq
+        return seq
+
+    def start(self, screencap, min_interval: float = 0.0) -> None:
+        """
+        启动发布线程，持续从截图对象取帧写入(取帧方式见 FramePump)；写入失败时关闭帧总线并停止
+
+        Args:
+            screencap: 截图对象，如 MiniCap
+            min_interval: 两次写入的最小间隔(秒)
+        """
+        self.stop()
+        self._pump = FramePump(screencap, self._publish_frame, min_interval, name=f"帧总线发布({self.name})")
+        self._pump.start()
+
+    def stop(self) -> None:
+        """停止发布线程"""
+        if self._pump is not None:
+            self._pump.stop()
+
+    def close(self) -> None:
+        """停止发布线程，标记总线已关闭并删除共享内存"""
+        self.stop()
+        if self._shm is None:
+            return
+        self._release()
+        logger.info(f"帧总线已关闭 | 名称: {self.name}")
+
+    def _release(self) -> None:
+        """标记总线已关闭并删除共享内存，读取方随后得到 FrameBusClosedError"""
+        if self._shm is None:
+            return
+        struct.pack_into('<I', self._shm.buf, CLOSED_OFFSET, 1)
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def _create(self, capacity: int) -> None:
+        """创建共享内存并写入总线头"""
+        self.capacity = capacity
+        size = HEADER_SIZE + self.slots * _slot_stride(capacity)
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            # 上次发布进程异常退出时遗留的共享内存
+            logger.warning(f"帧总线共享内存已存在，重新创建 | 名称: {self.name}")
+            stale = shared_memory.SharedMemory(name=self.name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        HEADER.pack_into(self._shm.buf, 0, MAGIC, VERSION, self.slots, 0, capacity, 0)
+        logger.info(f"帧总线已创建 | 名称: {self.name} | 槽数: {self.slots} | 槽容量: {capacity} 字节")
+
+    def _publish_frame(self, image: np.ndarray, scale: float, timestamp: Optional[float]) -> None:
+        """发布线程的写入函数，失败时关闭帧总线，读取方得到错误而不是一直读取最后一帧"""
+        try:
+            self.publish(image, scale, timestamp)
+        except (FrameBusError, OSError):
+            self._release()
+            raise
+
+
+class FrameBusReader:
+    """
+    帧总线读取方
+
+    latest 返回的 Frame.data 默认为共享内存上的只读视图，在其后第 slots-1 帧开始写入前有效，
+    使用后可用 is_intact 校验；copy=True 时返回校验过的副本。
+    """
+
+    def __init__(self, name: str, timeout: float = FRAME_BUS_WAIT_TIMEOUT):
+        """
+        附加到帧总线，发布方尚未创建共享内存时等待
+
+        Args:
+            name: 共享内存名称
+            timeout: 等待共享内存创建的超时时间(秒)
+
+        Raises:
+            FrameBusError: 当超时仍未创建或格式不匹配时抛出
+        """
+        self.name = name
+        self._shm = self._attach(name, timeout)
+
+        deadline = time.monotonic() + timeout
+        magic, version, self.slots, _, self.capacity, _ = HEADER.unpack_from(self._shm.buf, 0)
+        while magic == bytes(len(MAGIC)) and time.monotonic() < deadline:  # 发布方刚创建，尚未写入总线头
+            time.sleep(FRAME_BUS_POLL_INTERVAL)
+            magic, version, self.slots, _, self.capacity, _ = HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._shm.close()
+            raise FrameBusError(f"共享内存 {name} 不是帧总线或版本不匹配: {magic} v{version}")
+        self._stride = _slot_stride(self.capacity)
+
+    @property
+    def seq(self) -> int:
+        """最新帧序号，尚无帧时为 0"""
+        return SEQ.unpack_from(self._shm.buf, LATEST_OFFSET)[0]
+
+    @property
+    def closed(self) -> bool:
+        """发布方是否已关闭总线"""
+        return struct.unpack_from('<I', self._shm.buf, CLOSED_OFFSET)[0] == 1
+
+    def latest(self, copy: bool = False) -> Optional[Frame]:
+        """
+        读取最新帧
+
+        Args:
+            copy: 是否返回副本，False 时返回共享内存上的只读视图
+
+        Returns:
+            Optional[Frame]: 最新帧，尚无帧时为 None
+
+        Raises:
+            FrameBusClosedError: 发布方已关闭总线时抛出
+            FrameBusError: 多次重试仍读到正在改写的帧槽时抛出
+        """
+        for _ in range(FRAME_BUS_READ_RETRIES):
+            if self.closed:
+                raise FrameBusClosedError(f"帧总线已关闭: {self.name}")
+            seq = self.seq
+            if seq == 0:
+                return None
+
+            offset = self._slot_offset(seq)
+            slot_seq, timestamp, scale, height, width, channels = SLOT_HEADER.unpack_from(self._shm.buf, offset)
+            if slot_seq != seq:
+                continue  # 帧槽正被改写，重新读取最新帧
+
+            shape = (height, width, channels) if channels else (height, width)
+            image = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset + SLOT_HEADER_SIZE)
+            if copy:
+                image = image.copy()
+            else:
+                image.flags.writeable = False
+            if SEQ.unpack_from(self._shm.buf, offset)[0] == seq:
+                return Frame(data=image, seq=seq, timestamp=timestamp, scale=scale)
+        raise FrameBusError(f"帧槽持续被改写，读取失败: {self.name}")
+
+    def wait_newer_than(self, seq: int, timeout: Optional[float] = None, copy: bool = False) -> Frame:
+        """
+        等待序号大于 seq 的新帧
+
+        Raises:
+            FrameTimeoutError: 超时仍无新帧时抛出
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.seq <= seq:
+            if self.closed:
+                raise FrameBusClosedError(f"帧总线已关闭: {self.name}")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise FrameTimeoutError(f"等待新帧超时 | 序号: {seq} | 超时: {timeout}s")
+            time.sleep(FRAME_BUS_POLL_INTERVAL)
+        return self.latest(copy)
+
+    def is_intact(self, frame: Frame) -> bool:
+        """判断视图所在帧槽是否尚未被新帧改写，使用视图后调用"""
+        return SEQ.unpack_from(self._shm.buf, self._slot_offset(frame.seq))[0] == frame.seq
+
+    def close(self) -> None:
+        """断开共享内存，不删除"""
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.debug(f"仍有帧视图引用共享内存，随进程退出释放 | 名称: {self.name}")
+
+    def _slot_offset(self, seq: int) -> int:
+        return HEADER_SIZE + (seq - 1) % self.slots * self._stride
+
+    @staticmethod
+    def _attach(name: str, timeout: float) -> shared_memory.SharedMemory:
+        """附加到已有的共享内存，尚不存在时等待"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return _open_untracked(name)
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise FrameBusError(f"帧总线 {name} 在 {timeout}s 内未创建")
+                time.sleep(FRAME_BUS_POLL_INTERVAL * 10)
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    附加到已有的共享内存，不注册到 resource_tracker
+
+    Python 3.13 以前 POSIX 下附加方同样会注册，进程退出时会误删发布方的共享内存。
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    if os.name != 'posix':
+        return shared_memory.SharedMemory(name=name)
+
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
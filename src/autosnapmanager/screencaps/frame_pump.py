@@ -0,0 +1,86 @@
+"""
+帧泵模块
+由后台线程持续从任意截图对象取帧并交给写入函数，供帧总线发布与帧录制共用。
+"""
+import inspect
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from autosnapmanager.screencaps.screencap_config import FRAME_PUMP_RETRY_DELAY
+from autosnapmanager.utils.logger import logger
+
+# 写入函数：以 sink(图像, scale=帧相对设备屏幕坐标的缩放率, timestamp=帧接收时的 time.monotonic() 或 None) 调用
+FrameSink = Callable[[np.ndarray, float, Optional[float]], None]
+
+
+class FramePump:
+    """
+    帧泵
+
+    截图对象提供 last_frame 时只写入新帧；screencap 支持 max_age 时以 max_age=0 等待新帧，而不是重复取帧。
+    取帧失败时等待 FRAME_PUMP_RETRY_DELAY 后重试；写入失败时停止，由写入函数负责清理。
+    """
+
+    def __init__(self, screencap, sink: FrameSink, min_interval: float = 0.0, name: str = '帧泵'):
+        """
+        初始化帧泵
+
+        Args:
+            screencap: 截图对象
+            sink: 写入函数
+            min_interval: 两次写入的最小间隔(秒)，用于限制 ADBCap 等拉取式截图的频率
+            name: 日志中的名称
+        """
+        self.screencap = screencap
+        self.sink = sink
+        self.min_interval = min_interval
+        self.name = name
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def running(self) -> bool:
+        """取帧线程是否仍在运行"""
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动取帧线程"""
+        self._thread.start()
+        logger.info(f"{self.name}已启动 | 截图: {self.screencap.__class__.__name__}")
+
+    def stop(self) -> None:
+        """停止取帧线程，在写入函数中调用时只发出停止信号"""
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        """取帧循环"""
+        screencap = self.screencap
+        waits_new_frame = 'max_age' in inspect.signature(screencap.screencap).parameters
+        last_seq = None
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            try:
+                image = screencap.screencap(max_age=0) if waits_new_frame else screencap.screencap()
+            except Exception as e:
+                logger.warning(f"{self.name}取帧失败: {e}")
+                self._stop_event.wait(FRAME_PUMP_RETRY_DELAY)
+                continue
+
+            frame = getattr(screencap, 'last_frame', None)
+            if frame is not None and frame.seq == last_seq:
+                continue  # 画面未变化
+            last_seq = frame.seq if frame is not None else None
+            try:
+                self.sink(image, scale=screencap.frame_scale, timestamp=frame.timestamp if frame is not None else None)
+            except Exception as e:
+                logger.error(f"{self.name}写入失败，已停止: {e}")
+                break
+
+            remaining = self.min_interval - (time.monotonic() - start)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
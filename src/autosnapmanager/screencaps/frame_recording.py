@@ -0,0 +1,265 @@
+"""
+帧录制模块
+将 minicap 数据流中的 JPEG 帧或任意截图对象的图像连同接收时间追加写入带索引的录制文件，供 ReplayCap 离线回放，
+无需连接设备即可复现性能问题或对比匹配算法的改动。
+
+文件布局：16 字节文件头(魔数、版本、录制开始时的 time.time()) + 若干帧记录 + 索引 + 20 字节文件尾。
+每条帧记录为 40 字节记录头(数据长度、相对录制开始的秒数、缩放率、类型、高、宽、通道数) + 数据(JPEG 或原始像素)。
+索引(各帧记录的偏移)与文件尾在 close 时写入；录制未正常关闭时读取方逐条扫描记录头恢复，丢弃不完整的最后一帧。
+"""
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+
+from autosnapmanager.screencaps.frame_pump import FramePump
+from autosnapmanager.screencaps.frame_slot import Frame
+from autosnapmanager.screencaps.screencap_config import RECORDING_SUFFIX
+from autosnapmanager.utils.logger import logger
+
+MAGIC = b'ASMR'
+INDEX_MAGIC = b'ASMI'
+VERSION = 1
+HEADER = struct.Struct('<4sId')  # 魔数, 版本, 录制开始时的 time.time()
+RECORD_HEADER = struct.Struct('<QddIIII')  # 数据长度, 相对录制开始的秒数, 缩放率, 类型, 高, 宽, 通道数(0 表示二维)
+FOOTER = struct.Struct('<QQ4s')  # 索引偏移, 帧数, 魔数
+KIND_JPEG = 0
+KIND_RAW = 1
+
+
+class FrameRecordingError(Exception):
+    """帧录制文件错误"""
+    pass
+
+
+def recording_path(name: str, directory: Optional[str] = None) -> str:
+    """按设备序列号或窗口名称生成录制文件路径，如 127.0.0.1:16384 -> ./127_0_0_1_16384.asmrec"""
+    return os.path.join(directory or os.getcwd(), re.sub(r'[^0-9A-Za-z]', '_', name) + RECORDING_SUFFIX)
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    """录制文件中的一帧"""
+    data: Any  # JPEG 数据(memoryview)或 uint8 图像数组，均为映射文件上的只读视图
+    index: int  # 帧在录制文件中的位置，从 0 开始
+    timestamp: float  # 相对首帧的秒数
+    scale: float  # 帧相对设备屏幕坐标的缩放率
+    encoded: bool  # data 是否为 JPEG 数据
+
+
+class FrameRecorder:
+    """
+    帧录制器
+
+    可直接调用 write 写入帧，也可 attach 到 MiniCap 录制数据流中的原始 JPEG 帧，或调用 start 由录制线程
+    持续从任意截图对象取帧，录制解码后的图像。写入线程安全；close 时写入索引。
+    """
+
+    def __init__(self, path: str):
+        """
+        创建录制文件，已存在时覆盖
+
+        Args:
+            path: 录制文件路径，如 recording_path(serial)
+        """
+        self.path = path
+        self.frames = 0  # 已写入帧数
+        self.bytes = 0  # 已写入的帧数据量(字节)
+
+        self._lock = threading.Lock()
+        self._offsets: List[int] = []
+        self._start = time.monotonic()
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time()))
+        self._offset = HEADER.size
+        self._minicap = None
+        self._pump: Optional[FramePump] = None
+        logger.info(f"帧录制已创建 | 文件: {path}")
+
+    def write(self, data, timestamp: Optional[float] = None, scale: float = 1.0) -> int:
+        """
+        写入一帧
+
+        Args:
+            data: JPEG 数据(bytes、bytearray 或 memoryview)，或 uint8 图像数组(高x宽x通道，或高x宽灰度)
+            timestamp: 帧接收时的 time.monotonic()，None 表示当前时间
+            scale: 帧相对设备屏幕坐标的缩放率
+
+        Returns:
+            int: 已写入帧数
+
+        Raises:
+            FrameRecordingError: 当图像格式不受支持或录制已关闭时抛出
+        """
+        if isinstance(data, np.ndarray):
+            if data.dtype != np.uint8 or data.ndim not in (2, 3):
+                raise FrameRecordingError(f"只支持 uint8 的二维或三维图像: {data.dtype} {data.shape}")
+            payload = np.ascontiguousarray(data)
+            height, width = data.shape[:2]
+            kind, channels, length = KIND_RAW, data.shape[2] if data.ndim == 3 else 0, payload.nbytes
+        else:
+            payload, kind, height, width, channels, length = data, KIND_JPEG, 0, 0, 0, len(data)
+
+        elapsed = (time.monotonic() if timestamp is None else timestamp) - self._start
+        with self._lock:
+            if self._file is None:
+                raise FrameRecordingError("录制已关闭")
+            self._file.write(RECORD_HEADER.pack(length, elapsed, scale, kind, height, width, channels))
+            self._file.write(payload)
+            self._offsets.append(self._offset)
+            self._offset += RECORD_HEADER.size + length
+            self.frames += 1
+            self.bytes += length
+            return self.frames
+
+    def attach(self, minicap) -> None:
+        """
+        录制 MiniCap 数据流中的原始 JPEG 帧(仅流模式)，回放时按 ReplayCap 的解码方式解码
+
+        在数据流读取线程中写入，只多一次写入文件缓存的复制；数据流重建(重连、自适应调节)后继续录制
+
+        Args:
+            minicap: MiniCap 截图对象
+        """
+        self.stop()
+        minicap.add_frame_listener(self._on_frame)
+        self._minicap = minicap
+        logger.info(f"帧录制已附加到数据流 | 设备: {minicap.serial}")
+
+    def start(self, screencap, min_interval: float = 0.0) -> None:
+        """
+        启动录制线程，持续从截图对象取帧并写入图像(取帧方式见 FramePump)
+
+        Args:
+            screencap: 截图对象
+            min_interval: 两次写入的最小间隔(秒)
+        """
+        self.stop()
+        self._pump = FramePump(screencap, self.write, min_interval, name='帧录制')
+        self._pump.start()
+
+    def stop(self) -> None:
+        """停止录制线程或从数据流分离，文件保持打开"""
+        if self._minicap is not None:
+            self._minicap.remove_frame_listener(self._on_frame)
+            self._minicap = None
+        if self._pump is not None:
+            self._pump.stop()
+
+    def close(self) -> None:
+        """停止录制，写入索引并关闭文件"""
+        self.stop()
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(np.asarray(self._offsets, dtype='<u8').tobytes())
+            self._file.write(FOOTER.pack(self._offset, len(self._offsets), INDEX_MAGIC))
+            self._file.close()
+            self._file = None
+        logger.info(f"帧录制已关闭 | 文件: {self.path} | 帧数: {self.frames} | 数据量: {self.bytes} 字节")
+
+    def _on_frame(self, frame: Frame) -> None:
+        """数据流帧监听回调"""
+        self.write(frame.data, frame.timestamp, frame.scale)
+
+
+class FrameRecording:
+    """
+    帧录制文件读取类
+
+    以只读方式映射整个文件，帧数据为映射上的视图，不复制；视图在 close 后仍可使用，映射随最后一个视图释放。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开录制文件
+
+        Args:
+            path: 录制文件路径
+
+        Raises:
+            FrameRecordingError: 当文件格式无效或没有帧时抛出
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise FrameRecordingError(f"无效的录制文件: {path}")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.created = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise FrameRecordingError(f"无效的录制文件: {path} | 魔数: {magic} | 版本: {version}")
+
+        self._offsets = self._load_index(size)
+        if not len(self._offsets):
+            self._mmap.close()
+            raise FrameRecordingError(f"录制文件中没有帧: {path}")
+
+        times = np.array([RECORD_HEADER.unpack_from(self._mmap, int(offset))[1] for offset in self._offsets])
+        self.timestamps = times - times[0]  # 各帧相对首帧的秒数
+        self._view = memoryview(self._mmap)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        for index in range(len(self)):
+            yield self.frame(index)
+
+    @property
+    def duration(self) -> float:
+        """首帧到末帧的秒数"""
+        return float(self.timestamps[-1])
+
+    def frame(self, index: int) -> RecordedFrame:
+        """
+        读取一帧
+
+        Args:
+            index: 帧位置，从 0 开始
+
+        Returns:
+            RecordedFrame: 帧数据为映射文件上的只读视图
+        """
+        offset = int(self._offsets[index])
+        length, _, scale, kind, height, width, channels = RECORD_HEADER.unpack_from(self._mmap, offset)
+        start = offset + RECORD_HEADER.size
+        if kind == KIND_JPEG:
+            data = self._view[start:start + length]
+        else:
+            shape = (height, width, channels) if channels else (height, width)
+            data = np.frombuffer(self._mmap, dtype=np.uint8, count=length, offset=start).reshape(shape)
+        return RecordedFrame(data, index, float(self.timestamps[index]), scale, kind == KIND_JPEG)
+
+    def close(self) -> None:
+        """关闭映射，仍有帧视图在使用时映射随其释放"""
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            logger.debug(f"录制文件仍有帧视图在使用，映射随其释放 | 文件: {self.path}")
+
+    def _load_index(self, size: int) -> np.ndarray:
+        """读取文件尾的索引，没有索引时逐条扫描记录头"""
+        if size >= HEADER.size + FOOTER.size:
+            index_offset, count, magic = FOOTER.unpack_from(self._mmap, size - FOOTER.size)
+            if magic == INDEX_MAGIC and index_offset + count * 8 == size - FOOTER.size:
+                return np.frombuffer(self._mmap, dtype='<u8', count=count, offset=index_offset).copy()
+
+        offsets, offset = [], HEADER.size
+        while offset + RECORD_HEADER.size <= size:
+            length = RECORD_HEADER.unpack_from(self._mmap, offset)[0]
+            if offset + RECORD_HEADER.size + length > size:
+                break
+            offsets.append(offset)
+            offset += RECORD_HEADER.size + length
+        logger.warning(f"录制文件没有索引(录制未正常关闭)，已扫描恢复 {len(offsets)} 帧 | 文件: {self.path}")
+        return np.asarray(offsets, dtype='<u8')
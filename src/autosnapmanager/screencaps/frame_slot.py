@@ -0,0 +1,88 @@
+"""
+最新帧槽模块
+生产者发布帧时替换槽中的帧并递增序号，读取方无需等待即可获得最新帧，需要新帧时按序号等待
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+class FrameTimeoutError(TimeoutError):
+    """等待帧超时"""
+    pass
+
+
+@dataclass(frozen=True)
+class Frame:
+    """带序号与接收时间的帧"""
+    data: Any  # 帧数据(JPEG 字节、图像数组等)
+    seq: int  # 单调递增的帧序号，从 1 开始
+    timestamp: float  # 接收完成时的 time.monotonic()
+    scale: float = 1.0  # 帧相对设备屏幕坐标的缩放率，如 minicap 投影缩小时为 虚拟尺寸/真实尺寸
+
+    @property
+    def age(self) -> float:
+        """帧自接收以来经过的秒数"""
+        return time.monotonic() - self.timestamp
+
+
+class FrameSlot:
+    """只保存最新一帧的槽，读取最新帧不加锁，等待新帧时使用条件变量"""
+
+    def __init__(self):
+        self._frame: Optional[Frame] = None
+        self._seq = 0
+        self._condition = threading.Condition(threading.Lock())
+
+    @property
+    def seq(self) -> int:
+        """最新帧的序号，尚无帧时为 0"""
+        return self._seq
+
+    def publish(self, data: Any, timestamp: Optional[float] = None, scale: float = 1.0) -> Frame:
+        """
+        发布新帧并唤醒等待方
+
+        Args:
+            data: 帧数据
+            timestamp: 接收时间，None 表示当前 time.monotonic()
+            scale: 帧相对设备屏幕坐标的缩放率
+
+        Returns:
+            Frame: 发布的帧
+        """
+        with self._condition:
+            self._seq += 1
+            frame = Frame(data=data, seq=self._seq, timestamp=time.monotonic() if timestamp is None else timestamp,
+                          scale=scale)
+            self._frame = frame
+            self._condition.notify_all()
+        return frame
+
+    def latest(self) -> Optional[Frame]:
+        """立即返回最新帧，尚无帧时返回 None"""
+        return self._frame
+
+    def wait_newer_than(self, seq: int, timeout: Optional[float] = None) -> Frame:
+        """
+        等待序号大于 seq 的帧
+
+        Args:
+            seq: 已见过的帧序号，0 表示等待任意帧
+            timeout: 超时时间(秒)，None 表示一直等待
+
+        Returns:
+            Frame: 序号大于 seq 的最新帧
+
+        Raises:
+            FrameTimeoutError: 超时仍无新帧时抛出
+        """
+        frame = self._frame
+        if frame is not None and frame.seq > seq:
+            return frame
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._seq > seq, timeout):
+                raise FrameTimeoutError(f"等待新帧超时 | 序号: {seq} | 超时: {timeout}s")
+            return self._frame
@@ -0,0 +1,173 @@
+import time
+from typing import Optional
+
+import numpy as np
+
+from autosnapmanager.screencaps.decode_worker import decode_jpeg, check_decode_options
+from autosnapmanager.screencaps.frame_recording import FrameRecording, recording_path
+from autosnapmanager.screencaps.frame_slot import Frame
+from autosnapmanager.screencaps.screencap import ScreenCap
+
+
+class ReplayFinishedError(Exception):
+    """录制文件已回放完毕"""
+    pass
+
+
+class ReplayCap(ScreenCap):
+    """
+    回放截图类，从 FrameRecorder 录制的文件读取帧，无需连接设备
+
+    realtime 为 True 时按录制节奏回放(首次截图时开始计时)，与实时数据流一样只返回当前时刻的最新帧；
+    为 False 时每次截图依次返回下一帧，结果与调用耗时无关，适合对整个自动化流程做可复现的基准测试。
+    JPEG 帧按 decode/decode_scale 解码，原始图像帧直接返回映射文件上的只读视图。
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            serial: Optional[str] = None,
+            window_name: Optional[str] = None,
+            realtime: bool = True,
+            speed: float = 1.0,
+            loop: bool = False,
+            decode: str = 'rgb',
+            decode_scale: int = 1
+    ):
+        """
+        初始化回放截图对象
+
+        Args:
+            path: 录制文件路径，None 表示按 recording_path(serial 或 window_name) 确定
+            serial: 设备序列号，Manager 以字符串 'replay' 创建时传入
+            window_name: 窗口名称，Manager 以字符串 'replay' 创建时传入
+            realtime: 是否按录制节奏回放；False 表示每次截图返回下一帧
+            speed: 按录制节奏回放时的倍速
+            loop: 回放完毕后是否从头循环；False 时抛出 ReplayFinishedError
+            decode: JPEG 帧的解码方式，'rgb' 或 'gray'
+            decode_scale: JPEG 帧的解码缩小倍数(1/2/4/8)
+
+        Raises:
+            ValueError: 当未指定录制文件、倍速或解码参数无效时抛出
+            FrameRecordingError: 当录制文件无效或没有帧时抛出
+        """
+        name = serial or window_name
+        if path is None and name is None:
+            raise ValueError("需要指定录制文件路径、设备序列号或窗口名称")
+        if speed <= 0:
+            raise ValueError(f"无效的回放倍速: {speed}")
+        check_decode_options(decode, decode_scale)
+
+        self.path = path or recording_path(name)
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self.decode = decode
+        self.decode_scale = decode_scale
+        self.recording = FrameRecording(self.path)
+        self.last_frame: Optional[Frame] = None  # 最近一次 screencap 使用的帧，data 为录制数据
+
+        count = len(self.recording)
+        # 循环周期：首帧到末帧的时长再加一个平均帧间隔，末帧与下一轮首帧不重合
+        self._period = self.recording.duration * count / (count - 1) if count > 1 else 0.0
+        self._position = -1  # 已回放到的帧位置(跨轮次累计)
+        self._clock: Optional[float] = None  # 首帧对应的 time.monotonic()
+
+    @property
+    def frame_age(self) -> Optional[float]:
+        """最近一次 screencap 所用帧自回放到达以来经过的秒数，尚未截图时为 None"""
+        return self.last_frame.age if self.last_frame is not None else None
+
+    @property
+    def frame_scale(self) -> float:
+        """截图相对设备屏幕坐标的缩放率，取自录制的帧信息，JPEG 帧再除以 decode_scale"""
+        frame = self.recording.frame(max(self._position, 0) % len(self.recording))
+        return frame.scale / self.decode_scale if frame.encoded else frame.scale
+
+    def screencap(self, max_age: Optional[float] = None) -> np.ndarray:
+        """
+        读取回放帧
+
+        Args:
+            max_age: 按录制节奏回放时可接受的最大帧龄(秒)，当前帧更旧时等待录制中的下一帧；None 表示直接使用当前帧
+
+        Returns:
+            np.ndarray: 图像数组，JPEG 帧按解码方式解码，原始图像帧为只读视图
+
+        Raises:
+            ReplayFinishedError: 未开启循环且录制已回放完毕时抛出
+        """
+        start = time.perf_counter()
+        now = time.monotonic()
+        if self._clock is None:
+            self._clock = now
+
+        if self.realtime:
+            position = self._realtime_position(now)
+            if max_age is not None and now - self._arrival(position) > max_age and self._has_frame(position + 1):
+                time.sleep(max(self._arrival(position + 1) - now, 0))
+                position += 1
+            arrival = self._arrival(position)
+        else:
+            position = self._position + 1
+            if not self._has_frame(position):
+                raise ReplayFinishedError(f"录制已回放完毕 | 帧数: {len(self.recording)}")
+            arrival = now
+
+        recorded = self.recording.frame(position % len(self.recording))
+        if position != self._position:
+            self.capture_stats.record_received(len(recorded.data) if recorded.encoded else recorded.data.nbytes,
+                                               arrival)
+        self._position = position
+
+        if recorded.encoded:
+            decode_start = time.perf_counter()
+            image = decode_jpeg(recorded.data, self.decode, self.decode_scale)
+            self.capture_stats.record_decode(time.perf_counter() - decode_start)
+        else:
+            image = recorded.data
+
+        self.last_frame = Frame(data=recorded.data, seq=position + 1, timestamp=arrival, scale=recorded.scale)
+        self.capture_stats.record_delivered(time.perf_counter() - start, position + 1)
+        return image
+
+    def rewind(self) -> None:
+        """回到首帧，按录制节奏回放时在下次截图时重新计时"""
+        self._position = -1
+        self._clock = None
+        self.last_frame = None
+
+    def close(self) -> None:
+        """关闭录制文件"""
+        self.last_frame = None
+        self.recording.close()
+
+    def _last_jpeg(self) -> Optional[bytes]:
+        """最近一次截图录制的原始 JPEG 数据，原始图像帧为 None"""
+        data = self.last_frame.data if self.last_frame is not None else None
+        return None if data is None or isinstance(data, np.ndarray) else bytes(data)
+
+    def _has_frame(self, position: int) -> bool:
+        """帧位置是否仍在回放范围内"""
+        return self.loop or position < len(self.recording)
+
+    def _arrival(self, position: int) -> float:
+        """帧位置按录制节奏到达的 time.monotonic()"""
+        laps, index = divmod(position, len(self.recording))
+        return self._clock + (laps * self._period + self.recording.timestamps[index]) / self.speed
+
+    def _realtime_position(self, now: float) -> int:
+        """按录制节奏计算当前时刻的帧位置"""
+        elapsed, laps = (now - self._clock) * self.speed, 0
+        if self._period > 0 and elapsed >= self._period:
+            if not self.loop:
+                raise ReplayFinishedError(f"录制已回放完毕 | 时长: {self.recording.duration:.2f}s")
+            laps, elapsed = divmod(elapsed, self._period)
+        index = int(np.searchsorted(self.recording.timestamps, elapsed, side='right')) - 1
+        return max(int(laps) * len(self.recording) + index, self._position)
+
+
+if __name__ == "__main__":
+    cap = ReplayCap(serial="127.0.0.1:16384", realtime=False)
+    cap.save_screencap()
+    cap.close()
@@ -1,11 +1,9 @@
-import os
 from abc import ABC, abstractmethod
-import cv2
+from typing import Dict, Optional
 import numpy as np
-from autosnapmanager.utils.process_file_tools import check_path
-from autosnapmanager.utils.process_image_tools import check_image_array
 from autosnapmanager.utils.logger import logger
-from autosnapmanager.screencaps.screencap_config import NOW_TIME
+from autosnapmanager.screencaps.capture_stats import CaptureStats
+from autosnapmanager.screencaps.screenshot_writer import ScreenshotWriter, ScreenshotJob, default_screenshot_writer
 
 
 class ScreenCap(ABC):
@@ -20,37 +18,74 @@ class ScreenCap(ABC):
             np.ndarray: RGB格式的图像数组
         """
 
-    def save_screencap(self, img: np.ndarray = None, save_path: str = None) -> None:
+    def save_screencap(self, img: np.ndarray = None, save_path: str = None, wait: bool = False) -> ScreenshotJob:
         """
-        保存屏幕截图
+        保存屏幕截图，编码与写入由后台线程 screenshot_writer 完成；未指定 img 时若截图带有原始 JPEG 数据
+        (如 MiniCap)，直接写入原始 JPEG
 
         Args:
-            img (np.ndarray): 要保存的图像数组(RGB格式，3通道)
-            save_path (str): 保存路径
+            img (np.ndarray): 要保存的图像数组(RGB格式3通道，或单通道灰度)，None 表示当前截图
+            save_path (str): 保存目录，None 表示当前工作目录
+            wait (bool): 是否等待本张截图处理完成
+
+        Returns:
+            ScreenshotJob: 保存结果，path 为截图文件路径；队列已满时可能按丢弃策略被丢弃，是否写入以 wait() 为准
 
         Raises:
             RuntimeError: 当保存截图失败时抛出
         """
         try:
-            img = self.screencap() if img is None else img
-
-            check_image_array(img, channels=3, dtype=np.uint8)
-
-            if save_path is None:
-                save_path = os.getcwd()
-            check_path(save_path)
-
-            img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-            save_filename = f"{save_path}\\{self.class_name}_{NOW_TIME}.png"
+            jpeg = None
+            if img is None:
+                img = self.screencap()
+                jpeg = self._last_jpeg()
 
-            logger.info(f"图片已保存至：{save_filename}") \
-                if cv2.imwrite(save_filename, img_bgr) \
-                else logger.info(f"路径识别错误：{save_filename}")
+            job = self.screenshot_writer.submit(img, save_path, self.class_name, jpeg)
+            if wait:
+                job.wait()
+            return job
 
         except Exception as e:
             logger.error(f"保存截图失败: {str(e)}")
             raise RuntimeError(f"无法保存截图: {str(e)}")
 
+    @property
+    def screenshot_writer(self) -> ScreenshotWriter:
+        """
+        后台截图保存，默认为进程内共用的 default_screenshot_writer()(png)，不随截图对象创建线程；
+        可替换为其他格式或丢弃策略的实例，替换的实例由调用方负责 close
+        """
+        writer = self.__dict__.get('_screenshot_writer')
+        return writer if writer is not None else default_screenshot_writer()
+
+    @screenshot_writer.setter
+    def screenshot_writer(self, writer: ScreenshotWriter) -> None:
+        self.__dict__['_screenshot_writer'] = writer
+
+    def _last_jpeg(self) -> Optional[bytes]:
+        """最近一次截图的原始 JPEG 数据，供保存时直接写入；没有时为 None"""
+        return None
+
+    @property
+    def capture_stats(self) -> CaptureStats:
+        """截图统计，首次访问时创建"""
+        stats = self.__dict__.get('_capture_stats')
+        if stats is None:
+            stats = self.__dict__.setdefault('_capture_stats', CaptureStats())
+        return stats
+
+    def stats(self) -> Dict:
+        """
+        截图统计快照：接收/交付帧率、丢帧数、数据速率、截图与解码耗时百分位数以及最近一帧的帧龄，
+        开销很小，可由监控线程每秒轮询
+        """
+        return self.capture_stats.snapshot()
+
+    @property
+    def frame_scale(self) -> float:
+        """截图相对设备屏幕坐标的缩放率，截图上的坐标除以该值即为屏幕坐标"""
+        return 1.0
+
     @property
     def class_name(self):
         """返回子类的类名，用于构造保存的文件名。"""
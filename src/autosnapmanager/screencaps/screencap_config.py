@@ -16,13 +16,70 @@ PORT_SET = set(range(20000, 21000))
 # operation
 DEFAULT_BUFFER_SIZE = 1024
 
+# STATS
+CAPTURE_STATS_WINDOW = 2  # 截图统计计算帧率与数据速率的时间窗口(秒)
+CAPTURE_STATS_SAMPLES = 256  # 截图统计计算耗时百分位数时保留的最近样本数
+
+# FRAME PUMP
+FRAME_PUMP_RETRY_DELAY = 0.5  # 帧总线发布、帧录制等取帧线程截图失败后重试前的等待时间(秒)
+
+# FRAME BUS
+FRAME_BUS_PREFIX = "asm_frame_bus_"  # 按设备序列号命名共享内存时的前缀
+FRAME_BUS_SLOTS = 4  # 共享内存环形帧槽数量，帧在其后第 N-1 帧开始写入前保持有效
+FRAME_BUS_POLL_INTERVAL = 0.002  # 读取方等待新帧的轮询间隔(秒)
+FRAME_BUS_READ_RETRIES = 8  # 读取时帧槽正被改写的重试次数
+FRAME_BUS_WAIT_TIMEOUT = 5  # 读取方等待共享内存创建或首帧的超时时间(秒)
+
+# RECORDING
+RECORDING_SUFFIX = ".asmrec"  # 帧录制文件扩展名
+
+# SCREENSHOT
+SCREENSHOT_FORMATS = ('png', 'jpg', 'webp', 'raw')  # 截图保存格式，raw 为 .npy 原始像素
+SCREENSHOT_DROP_POLICIES = ('drop_oldest', 'drop_newest', 'block')  # 队列已满时丢弃最旧/丢弃新截图/等待
+SCREENSHOT_QUEUE_SIZE = 8  # 后台保存队列长度，限制待写入截图占用的内存
+SCREENSHOT_QUALITY = 95  # jpg / webp 编码质量(1-100)
+SCREENSHOT_PNG_COMPRESSION = 1  # png 压缩级别(0-9)，级别越高文件越小、编码越慢
+
+# ADBCAP
+ADBCAP_MODES = ('png', 'raw')  # png: screencap -p 后 PIL 解码；raw: exec:screencap 原始像素
+ADBCAP_RAW_BYTES_PER_PIXEL = {1: 4, 2: 4, 3: 3, 4: 2, 5: 4}  # screencap 像素格式 -> 每像素字节数
+ADBCAP_RAW_HEADER_SIZES = (12, 16)  # 宽、高、格式(Android 9+ 另有 4 字节色彩空间)
+ADBCAP_RAW_COMPRESS_COMMAND = "screencap | gzip -1"  # 压缩模式下的设备端命令，网络 adb 时可减少传输量
+ADBCAP_RECV_CHUNK = 256 * 1024  # 压缩模式下每次读取的字节数
+ADBCAP_TIMEOUT = 10  # raw 模式读取超时时间(秒)
+
 # MINICAP
 MINICAP_PATH = rf"{WORK_DIR}\android\bin\minicap\libs"
 MINICAPSO_PATH = rf"{WORK_DIR}\android\bin\minicap\jni"
 MINICAP_REMOTE_HOME = "/data/local/tmp/minicap"
 MINICAPSO_REMOTE_HOME = "/data/local/tmp/minicap.so"
 MINITOUCH_REMOTE_ADDR = "localabstract:minicap"
-MINICAP_SERVER_START_DELAY = 3
+MINICAP_START_TIMEOUT = 10  # 等待 minicap 服务就绪的期限(秒)，服务就绪即返回
+MINICAP_BANNER_SIZE = 24  # 1+1+(4*5)+1+1
+MINICAP_FRAME_HEADER_SIZE = 4
+MINICAP_FRAME_BUFFERS = 3  # 帧缓冲区数量，按帧序号轮换，帧在其后第 N-1 帧开始写入前保持有效
+MINICAP_FIRST_FRAME_TIMEOUT = 5  # 未指定超时时间时，等待首帧的超时时间(秒)
+MINICAP_DECODE_RETRIES = 3  # 解码期间帧缓冲区被覆盖时的重试次数
+MINICAP_BUFFER_HEADROOM = 1.25  # 帧缓冲区扩容时预留的余量，避免帧大小小幅波动时反复分配
+MINICAP_DECODE_MODES = ('rgb', 'gray')  # JPEG 解码输出：RGB 三通道 / 单通道灰度
+MINICAP_DECODE_SCALES = (1, 2, 4, 8)  # JPEG 在 DCT 域缩小解码的倍数
+MINICAP_DECODE_IDLE_TIMEOUT = 5  # 后台解码的默认空闲时间(秒)，超过该时间无人截图时暂停解码
+MINICAP_DECODE_POLL_INTERVAL = 0.2  # 后台解码等待新帧的轮询间隔(秒)，决定停止与空闲检测的响应时间
+MINICAP_DECODE_FPS_WINDOW = 2  # 统计解码帧率的时间窗口(秒)
+MINICAP_GOVERNOR_INTERVAL = 2  # 自适应调节的评估间隔(秒)
+MINICAP_GOVERNOR_WINDOW = 6  # 统计取帧帧率与解码耗时的时间窗口(秒)
+MINICAP_GOVERNOR_RATE_RANGE = (2, 60)  # 自适应调节的帧率范围
+MINICAP_GOVERNOR_QUALITY_RANGE = (50, 100)  # 自适应调节的 JPEG 质量范围
+MINICAP_GOVERNOR_QUALITY_STEP = 10  # 每次调节 JPEG 质量的步长
+MINICAP_GOVERNOR_HEADROOM = 1.5  # 目标帧率 = 取帧帧率 * 余量，避免取帧时总要等待新帧
+MINICAP_GOVERNOR_DECODE_BUDGET = 0.5  # 解码耗时占帧间隔的比例上限，超过时降低质量并开启 -S 跳帧
+MINICAP_GOVERNOR_RATE_TOLERANCE = 0.25  # 目标帧率与当前帧率的相对差不超过该比例时不重启
+MINICAP_GOVERNOR_COOLDOWN = 10  # 两次重启 minicap 的最小间隔(秒)，重启期间数据流会中断约 1 秒
+MINICAP_GOVERNOR_HISTORY = 20  # 保留的调节记录数
+MINICAP_SUPERVISOR_INTERVAL = 0.5  # 数据流健康检查间隔(秒)
+MINICAP_RECONNECT_TIMEOUT = 15  # 数据流中断后截图等待恢复的期限(秒)，超过时抛出超时错误
+MINICAP_RECONNECT_DELAY = 0.5  # 重连失败后首次重试前的等待时间(秒)
+MINICAP_RECONNECT_MAX_DELAY = 5  # 重连重试间隔上限(秒)
 MINICAP_COMMAND = [
     "LD_LIBRARY_PATH=/data/local/tmp",
     "/data/local/tmp/minicap"
@@ -0,0 +1,303 @@
+"""
+截图保存模块
+调用方只提交截图，颜色转换、编码与写入文件由后台线程完成，不阻塞自动化循环；
+队列有界，写入跟不上时按丢弃策略处理。minicap 等已有 JPEG 数据的截图直接写入原始 JPEG，不解码也不重新编码。
+截图对象默认共用 default_screenshot_writer() 的一个保存线程，自行创建的 ScreenshotWriter 不再使用时应调用 close。
+"""
+import atexit
+import itertools
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+
+from autosnapmanager.screencaps.screencap_config import (
+    SCREENSHOT_FORMATS, SCREENSHOT_DROP_POLICIES, SCREENSHOT_QUEUE_SIZE, SCREENSHOT_QUALITY, SCREENSHOT_PNG_COMPRESSION
+)
+from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.process_file_tools import check_path
+from autosnapmanager.utils.process_image_tools import check_image_array
+
+EXTENSIONS = {'png': '.png', 'jpg': '.jpg', 'webp': '.webp', 'raw': '.npy'}
+
+
+class ScreenshotJob:
+    """
+    一次截图保存的结果
+
+    提交时 status 为 'queued'，保存线程处理后变为 'written'、'failed'，队列已满被丢弃时变为 'dropped'
+    (drop_oldest 策略下已提交的截图可能在之后被更新的截图挤出)。
+    """
+
+    def __init__(self, path: str):
+        self.path = path  # 写入成功时的文件路径
+        self.status = 'queued'
+        self.error: Optional[Exception] = None  # 写入失败时的异常
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """是否已处理完成(写入、失败或被丢弃)"""
+        return self._done.is_set()
+
+    @property
+    def written(self) -> bool:
+        """是否已写入文件"""
+        return self.status == 'written'
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待处理完成
+
+        Args:
+            timeout: 等待期限(秒)，None 表示一直等待
+
+        Returns:
+            bool: 是否已写入文件；被丢弃、写入失败或等待超时时为 False
+        """
+        self._done.wait(timeout)
+        return self.written
+
+    def _finish(self, status: str, error: Optional[Exception] = None) -> None:
+        """记录处理结果"""
+        self.status = status
+        self.error = error
+        self._done.set()
+
+    def __repr__(self) -> str:
+        return f"ScreenshotJob(path={self.path!r}, status={self.status!r})"
+
+
+class ScreenshotWriter:
+    """
+    后台截图保存
+
+    每张截图按 前缀_时间(微秒)_序号 命名，不会互相覆盖。提交的数组在写入前不应修改，
+    共享缓冲区上的视图(如帧总线、录制文件、minicap 帧缓冲区)在提交时复制。
+    """
+
+    def __init__(
+            self,
+            fmt: str = 'png',
+            max_queue: int = SCREENSHOT_QUEUE_SIZE,
+            drop_policy: str = 'drop_oldest',
+            quality: int = SCREENSHOT_QUALITY,
+            passthrough: bool = True
+    ):
+        """
+        初始化截图保存线程
+
+        Args:
+            fmt: 保存格式，'png'、'jpg'、'webp' 或 'raw'(.npy 原始像素)
+            max_queue: 队列长度
+            drop_policy: 队列已满时的处理方式，'drop_oldest' 丢弃最旧的截图，'drop_newest' 丢弃新提交的截图，
+                         'block' 等待队列有空位
+            quality: jpg / webp 编码质量(1-100)
+            passthrough: 提交时带有原始 JPEG 数据的截图是否直接写入 .jpg，不按 fmt 重新编码
+
+        Raises:
+            ValueError: 当格式、丢弃策略或队列长度无效时抛出
+        """
+        if fmt not in SCREENSHOT_FORMATS:
+            raise ValueError(f"不支持的截图格式: {fmt}，可选: {SCREENSHOT_FORMATS}")
+        if drop_policy not in SCREENSHOT_DROP_POLICIES:
+            raise ValueError(f"不支持的丢弃策略: {drop_policy}，可选: {SCREENSHOT_DROP_POLICIES}")
+        if max_queue < 1:
+            raise ValueError(f"队列长度至少为 1: {max_queue}")
+
+        self.fmt = fmt
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+        self.quality = quality
+        self.passthrough = passthrough
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_path: Optional[str] = None  # 最近写入完成的文件
+        self._write_time = 0.0  # 累计编码与写入耗时(秒)
+
+        self._queue = queue.Queue(max_queue)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)  # 解释器退出前写完队列中的截图
+
+    def submit(self, image: Optional[np.ndarray] = None, save_path: Optional[str] = None, prefix: str = 'screenshot',
+               jpeg: Optional[Union[bytes, bytearray, memoryview]] = None) -> ScreenshotJob:
+        """
+        提交一张截图
+
+        Args:
+            image: RGB 三通道或单通道灰度 uint8 图像数组；提供 jpeg 且开启直写时可为 None
+            save_path: 保存目录，None 表示当前工作目录
+            prefix: 文件名前缀，如截图类名
+            jpeg: 截图的原始 JPEG 数据，开启直写时直接写入
+
+        Returns:
+            ScreenshotJob: 保存结果，path 为截图将写入的文件路径；是否真正写入以 wait() 或 status 为准，
+                           队列已满时本次或更早提交的截图可能按丢弃策略被丢弃
+
+        Raises:
+            ValueError: 当图像格式无效或没有可保存的数据时抛出
+            FileNotFoundError: 当保存目录不存在时抛出
+            PermissionError: 当保存目录无写入权限时抛出
+            RuntimeError: 当保存线程已关闭时抛出
+        """
+        if self._closed:
+            raise RuntimeError("截图保存线程已关闭")
+
+        save_path = os.getcwd() if save_path is None else save_path
+        check_path(save_path)
+
+        if jpeg is not None and self.passthrough:
+            data, extension = bytes(jpeg), '.jpg'
+        elif image is not None:
+            check_image_array(image, channels=3 if image.ndim == 3 else None, dtype=np.uint8)
+            data, extension = image.copy() if image.base is not None else image, EXTENSIONS[self.fmt]
+        else:
+            raise ValueError("没有可保存的截图数据")
+
+        name = f"{prefix}_{datetime.now().strftime('%Y-%m-%d_%H_%M_%S_%f')}_{next(self._counter):06d}{extension}"
+        job = ScreenshotJob(os.path.join(save_path, name))
+        self._put((job, data))
+        return job
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待队列中的截图全部写入
+
+        Args:
+            timeout: 等待期限(秒)，None 表示一直等待
+
+        Returns:
+            bool: 是否已全部写入
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """写完队列中的截图并停止保存线程"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+        atexit.unregister(self.flush)
+
+    def stats(self) -> Dict[str, Union[int, float, str, None]]:
+        """队列深度、丢弃策略、提交/写入/丢弃/失败数与平均写入耗时(秒)"""
+        return {
+            'queued': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            'drop_policy': self.drop_policy,
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'write_time': self._write_time / self.written if self.written else 0.0,
+            'last_path': self.last_path,
+        }
+
+    def _put(self, item) -> None:
+        """按丢弃策略入队，被丢弃的截图标记为 'dropped'"""
+        with self._lock:
+            self.submitted += 1
+        if self.drop_policy == 'block':
+            self._queue.put(item)
+            return
+
+        with self._lock:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                if self.drop_policy == 'drop_newest':
+                    self.dropped += 1
+                    item[0]._finish('dropped')
+                    logger.debug(f"截图保存队列已满，丢弃新截图: {item[0].path}")
+                    return
+
+            try:
+                dropped = self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+                dropped[0]._finish('dropped')
+                logger.debug(f"截图保存队列已满，丢弃最旧的截图: {dropped[0].path}")
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(item)
+
+    def _run(self) -> None:
+        """保存循环"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            job, data = item
+            try:
+                start = time.perf_counter()
+                self._write(job.path, data)
+                self._write_time += time.perf_counter() - start
+                self.written += 1
+                self.last_path = job.path
+                job._finish('written')
+                logger.info(f"图片已保存至：{job.path}")
+            except Exception as e:
+                self.failed += 1
+                job._finish('failed', e)
+                logger.error(f"保存截图失败: {job.path} | {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, data: Union[bytes, np.ndarray]) -> None:
+        """编码并写入文件，经 imencode 写入以支持非 ASCII 路径"""
+        if isinstance(data, bytes):
+            encoded = data
+        elif path.endswith('.npy'):
+            with open(path, 'wb') as file:
+                np.save(file, data)
+            return
+        else:
+            image = cv2.cvtColor(data, cv2.COLOR_RGB2BGR) if data.ndim == 3 else data
+            params = {
+                '.png': [cv2.IMWRITE_PNG_COMPRESSION, SCREENSHOT_PNG_COMPRESSION],
+                '.jpg': [cv2.IMWRITE_JPEG_QUALITY, self.quality],
+                '.webp': [cv2.IMWRITE_WEBP_QUALITY, self.quality],
+            }[os.path.splitext(path)[1]]
+            ok, buffer = cv2.imencode(os.path.splitext(path)[1], image, params)
+            if not ok:
+                raise RuntimeError("图像编码失败")
+            encoded = buffer.data
+
+        with open(path, 'wb') as file:
+            file.write(encoded)
+
+
+_default_writer: Optional[ScreenshotWriter] = None
+_default_writer_lock = threading.Lock()
+
+
+def default_screenshot_writer() -> ScreenshotWriter:
+    """进程内所有截图对象共用的默认保存线程(png)，首次调用时创建，解释器退出前写完队列"""
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None:
+            _default_writer = ScreenshotWriter()
+        return _default_writer
@@ -0,0 +1,106 @@
+import time
+from typing import Optional
+
+import numpy as np
+
+from autosnapmanager.screencaps.frame_bus import FrameBusReader, FrameBusClosedError, frame_bus_name
+from autosnapmanager.screencaps.frame_slot import Frame, FrameTimeoutError
+from autosnapmanager.screencaps.screencap import ScreenCap
+from autosnapmanager.screencaps.screencap_config import FRAME_BUS_WAIT_TIMEOUT
+from autosnapmanager.utils.logger import logger
+
+
+class SharedMemoryCap(ScreenCap):
+    """
+    共享内存截图类，从帧总线读取其他进程(FrameBusPublisher)发布的最新帧
+
+    多个工作进程各自创建 SharedMemoryCap，即可在不建立各自数据流的情况下使用同一设备的截图，
+    现有 Manager 代码无需修改。返回的数组默认为经读写校验的副本；copy 为 False 时为共享内存上的只读视图，
+在其后第 slots-1 帧写入前有效，Manager 不会检查视图是否被改写，使用方需在使用后调用 is_intact 校验。
+    """
+
+    def __init__(self, serial: Optional[str] = None, name: Optional[str] = None, copy: bool = True,
+                 timeout: float = FRAME_BUS_WAIT_TIMEOUT):
+        """
+        初始化共享内存截图对象
+
+        Args:
+            serial: 设备序列号，用于按 frame_bus_name(serial) 确定共享内存名称
+            name: 共享内存名称，指定时忽略 serial
+            copy: 是否返回副本；False 时返回零拷贝只读视图，使用后需调用 is_intact 确认未被改写
+            timeout: 等待发布方创建共享内存或发布首帧的超时时间(秒)
+
+        Raises:
+            ValueError: 当 serial 与 name 均未指定时抛出
+            FrameBusError: 当共享内存在超时时间内未创建时抛出
+        """
+        if name is None and serial is None:
+            raise ValueError("需要指定设备序列号或共享内存名称")
+
+        self.name = name or frame_bus_name(serial)
+        self.copy = copy
+        self.timeout = timeout
+        self.reader = FrameBusReader(self.name, timeout)
+        self.last_frame: Optional[Frame] = None  # 最近一次 screencap 使用的帧
+
+    @property
+    def frame_age(self) -> Optional[float]:
+        """最近一次 screencap 所用帧自接收以来经过的秒数，尚未截图时为 None"""
+        return self.last_frame.age if self.last_frame is not None else None
+
+    @property
+    def frame_scale(self) -> float:
+        """截图相对设备屏幕坐标的缩放率，取自发布方写入的帧信息"""
+        return self.last_frame.scale if self.last_frame is not None else 1.0
+
+    def screencap(self, max_age: Optional[float] = None) -> np.ndarray:
+        """
+        读取最新帧
+
+        Args:
+            max_age: 可接受的最大帧龄(秒)，最新帧更旧时等待新帧，超时则使用最新帧；None 表示直接使用最新帧
+
+        Returns:
+            np.ndarray: 发布方写入的图像数组，copy 为 False 时为只读视图
+
+        Raises:
+            FrameTimeoutError: 尚无帧且等待超时时抛出
+            FrameBusError: 发布方已关闭帧总线且超时时间内未重新创建时抛出
+        """
+        start = time.perf_counter()
+        try:
+            frame = self.reader.latest(self.copy)
+        except FrameBusClosedError:
+            # 发布进程重启后重新创建了共享内存，重新附加一次
+            logger.info(f"帧总线已关闭，重新附加 | 名称: {self.name}")
+            self.reader.close()
+            self.reader = FrameBusReader(self.name, self.timeout)
+            frame = self.reader.latest(self.copy)
+        if frame is None:
+            frame = self.reader.wait_newer_than(0, self.timeout, self.copy)
+        elif max_age is not None and frame.age > max_age:
+            try:
+                frame = self.reader.wait_newer_than(frame.seq, self.timeout, self.copy)
+            except FrameTimeoutError:
+                logger.debug(f"等待新帧超时，画面可能未变化，使用最新帧 | 帧龄: {frame.age:.3f}s")
+
+        self.last_frame = frame
+        self.capture_stats.record_delivered(time.perf_counter() - start, frame.seq)
+        return frame.data
+
+    def is_intact(self) -> bool:
+        """最近一次 screencap 返回的数据是否尚未被新帧改写，副本读取时已校验，始终有效"""
+        if self.last_frame is None:
+            return False
+        return self.copy or self.reader.is_intact(self.last_frame)
+
+    def close(self) -> None:
+        """断开帧总线"""
+        self.last_frame = None
+        self.reader.close()
+
+
+if __name__ == "__main__":
+    cap = SharedMemoryCap("127.0.0.1:16384")
+    cap.save_screencap()
+    cap.close()
@@ -1,3 +1,4 @@
+import time
 from ctypes import windll
 from win32gui import GetWindowDC, ReleaseDC, DeleteObject
 from win32ui import CreateDCFromHandle, CreateBitmap
@@ -37,6 +38,7 @@ class FullScreenCap(ScreenCap):
         bitmap = None
 
         try:
+            start = time.perf_counter()
             # 获取屏幕DC
             hwnd_dc = GetWindowDC(0)
             mfc_dc = CreateDCFromHandle(hwnd_dc)
@@ -57,13 +59,19 @@ class FullScreenCap(ScreenCap):
             # 获取位图信息
             bmp_info = bitmap.GetInfo()
             bmp_bits = bitmap.GetBitmapBits(True)
+            self.capture_stats.record_received(len(bmp_bits))
 
             # 转换为numpy数组
+            convert_start = time.perf_counter()
             img_array = np.frombuffer(bmp_bits, dtype=np.uint8).reshape(
                 (bmp_info["bmHeight"], bmp_info["bmWidth"], 4)
             )
             # BGR转RGB并移除alpha通道
-            return img_array[:, :, [2, 1, 0]][:, :, :3]
+            image = img_array[:, :, [2, 1, 0]][:, :, :3]
+            end = time.perf_counter()
+            self.capture_stats.record_decode(end - convert_start)
+            self.capture_stats.record_delivered(end - start)
+            return image
 
         except Exception as e:
             logger.error(f"全屏截图失败: {str(e)}")
@@ -82,7 +90,6 @@ class FullScreenCap(ScreenCap):
 
 
 if __name__ == "__main__":
-    import time
     from autosnapmanager.utils.dpi_tools import set_dpi_awareness
 
     start_time = time.time()
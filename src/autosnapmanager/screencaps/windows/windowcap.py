@@ -1,3 +1,4 @@
+import time
 from ctypes import windll
 from win32gui import GetClientRect, GetWindowDC, ReleaseDC, DeleteObject
 from win32ui import CreateDCFromHandle, CreateBitmap
@@ -34,6 +35,7 @@ class WindowCap(ScreenCap):
         Raises:
             RuntimeError: 当无法捕获窗口图像时抛出
         """
+        start = time.perf_counter()
         # 获取窗口客户区域大小
         rect = GetClientRect(self.hwnd)
         width = rect[2] - rect[0]
@@ -62,13 +64,19 @@ class WindowCap(ScreenCap):
             # 转换为numpy数组
             bitmap_info = bitmap.GetInfo()
             bitmap_bits = bitmap.GetBitmapBits(True)
+            self.capture_stats.record_received(len(bitmap_bits))
 
             # 处理图像数据
+            convert_start = time.perf_counter()
             img_array = np.frombuffer(bitmap_bits, dtype=np.uint8).reshape(
                 (bitmap_info["bmHeight"], bitmap_info["bmWidth"], 4)
             )
             # BGR转RGB并移除alpha通道
-            return img_array[:, :, [2, 1, 0]][:, :, :3]
+            image = img_array[:, :, [2, 1, 0]][:, :, :3]
+            end = time.perf_counter()
+            self.capture_stats.record_decode(end - convert_start)
+            self.capture_stats.record_delivered(end - start)
+            return image
 
         except Exception as e:
             logger.error(f"截图过程发生错误: {str(e)}")
@@ -87,7 +95,6 @@ class WindowCap(ScreenCap):
 
 
 if __name__ == "__main__":
-    import time
     from autosnapmanager.utils.dpi_tools import set_dpi_awareness
 
     start_time = time.time()
@@ -3,7 +3,9 @@
 提供图像验证、转换等功能
 """
 
-from typing import Optional, Tuple, Union
+import hashlib
+import os
+from typing import Optional, Sequence, Tuple, Union
 from pathlib import Path
 import numpy as np
 import cv2
@@ -53,6 +55,132 @@ def image2array(image: Union[str, Path, Image.Image, np.ndarray]) -> np.ndarray:
         raise RuntimeError(f"转换为numpy数组失败: {e}")
 
 
+def image_signature(image: Union[str, Path, Image.Image, np.ndarray]) -> Tuple:
+    """
+    生成图像的内容签名，用于缓存键
+
+    Args:
+        image: 图像路径、PIL.Image对象或numpy数组
+
+    Returns:
+        Tuple: 路径图像为 ('file', 绝对路径, 修改时间ns, 文件大小)，
+               数组图像为 ('array', 内容摘要, 形状, 数据类型)
+
+    Raises:
+        FileNotFoundError: 当图像文件不存在时抛出
+        TypeError: 当输入类型不支持时抛出
+    """
+    if isinstance(image, (str, Path)):
+        path = os.path.abspath(str(image))
+        stat = os.stat(path)
+        return 'file', path, stat.st_mtime_ns, stat.st_size
+
+    if isinstance(image, Image.Image):
+        image = np.asarray(image)
+
+    if isinstance(image, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16).hexdigest()
+        return 'array', digest, image.shape, image.dtype.str
+
+    raise TypeError(f"不支持的图像类型: {type(image)}")
+
+
+def is_fractional_region(region: Sequence[Union[int, float]]) -> bool:
+    """
+    判断区域是否为比例形式：四个值均在 [0, 1] 内且至少有一个浮点数，如 (0, 0.5, 1.0, 0.5)；
+    全部为整数时表示像素，如 (0, 0, 1, 1) 为 1x1 像素区域
+    """
+    return any(isinstance(v, float) for v in region) and all(0 <= v <= 1 for v in region)
+
+
+def crop_region(
+        image: np.ndarray,
+        region: Tuple[Union[int, float], Union[int, float], Union[int, float], Union[int, float]]
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    按区域裁剪图像，返回零拷贝视图
+
+    Args:
+        image: 图像数组
+        region: 区域 (x, y, w, h)，整数表示像素；全部在 [0, 1] 内且含浮点数时表示相对图像宽高的比例
+
+    Returns:
+        Tuple[np.ndarray, Tuple[int, int]]: 区域视图与区域左上角在原图中的偏移 (x, y)
+
+    Raises:
+        ValueError: 当区域格式无效或与图像无交集时抛出
+    """
+    if len(region) != 4:
+        raise ValueError(f"区域必须为 (x, y, w, h) 格式: {region}")
+
+    height, width = image.shape[:2]
+    if is_fractional_region(region):
+        x, y, w, h = (round(region[0] * width), round(region[1] * height),
+                      round(region[2] * width), round(region[3] * height))
+    else:
+        x, y, w, h = (int(v) for v in region)
+
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, width), min(y + h, height)
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"区域 {region} 与图像尺寸 {(width, height)} 无交集")
+
+    return image[y0:y1, x0:x1], (x0, y0)
+
+
+def find_local_peaks(
+        heatmap: np.ndarray,
+        threshold: float,
+        radius: Tuple[int, int],
+        scale: float = 1.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    按相似度降序贪心做非极大值抑制，提取不低于阈值的匹配点（向量化实现）
+
+    结果与逐点贪心 NMS 完全一致：阈值以上的点先将坐标除以 scale 后取整，再按相似度降序(相等时按行优先顺序)
+    遍历，与已保留的点在 x、y 方向间距都不超过 radius 的点被抑制。逐轮以 (2*rx+1, 2*ry+1) 的窗口对剩余点的
+    名次做膨胀，窗口内名次最高的剩余点必然被贪心保留(名次更高的邻点均已被抑制)，保留后抑制其窗口内的剩余点，
+    直到没有剩余点。轮数取决于抑制链的长度，相似度沿某一方向单调变化的大面积区域需要很多轮。
+
+    Args:
+        heatmap: 相似度矩阵(float32)
+        threshold: 相似度阈值
+        radius: 抑制半径 (rx, ry)，以缩放后的坐标为单位
+        scale: 矩阵坐标相对抑制坐标系的缩放率，如模板匹配时的截图缩放率；1 表示直接在矩阵坐标上抑制
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: 按相似度降序排列的 y 坐标、x 坐标(均为缩放后的坐标)与相似度
+    """
+    radius_x, radius_y = (max(int(r), 0) for r in radius)
+    kernel = np.ones((2 * radius_y + 1, 2 * radius_x + 1), dtype=np.uint8)
+
+    y_coords, x_coords = np.nonzero(heatmap >= threshold)
+    values = heatmap[y_coords, x_coords]
+    order = np.argsort(-values, kind='stable')
+    y_coords, x_coords, values = y_coords[order], x_coords[order], values[order]
+    shape = heatmap.shape
+    first = np.ones(len(values), dtype=bool)
+    if scale != 1:
+        y_coords = np.round(y_coords / scale).astype(np.intp)
+        x_coords = np.round(x_coords / scale).astype(np.intp)
+        shape = (int(np.ceil((shape[0] - 1) / scale)) + 1, int(np.ceil((shape[1] - 1) / scale)) + 1)
+        # 取整后重合的点只保留名次最高的一个，其余点与之间距为 0，必然被其抑制
+        first[:] = False
+        first[np.unique(y_coords * shape[1] + x_coords, return_index=True)[1]] = True
+
+    # 名次越靠前值越大，0 表示已处理(保留或抑制)；float32 可精确表示 2^24 以内的名次，膨胀比 float64 快数倍
+    rank = np.zeros(shape, dtype=np.float32 if len(values) < 2 ** 24 else np.float64)
+    rank[y_coords[first], x_coords[first]] = np.arange(len(values), 0, -1)[first]
+    kept = np.zeros(shape, dtype=bool)
+    while rank.any():
+        winners = (rank > 0) & (rank >= cv2.dilate(rank, kernel))
+        kept |= winners
+        rank[cv2.dilate(winners.view(np.uint8), kernel).view(bool)] = 0
+
+    keep = kept[y_coords, x_coords] & first
+    return y_coords[keep], x_coords[keep], values[keep]
+
+
 def check_image_array(
         image: np.ndarray,
         channels: Optional[int] = None,
@@ -111,6 +239,9 @@ def convert_color(
         'GRAY2RGB': cv2.COLOR_GRAY2RGB
     }
 
+    if src_color == dst_color:
+        return image
+
     conversion = f"{src_color}2{dst_color}"
     if conversion not in color_codes:
         raise ValueError(f"不支持的颜色空间转换: {conversion}")
@@ -0,0 +1,105 @@
+"""
+设备端文件部署工具模块
+通过一次 md5sum 调用比较设备端文件与本地文件，只推送内容不同的文件；支持多台设备并行部署
+"""
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from adbutils import AdbDevice
+
+from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.utils_config import PROVISION_MAX_WORKERS
+
+T = TypeVar('T')
+
+_MD5_LINE = re.compile(r'^([0-9a-fA-F]{32})\s+(.+?)\s*$')
+
+
+def local_md5(path: str) -> str:
+    """计算本地文件的 md5，按 路径+修改时间+大小 缓存，文件未变化时不重复读取"""
+    stat = os.stat(path)
+    return _local_md5(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _local_md5(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remote_md5(device: AdbDevice, paths: Sequence[str]) -> Dict[str, str]:
+    """
+    一次 shell 调用获取设备端多个文件的 md5
+
+    Returns:
+        Dict[str, str]: 远程路径 -> md5，不存在的文件(或设备不支持 md5sum)不在结果中
+    """
+    output = device.shell(["md5sum", *paths])  # 不存在的文件输出错误行，解析时忽略
+    checksums = {}
+    for line in output.splitlines():
+        match = _MD5_LINE.match(line)
+        if match:
+            checksums[match.group(2)] = match.group(1).lower()
+    return checksums
+
+
+def push_if_changed(device: AdbDevice, files: Sequence[Tuple[str, str]], executable: bool = True) -> List[str]:
+    """
+    推送内容与设备端不同的文件
+
+    Args:
+        device: adb 设备
+        files: (本地路径, 远程路径) 列表
+        executable: 是否为推送的文件添加可执行权限
+
+    Returns:
+        List[str]: 实际推送的远程路径，均已是最新时为空列表
+    """
+    current = remote_md5(device, [remote for _, remote in files])
+    pushed = []
+    for local, remote in files:
+        if current.get(remote) == local_md5(local):
+            continue
+        device.sync.push(local, remote)
+        pushed.append(remote)
+
+    if pushed and executable:
+        device.shell(["chmod", "+x", *pushed])
+
+    if pushed:
+        logger.info(f"已推送 {len(pushed)}/{len(files)} 个文件: {pushed} | 设备: {device.serial}")
+    else:
+        logger.debug(f"设备端文件已是最新，跳过推送 | 设备: {device.serial}")
+    return pushed
+
+
+def provision_devices(serials: Sequence[str], setup: Callable[[str], T],
+                      max_workers: Optional[int] = PROVISION_MAX_WORKERS) -> Dict[str, Union[T, Exception]]:
+    """
+    多台设备并行执行部署或初始化，单台设备失败不影响其他设备
+
+    Args:
+        serials: 设备序列号列表
+        setup: 以设备序列号为参数的部署函数，如 MiniCap、MiniTouch 等类本身
+        max_workers: 最大并行数
+
+    Returns:
+        Dict[str, Union[T, Exception]]: 设备序列号 -> 部署函数的返回值，失败时为抛出的异常
+    """
+
+    def run(serial: str) -> Union[T, Exception]:
+        try:
+            return setup(serial)
+        except Exception as e:
+            logger.error(f"设备部署失败: {serial} | {e}")
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(serials, executor.map(run, serials)))
@@ -0,0 +1,102 @@
+"""
+服务就绪探测工具模块
+以指数退避反复探测设备端服务，服务就绪即返回，超过期限或进程已退出时立即报错，取代固定时长的等待
+"""
+import socket
+import time
+from typing import Callable, Optional, TypeVar
+
+from autosnapmanager.utils.logger import logger
+from autosnapmanager.utils.utils_config import (
+    READINESS_INITIAL_DELAY, READINESS_MAX_DELAY, READINESS_BACKOFF_FACTOR, READINESS_PROBE_TIMEOUT
+)
+
+T = TypeVar('T')
+
+
+class ServiceNotReadyError(TimeoutError):
+    """服务在期限内未就绪，或启动进程已退出"""
+    pass
+
+
+def wait_until_ready(
+        probe: Callable[[], Optional[T]],
+        timeout: float,
+        name: str,
+        alive: Optional[Callable[[], bool]] = None,
+        initial_delay: float = READINESS_INITIAL_DELAY,
+        max_delay: float = READINESS_MAX_DELAY,
+        factor: float = READINESS_BACKOFF_FACTOR
+) -> T:
+    """
+    以指数退避反复调用 probe，直到服务就绪
+
+    Args:
+        probe: 探测函数，就绪时返回真值(作为本函数的返回值)，未就绪时返回假值或抛出 OSError
+        timeout: 就绪期限(秒)
+        name: 服务名称，用于日志与错误信息
+        alive: 启动进程存活检查，返回 False 时立即失败，None 表示不检查
+        initial_delay: 首次重试前的等待时间(秒)
+        max_delay: 重试间隔上限(秒)
+        factor: 重试间隔的增长倍数
+
+    Returns:
+        T: probe 的返回值
+
+    Raises:
+        ServiceNotReadyError: 超过期限仍未就绪或进程已退出时抛出
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delay, attempts, last_error = initial_delay, 0, None
+
+    while True:
+        attempts += 1
+        try:
+            result = probe()
+            if result:
+                logger.info(f"{name} 已就绪 | 耗时: {time.monotonic() - start:.2f}s | 探测次数: {attempts}")
+                return result
+        except OSError as e:
+            last_error = e
+
+        if alive is not None and not alive():
+            raise ServiceNotReadyError(f"{name} 启动进程已退出 | 探测次数: {attempts} | 最后错误: {last_error}")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ServiceNotReadyError(f"{name} 在 {timeout}s 内未就绪 | 探测次数: {attempts} | 最后错误: {last_error}")
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, max_delay)
+
+
+def probe_socket(host: str, port: int, prefix: bytes = b'',
+                 timeout: float = READINESS_PROBE_TIMEOUT) -> Optional[socket.socket]:
+    """
+    连接端口并窥视(MSG_PEEK)首批数据，不消费数据
+
+    adb 端口转发在设备端服务未监听时仍会接受连接，随后立即关闭，因此以收到数据作为就绪的依据。
+
+    Args:
+        host: 主机地址
+        port: 端口
+        prefix: 就绪时数据应有的前缀，如 minitouch 的 b'v'，空表示收到任意数据即就绪
+        timeout: 连接与等待数据的超时时间(秒)
+
+    Returns:
+        Optional[socket.socket]: 就绪时返回已连接的 socket(数据仍可完整读取)，未就绪时返回 None
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect((host, port))
+        data = sock.recv(max(len(prefix), 1), socket.MSG_PEEK)
+        # 窥视可能只收到前缀的一部分，已收到的部分与前缀一致即可
+        if data and data[:len(prefix)] == prefix[:len(data)]:
+            return sock
+        sock.close()
+        return None
+    except OSError:
+        sock.close()
+        raise
@@ -4,6 +4,15 @@ import sys
 WORK_DIR = os.path.dirname(__file__)
 PROJECT_DIR = sys.path[1]
 
+# readiness
+READINESS_INITIAL_DELAY = 0.05  # 服务就绪探测首次重试前的等待时间(秒)
+READINESS_MAX_DELAY = 0.5  # 探测重试间隔上限(秒)
+READINESS_BACKOFF_FACTOR = 2  # 探测重试间隔的增长倍数
+READINESS_PROBE_TIMEOUT = 0.5  # 单次探测连接与等待数据的超时时间(秒)
+
+# provision
+PROVISION_MAX_WORKERS = 8  # 多台设备并行部署的最大线程数
+
 
 if __name__ == '__main__':
     from autosnapmanager.utils.print_config import print_config
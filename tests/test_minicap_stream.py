@@ -0,0 +1,69 @@
+"""
+MiniCapStream 数据流解析测试
+在本地 socket 上以随机切分(含帧头被拆开)的方式发送合成的 minicap 字节流，
+逐帧比较 crc32，帧被破坏、丢失或乱序时失败
+"""
+import struct
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from autosnapmanager.screencaps.android.minicap import MiniCapStream
+from benchmarks.bench_minicap_stream import BANNER, serve, synthetic_stream
+
+
+def receive(port: int) -> Tuple[MiniCapStream, List[int]]:
+    """读取整个数据流，返回数据流对象与监听回调中各帧的 crc32(帧数据只在回调期间有效)"""
+    checksums = []
+    stream = MiniCapStream('127.0.0.1', port, listeners=[lambda frame: checksums.append(zlib.crc32(frame.data))])
+    stream.start()
+    stream.thread.join(timeout=30)
+    assert not stream.thread.is_alive(), "数据流读取线程未在连接关闭后退出"
+    stream._close_socket()
+    return stream, checksums
+
+
+@pytest.mark.parametrize('seed, chunks', [
+    (1, [1, 2, 3, 7, 1500, 65536]),
+    (2, [1, 3, 4, 5]),
+    (3, [262144]),
+])
+def test_random_chunks_deliver_every_frame_intact(seed, chunks):
+    payload, expected = synthetic_stream(40, 8 * 1024, seed)
+    rng = np.random.default_rng(seed)
+    stream, received = receive(serve(payload, lambda: int(rng.choice(chunks))))
+
+    assert received == expected
+    assert stream.slot.seq == len(expected)
+    assert stream.banner['realWidth'] == 1080 and stream.banner['quirks'] == 2
+
+
+def test_buffers_reused_across_growing_frames():
+    # 帧大小跨度大，缓冲区需要多次重新分配；轮换复用的缓冲区不得残留上一帧的数据
+    parts, expected = [BANNER], []
+    rng = np.random.default_rng(4)
+    for size in (16, 4096, 32, 200000, 64, 100000, 8):
+        body = b'\xFF\xD8' + rng.integers(0, 256, size - 2, dtype=np.uint8).tobytes()
+        parts += [struct.pack('<I', size), body]
+        expected.append(zlib.crc32(body))
+
+    _, received = receive(serve(b''.join(parts), lambda: int(rng.choice([1, 5, 9000]))))
+    assert received == expected
+
+
+def test_invalid_jpeg_header_stops_stream():
+    payload, expected = synthetic_stream(10, 4096, corrupt=6)
+    stream, received = receive(serve(payload, lambda: 1500))
+
+    assert received == expected[:6]
+    assert stream.slot.seq == 6
+
+
+def test_truncated_frame_is_not_published():
+    payload, expected = synthetic_stream(5, 4096)
+    stream, received = receive(serve(payload[:-100], lambda: 1500))
+
+    assert received == expected[:4]
+    assert stream.slot.seq == 4